@@ -7,3 +7,14 @@ class ZRCApiConfig(AppConfig):
     def ready(self):
         # ensure that the metaclass for every viewset has run
         from . import viewsets  # noqa
+
+        # connect the invalidation of the cached authorizations
+        from . import authorizations  # noqa
+
+        # connect the invalidation of the cached BSN lookups
+        from . import bsn  # noqa
+
+        # use the vendored remote API specs instead of downloading them
+        from .oas import load_bundle
+
+        load_bundle()
@@ -1,3 +1,183 @@
+"""
+Audit trail mixins that store the audit trail compactly, after the change.
+
+The entries are built like :mod:`vng_api_common` does, but collected during
+the request and written in one go once the transaction of the change is
+committed. The version of the resource after the action is the response data
+the view already produced - see :mod:`zrc.audit.history` for how the versions
+are stored and reconstructed. The version before an update is only serialized
+when the resource was changed outside of the audit trail.
+"""
+import logging
+from functools import partial
+
+from django.db import transaction
+
 from vng_api_common.audittrails.audits import Audit
+from vng_api_common.audittrails.viewsets import (
+    AuditTrailDestroyMixin as _AuditTrailDestroyMixin,
+    AuditTrailMixin as _AuditTrailMixin,
+)
+from vng_api_common.compat import get_header
+from vng_api_common.constants import CommonResourceAction
+from vng_api_common.utils import get_uuid_from_path
+
+from zrc.audit.history import get_checksum, get_latest_checksum, write_entries
+from zrc.audit.models import AuditTrail
+
+logger = logging.getLogger(__name__)
 
 AUDIT_ZRC = Audit("ZRC", "zaak")
+
+
+class AuditTrailMixin(_AuditTrailMixin):
+    _audittrail_entries = None
+
+    def create_audittrail(
+        self,
+        status_code,
+        action,
+        version_before_edit,
+        version_after_edit,
+        unique_representation,
+        checksum: str = "",
+    ):
+        data = version_after_edit if version_after_edit else version_before_edit
+        if self.basename == self.audit.main_resource:
+            main_object = data["url"]
+        else:
+            main_object = self.get_audittrail_main_object_url(
+                data, self.audit.main_resource
+            )
+
+        applications = self.request.jwt_auth.applicaties
+        if len(applications) > 1:
+            logger.warning(
+                "Unexpectedly found %d applications, expected at most one",
+                len(applications),
+            )
+
+        if applications:
+            application = applications[0]
+            app_id, app_presentation = str(application.uuid), application.label
+        else:
+            app_id = get_header(self.request, "X-NLX-Request-Application-Id")
+            app_presentation = app_id
+
+        payload = self.request.jwt_auth.payload
+        entry = AuditTrail(
+            bron=self.audit.component_name,
+            logrecord_id=get_header(self.request, "X-NLX-Logrecord-ID") or "",
+            applicatie_id=app_id or "",
+            applicatie_weergave=app_presentation or "",
+            actie=action,
+            actie_weergave=CommonResourceAction.labels.get(action, ""),
+            gebruikers_id=payload.get("user_id", ""),
+            gebruikers_weergave=payload.get("user_representation", ""),
+            resultaat=status_code,
+            hoofd_object=main_object,
+            hoofd_object_uuid=get_uuid_from_path(main_object),
+            resource=self.basename,
+            resource_url=data["url"],
+            toelichting=get_header(self.request, "X-Audit-Toelichting") or "",
+            resource_weergave=unique_representation,
+            checksum=checksum,
+        )
+        entry.version = data
+        if version_after_edit:
+            entry.version_before = version_before_edit
+
+        if self._audittrail_entries is None:
+            self._audittrail_entries = []
+        self._audittrail_entries.append(entry)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        entries, self._audittrail_entries = self._audittrail_entries, None
+        if entries:
+            # runs immediately if the view isn't wrapped in a transaction
+            transaction.on_commit(partial(write_entries, entries))
+        return response
+
+
+class AuditTrailCreateMixin(AuditTrailMixin):
+    _audittrail_instance = None
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        self._audittrail_instance = serializer.instance
+
+    def get_audittrail_instance(self, response):
+        if self._audittrail_instance is not None:
+            return self._audittrail_instance
+        # views that create the object without ``perform_create``
+        uuid = get_uuid_from_path(response.data["url"])
+        return self.get_queryset().get(uuid=uuid)
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        instance = self.get_audittrail_instance(response)
+        self.create_audittrail(
+            response.status_code,
+            CommonResourceAction.create,
+            version_before_edit=None,
+            version_after_edit=response.data,
+            unique_representation=instance.unique_representation(),
+            checksum=get_checksum(instance),
+        )
+        return response
+
+
+class AuditTrailUpdateMixin(AuditTrailMixin):
+    _audittrail_instance = None
+    _audittrail_version_before = None
+
+    def perform_update(self, serializer):
+        # the version before the update is the previous version in the audit
+        # trail, so the object is only serialized before updating it if the
+        # row was changed since - by a write without an audit trail entry
+        instance = serializer.instance
+        url = serializer.fields["url"].to_representation(instance)
+        if get_latest_checksum(url) != get_checksum(instance):
+            self._audittrail_version_before = self.get_audittrail_version_before(
+                instance
+            )
+
+        super().perform_update(serializer)
+        self._audittrail_instance = serializer.instance
+
+    def get_audittrail_version_before(self, instance) -> dict:
+        return self.get_serializer(instance).data
+
+    def update(self, request, *args, **kwargs):
+        action = (
+            CommonResourceAction.partial_update
+            if kwargs.get("partial", False)
+            else CommonResourceAction.update
+        )
+
+        response = super().update(request, *args, **kwargs)
+        self.create_audittrail(
+            response.status_code,
+            action,
+            version_before_edit=self._audittrail_version_before,
+            version_after_edit=response.data,
+            unique_representation=self._audittrail_instance.unique_representation(),
+            checksum=get_checksum(self._audittrail_instance),
+        )
+        return response
+
+
+class AuditTrailDestroyMixin(AuditTrailMixin, _AuditTrailDestroyMixin):
+    def _destroy_related_audittrails(self, main_object_url):
+        super()._destroy_related_audittrails(main_object_url)
+        AuditTrail.objects.filter(
+            hoofd_object_uuid=get_uuid_from_path(main_object_url)
+        ).delete()
+
+
+class AuditTrailViewsetMixin(
+    AuditTrailCreateMixin, AuditTrailUpdateMixin, AuditTrailDestroyMixin
+):
+    pass
@@ -0,0 +1,243 @@
+"""
+Compiled and cached view on the authorizations of a client application.
+
+Resolving the ``Applicatie`` and ``Autorisatie`` records of a client and
+checking them with :meth:`vng_api_common.middleware.JWTAuth.has_auth` costs
+database queries for every single permission check. The authorizations only
+change when the Autorisaties API sends a notification (or an admin edits them),
+so they are compiled once per ``client_id`` into an :class:`AuthorizationIndex`
+and cached until they change.
+"""
+import logging
+from typing import Dict, Iterable, Optional, Set
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from vng_api_common.authorizations.models import (
+    Applicatie,
+    AuthorizationsConfig,
+    Autorisatie,
+)
+from vng_api_common.constants import VertrouwelijkheidsAanduiding
+from vng_api_common.middleware import JWTAuth
+from vng_api_common.scopes import Scope
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = "autorisaties"
+
+# marker to distinguish "not filtered on" from an explicit ``None`` value
+NOT_SET = object()
+
+
+def get_cache_key(client_id: str) -> str:
+    return f"autorisaties:{client_id}"
+
+
+class AuthorizationIndex:
+    """
+    The authorizations of one client application, indexed for O(1) lookups.
+
+    The scopes are grouped per ``zaaktype`` and per (numeric)
+    ``max_vertrouwelijkheidaanduiding``. For each combination of ``zaaktype``
+    and required scope, the maximum vertrouwelijkheidaanduiding that is
+    granted is computed once and memoized.
+    """
+
+    def __init__(
+        self,
+        component: str,
+        heeft_alle_autorisaties: bool = False,
+        grants: Optional[Dict[str, Dict[int, Set[str]]]] = None,
+    ):
+        self.component = component
+        self.heeft_alle_autorisaties = heeft_alle_autorisaties
+        # {zaaktype: {max_vertrouwelijkheidaanduiding order: {scope labels}}}
+        self.grants = grants or {}
+        self._max_orders = {}
+
+    @classmethod
+    def build(
+        cls,
+        component: str,
+        applicaties: Iterable[Applicatie],
+        autorisaties: Iterable[Autorisatie],
+    ) -> "AuthorizationIndex":
+        if any(applicatie.heeft_alle_autorisaties for applicatie in applicaties):
+            return cls(component, heeft_alle_autorisaties=True)
+
+        grants = {}
+        for autorisatie in autorisaties:
+            order = get_order(autorisatie.max_vertrouwelijkheidaanduiding)
+            scopes = grants.setdefault(autorisatie.zaaktype, {}).setdefault(
+                order, set()
+            )
+            scopes.update(autorisatie.scopes)
+        return cls(component, grants=grants)
+
+    def get_max_order(self, zaaktype: str, scope: Scope) -> Optional[int]:
+        """
+        Determine the maximum vertrouwelijkheidaanduiding (as order) for which
+        ``scope`` is granted on ``zaaktype``, or ``None`` if it's not granted.
+        """
+        key = (zaaktype, scope.label)
+        if key not in self._max_orders:
+            self._max_orders[key] = self._compute_max_order(zaaktype, scope)
+        return self._max_orders[key]
+
+    def _compute_max_order(self, zaaktype: str, scope: Scope) -> Optional[int]:
+        # walk from the most to the least confidential level - the scopes
+        # provided at a level are the union of all autorisaties that allow at
+        # least that level, exactly like ``JWTAuth.has_auth`` combines them
+        grants = self.grants.get(zaaktype, {})
+        provided = set()
+        for order in sorted(grants, reverse=True):
+            provided.update(grants[order])
+            if scope.is_contained_in(list(provided)):
+                return order
+        return None
+
+    def get_max_orders(self, scope: Scope) -> Dict[str, int]:
+        """
+        Map every zaaktype on which ``scope`` is granted to its maximum
+        vertrouwelijkheidaanduiding order.
+        """
+        max_orders = {
+            zaaktype: self.get_max_order(zaaktype, scope) for zaaktype in self.grants
+        }
+        return {
+            zaaktype: order
+            for zaaktype, order in max_orders.items()
+            if order is not None
+        }
+
+    def has_auth(
+        self,
+        scopes: Scope,
+        zaaktype=NOT_SET,
+        vertrouwelijkheidaanduiding: Optional[str] = None,
+    ) -> bool:
+        if self.heeft_alle_autorisaties:
+            return True
+
+        min_order = (
+            get_order(vertrouwelijkheidaanduiding)
+            if vertrouwelijkheidaanduiding
+            else None
+        )
+
+        # like JWTAuth.filter_default, ``None`` doesn't filter on the zaaktype
+        if zaaktype is not NOT_SET and zaaktype is not None:
+            max_order = self.get_max_order(zaaktype, scopes)
+            if max_order is None:
+                return False
+            return min_order is None or max_order >= min_order
+
+        # not scoped to a zaaktype - any autorisatie may contribute scopes
+        provided = set()
+        for grants in self.grants.values():
+            for order, scope_labels in grants.items():
+                if min_order is None or order >= min_order:
+                    provided.update(scope_labels)
+        return scopes.is_contained_in(list(provided))
+
+
+def get_order(vertrouwelijkheidaanduiding: str) -> int:
+    if not vertrouwelijkheidaanduiding:
+        return 0
+    return VertrouwelijkheidsAanduiding.get_choice(vertrouwelijkheidaanduiding).order
+
+
+def get_authorization_index(jwt_auth: JWTAuth) -> AuthorizationIndex:
+    client_id = jwt_auth.client_id
+    if client_id is None:
+        return AuthorizationIndex(AuthorizationsConfig.get_solo().component)
+
+    cache = caches[CACHE_ALIAS]
+    cache_key = get_cache_key(client_id)
+    index = cache.get(cache_key)
+    if index is not None:
+        return index
+
+    component = AuthorizationsConfig.get_solo().component
+    applicaties = list(jwt_auth.applicaties)
+    autorisaties = Autorisatie.objects.filter(
+        applicatie__in=applicaties, component=component
+    )
+    index = AuthorizationIndex.build(component, applicaties, autorisaties)
+    # a client without applicaties may not be configured in the Autorisaties
+    # API yet, or the API was unreachable - don't lock it out until the timeout
+    if applicaties:
+        cache.set(cache_key, index)
+    return index
+
+
+def invalidate(client_ids: Iterable[str]) -> None:
+    keys = [get_cache_key(client_id) for client_id in client_ids]
+    if not keys:
+        return
+
+    logger.debug("Invalidating cached authorizations for %r", keys)
+    cache = caches[CACHE_ALIAS]
+    cache.delete_many(keys)
+    # and again after commit, so that a concurrent request can't re-populate
+    # the cache with the old state in the meantime
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class CachedJWTAuth(JWTAuth):
+    """
+    JWT authentication that checks permissions against the cached
+    :class:`AuthorizationIndex` instead of querying the autorisaties.
+    """
+
+    @property
+    def authorization_index(self) -> AuthorizationIndex:
+        if not hasattr(self, "_authorization_index"):
+            self._authorization_index = get_authorization_index(self)
+        return self._authorization_index
+
+    def has_auth(
+        self, scopes: Scope, component: Optional[str] = None, **fields
+    ) -> bool:
+        if scopes is None:
+            return False
+
+        index = self.authorization_index
+        unsupported = set(fields) - {"zaaktype", "vertrouwelijkheidaanduiding"}
+        if unsupported or component not in (None, index.component):
+            return super().has_auth(scopes, component=component, **fields)
+
+        return index.has_auth(scopes, **fields)
+
+
+# The Autorisaties API notifications (kanaal ``autorisaties``) are processed by
+# vng_api_common, which updates the local Applicatie/Autorisatie records. Hook
+# into those changes to drop the compiled authorizations.
+
+
+@receiver(
+    [post_save, post_delete],
+    sender=Applicatie,
+    dispatch_uid="api.invalidate_applicatie_authorizations",
+)
+def invalidate_applicatie(sender, instance: Applicatie, **kwargs):
+    invalidate(instance.client_ids)
+
+
+@receiver(
+    [post_save, post_delete],
+    sender=Autorisatie,
+    dispatch_uid="api.invalidate_autorisatie_authorizations",
+)
+def invalidate_autorisatie(sender, instance: Autorisatie, **kwargs):
+    # don't go through ``instance.applicatie`` - on cascade deletes the
+    # applicatie may be gone already, in which case it invalidates itself
+    client_ids = Applicatie.objects.filter(pk=instance.applicatie_id).values_list(
+        "client_ids", flat=True
+    )
+    for ids in client_ids:
+        invalidate(ids)
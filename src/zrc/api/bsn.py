@@ -0,0 +1,91 @@
+"""
+Cached lookup of the rollen and zaken of a citizen by BSN.
+
+Citizen portals ("Mijn Zaken") filter the zaken and rollen on the BSN of the
+logged in citizen for every page they show. The rollen with a natuurlijk
+persoon of a BSN, and their zaken, are looked up in the index on
+``NatuurlijkPersoon.inp_bsn`` (see migration 0095) and cached for a short
+time. Any change of a natuurlijk persoon of the BSN drops the cached lookup.
+The lookup reads from the primary database, a lagging replica would cache a
+stale result for the whole timeout of the cache.
+
+The filters select the results by primary key, so a zaak with several rollen
+of the same citizen is listed once.
+"""
+import hashlib
+import hmac
+import logging
+from typing import List, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from zrc.datamodel.models import NatuurlijkPersoon
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = "bsn"
+
+
+def get_cache_key(bsn: str) -> str:
+    # a BSN is personal data. There are few enough BSNs to hash them all, so a
+    # plain hash is reversible. The digest is an HMAC with the SECRET_KEY
+    digest = hmac.new(
+        settings.SECRET_KEY.encode(), bsn.encode(), hashlib.sha256
+    ).hexdigest()
+    return f"bsn:{digest}"
+
+
+def get_rollen(bsn: str) -> List[Tuple[int, int]]:
+    """
+    Return the primary keys of the rollen of ``bsn`` and of their zaken.
+    """
+    cache = caches[CACHE_ALIAS]
+    cache_key = get_cache_key(bsn)
+    rollen = cache.get(cache_key)
+    if rollen is None:
+        rollen = list(
+            NatuurlijkPersoon.objects.using(DEFAULT_DB_ALIAS)
+            .filter(inp_bsn=bsn, rol__isnull=False)
+            .order_by()
+            .values_list("rol_id", "rol__zaak_id")
+        )
+        cache.set(cache_key, rollen)
+    return rollen
+
+
+def get_rol_ids(bsn: str) -> List[int]:
+    return [rol_id for rol_id, zaak_id in get_rollen(bsn)]
+
+
+def get_zaak_ids(bsn: str) -> List[int]:
+    return list({zaak_id for rol_id, zaak_id in get_rollen(bsn)})
+
+
+def invalidate(bsn: str) -> None:
+    if not bsn:
+        return
+
+    logger.debug("Invalidating the cached rollen of a BSN")
+    cache = caches[CACHE_ALIAS]
+    cache_key = get_cache_key(bsn)
+    cache.delete(cache_key)
+    # and again after commit, so that a concurrent request can't re-populate
+    # the cache with the old state in the meantime
+    transaction.on_commit(lambda: cache.delete(cache_key))
+
+
+# the BSN of an existing natuurlijk persoon only changes through the admin, the
+# timeout of the cache bounds how long the previous BSN still lists the rol
+
+
+@receiver(
+    [post_save, post_delete],
+    sender=NatuurlijkPersoon,
+    dispatch_uid="api.invalidate_natuurlijk_persoon_bsn",
+)
+def invalidate_natuurlijk_persoon(sender, instance: NatuurlijkPersoon, **kwargs):
+    invalidate(instance.inp_bsn)
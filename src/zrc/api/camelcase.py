@@ -0,0 +1,67 @@
+"""
+Convert the keys of API data between snake_case and camelCase.
+
+Produces the same output as :mod:`djangorestframework_camel_case.util`, but
+converts every distinct key only once. The keys are mostly serializer field
+names, so after the first responses every key is a dictionary lookup instead of
+a regular expression substitution.
+"""
+import re
+from typing import Callable, Dict
+
+from djangorestframework_camel_case.util import camel_to_underscore
+
+# a request body could contain any number of distinct keys
+MAX_CACHED_KEYS = 10000
+
+SCALAR_TYPES = frozenset({str, int, float, bool, type(None)})
+
+camelize_re = re.compile(r"[a-z]_[a-z]")
+
+_camel_keys: Dict[str, str] = {}
+_underscore_keys: Dict[str, str] = {}
+
+
+def _underscore_to_camel(match) -> str:
+    return match.group()[0] + match.group()[2].upper()
+
+
+def _convert(cache: Dict[str, str], convert: Callable[[str], str], key: str) -> str:
+    converted = convert(key)
+    if len(cache) < MAX_CACHED_KEYS:
+        cache[key] = converted
+    return converted
+
+
+def camel_key(key: str) -> str:
+    try:
+        return _camel_keys[key]
+    except KeyError:
+        return _convert(
+            _camel_keys, lambda key: camelize_re.sub(_underscore_to_camel, key), key
+        )
+
+
+def underscore_key(key: str) -> str:
+    try:
+        return _underscore_keys[key]
+    except KeyError:
+        return _convert(_underscore_keys, camel_to_underscore, key)
+
+
+def camelize(data):
+    if isinstance(data, dict):
+        return {
+            camel_key(key): (value if type(value) in SCALAR_TYPES else camelize(value))
+            for key, value in data.items()
+        }
+    if isinstance(data, (list, tuple)):
+        return [item if type(item) in SCALAR_TYPES else camelize(item) for item in data]
+    return data
+
+
+def underscoreize_object(data: dict) -> dict:
+    """
+    Convert the keys of a decoded JSON object, for ``json.loads(object_hook=)``.
+    """
+    return {underscore_key(key): value for key, value in data.items()}
@@ -0,0 +1,161 @@
+"""
+Inline the related resources of zaken with the ``expand`` query parameter.
+
+Every requested expansion is loaded with a single query for all the zaken in
+the response, and filtered by the authorizations of the client in the same way
+as the list endpoint of that resource. The expanded resources are added to the
+zaak under ``_expand``.
+"""
+from functools import wraps
+from typing import Dict, List
+
+from django.core.cache import caches
+from django.db import models
+
+from rest_framework.request import Request
+from vng_api_common.caching import conditional_retrieve
+
+from zrc.datamodel.models import (
+    Resultaat,
+    Rol,
+    Status,
+    Zaak,
+    ZaakEigenschap,
+    ZaakInformatieObject,
+    ZaakObject,
+)
+
+from .scopes import SCOPE_ZAKEN_ALLES_LEZEN
+from .serializers import (
+    ResultaatSerializer,
+    RolSerializer,
+    StatusSerializer,
+    ZaakEigenschapSerializer,
+    ZaakInformatieObjectSerializer,
+    ZaakObjectSerializer,
+    ZaakSerializer,
+)
+
+
+class Expansion:
+    def __init__(self, queryset, serializer_class, zaak_field="zaak", many=True):
+        self.queryset = queryset
+        self.serializer_class = serializer_class
+        self.zaak_field = zaak_field
+        self.many = many
+
+    def get_queryset(self, zaken: List[Zaak]) -> models.QuerySet:
+        return self.queryset.filter(**{f"{self.zaak_field}__in": zaken})
+
+
+class StatusExpansion(Expansion):
+    def get_queryset(self, zaken: List[Zaak]) -> models.QuerySet:
+        # the current status of every zaak
+        return (
+            super()
+            .get_queryset(zaken)
+            .order_by("zaak", "-datum_status_gezet")
+            .distinct("zaak")
+        )
+
+
+class ZaakInformatieObjectExpansion(Expansion):
+    def get_queryset(self, zaken: List[Zaak]) -> models.QuerySet:
+        queryset = super().get_queryset(zaken)
+        # like the endpoint, leave out the ones that are marked to be deleted
+        marked_zios = caches["drc_sync"].get("zios_marked_for_delete")
+        if marked_zios:
+            return queryset.exclude(uuid__in=marked_zios)
+        return queryset
+
+
+EXPANSIONS = {
+    "status": StatusExpansion(
+        Status.objects.select_related("zaak"), StatusSerializer, many=False
+    ),
+    "resultaat": Expansion(
+        Resultaat.objects.select_related("zaak"), ResultaatSerializer, many=False
+    ),
+    "eigenschappen": Expansion(
+        ZaakEigenschap.objects.select_related("zaak").order_by("pk"),
+        ZaakEigenschapSerializer,
+    ),
+    "deelzaken": Expansion(
+        Zaak.objects.prefetch_related("deelzaken").order_by("pk"),
+        ZaakSerializer,
+        zaak_field="hoofdzaak",
+    ),
+    "rollen": Expansion(
+        Rol.objects.select_related("zaak").order_by("pk"), RolSerializer
+    ),
+    "zaakobjecten": Expansion(
+        ZaakObject.objects.select_related("zaak").order_by("pk"), ZaakObjectSerializer
+    ),
+    "zaakinformatieobjecten": ZaakInformatieObjectExpansion(
+        ZaakInformatieObject.objects.select_related("zaak").order_by("pk"),
+        ZaakInformatieObjectSerializer,
+    ),
+}
+
+
+def get_expand(request: Request) -> List[str]:
+    value = request.query_params.get("expand")
+    if not value:
+        return []
+    # unknown values are rejected by the filterset
+    return [name for name in value.split(",") if name in EXPANSIONS]
+
+
+def expand_zaken(zaken: List[Zaak], names: List[str], request: Request) -> Dict:
+    """
+    Serialize the expansions ``names`` of ``zaken``, by the pk of the zaak.
+    """
+    authorizations = request.jwt_auth.authorization_index
+    context = {"request": request}
+
+    expanded = {zaak.pk: {} for zaak in zaken}
+    for name in names:
+        expansion = EXPANSIONS[name]
+        for zaak_expanded in expanded.values():
+            zaak_expanded[name] = [] if expansion.many else None
+
+        queryset = expansion.get_queryset(zaken)
+        if not authorizations.heeft_alle_autorisaties:
+            queryset = queryset.filter_for_authorizations(
+                SCOPE_ZAKEN_ALLES_LEZEN, authorizations
+            )
+
+        objects = list(queryset)
+        data = expansion.serializer_class(objects, many=True, context=context).data
+        for obj, obj_data in zip(objects, data):
+            zaak_expanded = expanded[getattr(obj, f"{expansion.zaak_field}_id")]
+            if expansion.many:
+                zaak_expanded[name].append(obj_data)
+            else:
+                zaak_expanded[name] = obj_data
+
+    return expanded
+
+
+def conditional_retrieve_unexpanded():
+    """
+    Apply conditional GET requests, except to expanded responses.
+
+    The ETag of a zaak doesn't cover the expanded resources.
+    """
+
+    def decorator(viewset: type):
+        retrieve = viewset.retrieve
+        viewset = conditional_retrieve()(viewset)
+        conditional = viewset.retrieve
+
+        @wraps(retrieve)
+        def handler(self, request, *args, **kwargs):
+            if get_expand(request):
+                return retrieve(self, request, *args, **kwargs)
+            return conditional(self, request, *args, **kwargs)
+
+        viewset.retrieve = handler
+        return viewset
+
+    return decorator
@@ -1,8 +1,15 @@
+from django import forms
+from django.contrib.gis.gdal import GDALException
+from django.contrib.gis.geos import GEOSException, GEOSGeometry
+from django.utils.translation import ugettext_lazy as _
+
 from django_filters import filters
+from rest_framework.filters import OrderingFilter
 from vng_api_common.constants import VertrouwelijkheidsAanduiding
 from vng_api_common.filtersets import FilterSet
 from vng_api_common.utils import get_field_attribute, get_help_text
 
+from zrc.audit.models import AuditTrail
 from zrc.datamodel.models import (
     KlantContact,
     Resultaat,
@@ -15,6 +22,10 @@ from zrc.datamodel.models import (
     ZaakVerzoek,
 )
 
+from .bsn import get_rol_ids, get_zaak_ids
+from .expand import EXPANSIONS
+from .utils import get_bbox
+
 
 class MaximaleVertrouwelijkheidaanduidingFilter(filters.ChoiceFilter):
     def __init__(self, *args, **kwargs):
@@ -37,6 +48,68 @@ class MaximaleVertrouwelijkheidaanduidingFilter(filters.ChoiceFilter):
         return super().filter(qs, numeric_value)
 
 
+class ExpandFilter(filters.BaseCSVFilter, filters.ChoiceFilter):
+    """
+    Validate the comma separated resources to expand.
+    """
+
+    def filter(self, qs, value):
+        # the resources are inlined by the view, nothing is filtered
+        return qs
+
+
+class BBoxField(forms.CharField):
+    def to_python(self, value):
+        value = super().to_python(value)
+        if value in self.empty_values:
+            return None
+        try:
+            return get_bbox([float(bit) for bit in value.split(",")])
+        except ValueError:
+            raise forms.ValidationError(
+                _("Geef de rechthoek op als `minx,miny,maxx,maxy`."), code="invalid"
+            )
+
+
+class GeometryField(forms.CharField):
+    def to_python(self, value):
+        value = super().to_python(value)
+        if value in self.empty_values:
+            return None
+        try:
+            return GEOSGeometry(value, srid=4326)
+        except (GEOSException, GDALException, ValueError, TypeError):
+            raise forms.ValidationError(
+                _("Geef een geometrie op als GeoJSON of WKT."), code="invalid"
+            )
+
+
+class BBoxFilter(filters.Filter):
+    field_class = BBoxField
+
+
+class GeometryFilter(filters.Filter):
+    field_class = GeometryField
+
+
+class StableOrderingFilter(OrderingFilter):
+    """
+    Order by the primary key last, in the direction of the last ordering field.
+
+    Rows with the same values of the ordering fields otherwise come back in an
+    arbitrary order, so pagination skips or repeats them. The partial indexes
+    of the zaken include the primary key for this.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering or any(field.lstrip("-") in ("pk", "id") for field in ordering):
+            return ordering
+
+        tiebreaker = "-pk" if ordering[-1].startswith("-") else "pk"
+        return [*ordering, tiebreaker]
+
+
 class ZaakFilter(FilterSet):
     maximale_vertrouwelijkheidaanduiding = MaximaleVertrouwelijkheidaanduidingFilter(
         field_name="vertrouwelijkheidaanduiding",
@@ -47,7 +120,7 @@ class ZaakFilter(FilterSet):
     )
 
     rol__betrokkene_identificatie__natuurlijk_persoon__inp_bsn = filters.CharFilter(
-        field_name="rol__natuurlijkpersoon__inp_bsn",
+        method="filter_inp_bsn",
         help_text=get_help_text("datamodel.NatuurlijkPersoon", "inp_bsn"),
         max_length=get_field_attribute(
             "datamodel.NatuurlijkPersoon", "inp_bsn", "max_length"
@@ -69,6 +142,47 @@ class ZaakFilter(FilterSet):
         )
     )
 
+    expand = ExpandFilter(
+        choices=[(name, name) for name in EXPANSIONS],
+        help_text=(
+            "Haal details van gerelateerde resources direct mee op, als komma "
+            "gescheiden lijst van: " + ", ".join(f"`{name}`" for name in EXPANSIONS)
+        ),
+    )
+
+    zoekterm = filters.CharFilter(
+        method="filter_zoekterm",
+        help_text=(
+            "Zoek op woorden in de omschrijving en toelichting van de zaak. De "
+            "resultaten worden gesorteerd op relevantie, tenzij er een andere "
+            "sortering opgegeven is."
+        ),
+    )
+
+    status__statustype = filters.CharFilter(
+        method="filter_status_statustype",
+        help_text=(
+            "Zaken waarvan de huidige status (de laatst gezette status) van het "
+            "opgegeven STATUSTYPE is."
+        ),
+        max_length=get_field_attribute("datamodel.Status", "statustype", "max_length"),
+    )
+
+    zaakgeometrie__bbox = BBoxFilter(
+        method="filter_bbox",
+        help_text=(
+            "Zaken waarvan de geometrie de rechthoek `minx,miny,maxx,maxy` "
+            "(EPSG:4326) snijdt, bijvoorbeeld het zichtbare deel van een kaart."
+        ),
+    )
+    zaakgeometrie__intersects = GeometryFilter(
+        method="filter_intersects",
+        help_text=(
+            "Zaken waarvan de geometrie de opgegeven geometrie (GeoJSON of WKT, "
+            "EPSG:4326) snijdt of raakt."
+        ),
+    )
+
     class Meta:
         model = Zaak
         fields = {
@@ -79,16 +193,32 @@ class ZaakFilter(FilterSet):
             "archiefactiedatum": ["exact", "lt", "gt"],
             "archiefstatus": ["exact", "in"],
             "startdatum": ["exact", "gt", "gte", "lt", "lte"],
+            "einddatum": ["isnull"],
             # filters for werkvoorraad
             "rol__betrokkene_type": ["exact"],
             "rol__betrokkene": ["exact"],
             "rol__omschrijving_generiek": ["exact"],
         }
 
+    def filter_inp_bsn(self, queryset, name, value):
+        return queryset.filter(pk__in=get_zaak_ids(value))
+
+    def filter_zoekterm(self, queryset, name, value):
+        return queryset.search(value)
+
+    def filter_status_statustype(self, queryset, name, value):
+        return queryset.current_statustype(value)
+
+    def filter_bbox(self, queryset, name, value):
+        return queryset.in_bbox(value)
+
+    def filter_intersects(self, queryset, name, value):
+        return queryset.intersects(value)
+
 
 class RolFilter(FilterSet):
     betrokkene_identificatie__natuurlijk_persoon__inp_bsn = filters.CharFilter(
-        field_name="natuurlijkpersoon__inp_bsn",
+        method="filter_inp_bsn",
         help_text=get_help_text("datamodel.NatuurlijkPersoon", "inp_bsn"),
     )
     betrokkene_identificatie__natuurlijk_persoon__anp_identificatie = (
@@ -149,6 +279,9 @@ class RolFilter(FilterSet):
             "omschrijving_generiek",
         )
 
+    def filter_inp_bsn(self, queryset, name, value):
+        return queryset.filter(pk__in=get_rol_ids(value))
+
 
 class StatusFilter(FilterSet):
     class Meta:
@@ -190,3 +323,22 @@ class ZaakVerzoekFilter(FilterSet):
     class Meta:
         model = ZaakVerzoek
         fields = ("zaak", "verzoek")
+
+
+class AuditTrailFilter(FilterSet):
+    wijzigingen = filters.BooleanFilter(
+        method="filter_wijzigingen",
+        help_text=(
+            "Geef `false` op om de regels zonder de `wijzigingen` op te vragen. "
+            "Standaard worden de wijzigingen meegegeven."
+        ),
+    )
+
+    class Meta:
+        model = AuditTrail
+        fields = ("wijzigingen",)
+
+    def filter_wijzigingen(self, queryset, name, value):
+        if value is False:
+            return queryset.defer("snapshot", "diff")
+        return queryset
@@ -0,0 +1,126 @@
+"""
+Serialize geometries to GeoJSON in the database.
+
+Loading a geometry in Python parses its EWKB into a GEOS object, and
+``rest_framework_gis`` converts that object to GeoJSON again, for every row of a
+page. For the geometries in ``geojson_fields``, :class:`GeoJSONMixin` selects
+``ST_AsGeoJSON`` instead of the geometry column in the list and search
+operations, and the :class:`GeometryField` outputs that GeoJSON as is.
+
+Overview maps don't need the full detail: the ``precisie`` query parameter
+limits the number of decimals of the coordinates, and with ``vereenvoudigd``
+the simplified geometry is selected.
+"""
+import json
+from types import SimpleNamespace
+from typing import Dict, Optional, Tuple
+
+from django.contrib.gis.db.models.functions import AsGeoJSON
+from django.utils.translation import ugettext_lazy as _
+
+from rest_framework import serializers
+from rest_framework_gis import fields
+
+# the most decimals that are meaningful in a double
+MAX_PRECISION = 15
+
+
+def get_geojson_name(field: str) -> str:
+    """
+    Return the name of the annotation with the GeoJSON of ``field``.
+    """
+    return f"{field}_geojson"
+
+
+class GeometryField(fields.GeometryField):
+    """
+    Output the GeoJSON selected by :class:`GeoJSONMixin`, if it was selected.
+    """
+
+    def get_attribute(self, instance):
+        name = get_geojson_name(self.source)
+        if name in instance.__dict__:
+            return instance.__dict__[name]
+        return super().get_attribute(instance)
+
+    def to_representation(self, value):
+        if isinstance(value, str):
+            return json.loads(value)
+        return super().to_representation(value)
+
+
+class GeoJSONParametersSerializer(serializers.Serializer):
+    precisie = serializers.IntegerField(
+        required=False,
+        min_value=0,
+        max_value=MAX_PRECISION,
+        help_text=_("Het aantal decimalen van de coördinaten van de geometrieën."),
+    )
+    vereenvoudigd = serializers.BooleanField(
+        required=False,
+        help_text=_(
+            "Geef de vereenvoudigde geometrieën terug, bijvoorbeeld voor "
+            "overzichtskaarten."
+        ),
+    )
+
+
+class GeoJSONMixin:
+    """
+    Select the GeoJSON of the geometries in list and search responses.
+
+    ``geojson_fields`` maps the geometry fields to their simplified version.
+    """
+
+    geojson_fields: Dict[str, str] = {}
+    geojson_actions = ("list", "_zoek")
+
+    _geojson_parameters = None
+
+    def get_geojson_parameters(self) -> Optional[Tuple[int, bool]]:
+        """
+        Return the precision and whether to simplify, or None to load the
+        geometries.
+        """
+        if self.action not in self.geojson_actions:
+            return None
+
+        if self._geojson_parameters is None:
+            serializer = GeoJSONParametersSerializer(data=self.request.query_params)
+            serializer.is_valid(raise_exception=True)
+            self._geojson_parameters = (
+                serializer.validated_data.get("precisie", MAX_PRECISION),
+                serializer.validated_data.get("vereenvoudigd", False),
+            )
+        return self._geojson_parameters
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        parameters = self.get_geojson_parameters()
+        if parameters is None:
+            return queryset
+
+        precision, simplified = parameters
+        # see SparseFieldsetMixin
+        get_requested_fields = getattr(self, "get_requested_fields", None)
+        requested = get_requested_fields() if get_requested_fields else None
+
+        for field, simplified_field in self.geojson_fields.items():
+            if requested is not None and field not in requested:
+                continue
+            source = simplified_field if simplified else field
+            queryset = queryset.defer(field).annotate(
+                **{get_geojson_name(field): AsGeoJSON(source, precision=precision)}
+            )
+        return queryset
+
+    def _check_query_params(self, request) -> None:
+        # the parameters are not known to the filterset
+        names = set(GeoJSONParametersSerializer().fields)
+        if not names & set(request.query_params):
+            return super()._check_query_params(request)
+
+        query_params = request.query_params.copy()
+        for name in names & set(query_params):
+            del query_params[name]
+        super()._check_query_params(SimpleNamespace(query_params=query_params))
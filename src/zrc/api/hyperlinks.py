@@ -0,0 +1,207 @@
+"""
+Build the hyperlinks to resources from templates compiled once per route.
+
+Django's ``reverse()`` looks up the URL pattern, checks and quotes the
+arguments and builds the path for every single link, and a page of zaken links
+every row several times. Instead, the path of a route is reversed once with
+placeholders for the lookup values, like ``/api/v1/zaken/{uuid}``, and every
+link after that only fills in the template. The scheme and host are determined
+once per request. The same templates parse the paths of incoming hyperlinks,
+see :func:`get_lookup_value`. Links that ``reverse()`` can't build from a
+template (e.g. with a format suffix, or for a request with the format override
+query parameter) are built by DRF's ``reverse()``.
+
+The serializer fields and base classes in this module build their links this
+way, and are used throughout :mod:`zrc.api.serializers`.
+"""
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from django.urls import NoReverseMatch, get_script_prefix, reverse as django_reverse
+
+from rest_framework import relations, serializers
+from rest_framework.request import Request
+from rest_framework.reverse import reverse as drf_reverse
+from rest_framework.settings import api_settings
+from rest_framework.versioning import URLPathVersioning
+from rest_framework_nested import (
+    relations as nested_relations,
+    serializers as nested_serializers,
+)
+from vng_api_common.serializers import (
+    LengthHyperlinkedRelatedField as _LengthHyperlinkedRelatedField,
+)
+
+# the URL kwargs that are part of the route instead of its lookup values
+STATIC_KWARGS = ("version",)
+
+# quoted like django.urls.resolvers.URLResolver._reverse_with_prefix
+SAFE_CHARACTERS = "!$&'()*+,;=/~:@"
+
+TemplateKey = Tuple[str, Tuple[str, ...], Tuple[Tuple[str, str], ...], str]
+
+_templates: Dict[TemplateKey, Optional[str]] = {}
+
+
+def _get_placeholder(index: int) -> str:
+    # matches the lookup patterns of the routes, including the UUID ones
+    return f"{index:08x}-0000-4000-8000-000000000000"
+
+
+def _compile(viewname: str, names: Tuple[str, ...], static: dict) -> Optional[str]:
+    placeholders = {name: _get_placeholder(index) for index, name in enumerate(names)}
+    try:
+        path = django_reverse(viewname, kwargs={**static, **placeholders})
+    except NoReverseMatch:
+        return None
+
+    template = path.replace("{", "{{").replace("}", "}}")
+    for name, placeholder in placeholders.items():
+        if template.count(placeholder) != 1:
+            return None
+        template = template.replace(placeholder, f"{{{name}}}")
+    return template
+
+
+def _get_template(viewname: str, names: Tuple[str, ...], static: dict) -> Optional[str]:
+    key = (viewname, names, tuple(static.items()), get_script_prefix())
+    try:
+        return _templates[key]
+    except KeyError:
+        template = _templates[key] = _compile(viewname, names, static)
+        return template
+
+
+def build_path(viewname: str, kwargs: dict) -> str:
+    """
+    Return the path of the route ``viewname`` like ``reverse()``.
+    """
+    names = tuple(sorted(name for name in kwargs if name not in STATIC_KWARGS))
+    static = {name: str(kwargs[name]) for name in STATIC_KWARGS if name in kwargs}
+
+    template = _get_template(viewname, names, static)
+    if template is None:
+        return django_reverse(viewname, kwargs=kwargs)
+    return template.format(
+        **{name: quote(str(kwargs[name]), safe=SAFE_CHARACTERS) for name in names}
+    )
+
+
+def get_lookup_value(viewname: str, name: str, path: str, **static) -> Optional[str]:
+    """
+    Return the lookup value ``name`` if ``path`` is a path of route ``viewname``.
+
+    The inverse of :func:`build_path` for routes with a single lookup value,
+    without going through the URL resolver.
+    """
+    static = {key: str(value) for key, value in static.items()}
+    template = _get_template(viewname, (name,), static)
+    if template is None:
+        return None
+
+    prefix, suffix = (
+        bit.replace("{{", "{").replace("}}", "}")
+        for bit in template.split(f"{{{name}}}")
+    )
+    if not (
+        len(path) > len(prefix) + len(suffix)
+        and path.startswith(prefix)
+        and path.endswith(suffix)
+    ):
+        return None
+
+    value = unquote(path[len(prefix) : len(path) - len(suffix)])
+    return value if "/" not in value else None
+
+
+def get_host(request: Request) -> str:
+    """
+    Return the scheme and host of the absolute URLs built for ``request``.
+    """
+    try:
+        return request._hyperlink_host
+    except AttributeError:
+        request._hyperlink_host = request.build_absolute_uri("/")[:-1]
+        return request._hyperlink_host
+
+
+def reverse(viewname, args=None, kwargs=None, request=None, format=None, **extra):
+    """
+    Drop-in replacement of ``rest_framework.reverse.reverse``.
+    """
+    scheme = getattr(request, "versioning_scheme", None)
+    # DRF's reverse() keeps the format override of the request in the link
+    format_override = api_settings.URL_FORMAT_OVERRIDE
+    if (
+        args
+        or format
+        or extra
+        or (scheme is not None and not isinstance(scheme, URLPathVersioning))
+        or (request is not None and format_override in request.GET)
+    ):
+        return drf_reverse(
+            viewname, args, kwargs, request=request, format=format, **extra
+        )
+
+    kwargs = dict(kwargs or {})
+    if scheme is not None and request.version is not None:
+        kwargs[scheme.version_param] = request.version
+
+    path = build_path(viewname, kwargs)
+    if request is None:
+        return path
+    return f"{get_host(request)}{path}"
+
+
+class HyperlinkMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reverse = reverse
+
+
+class HyperlinkedRelatedField(HyperlinkMixin, relations.HyperlinkedRelatedField):
+    pass
+
+
+class LengthHyperlinkedRelatedField(HyperlinkMixin, _LengthHyperlinkedRelatedField):
+    pass
+
+
+class HyperlinkedIdentityField(HyperlinkMixin, relations.HyperlinkedIdentityField):
+    pass
+
+
+class NestedHyperlinkedRelatedField(
+    HyperlinkMixin, nested_relations.NestedHyperlinkedRelatedField
+):
+    pass
+
+
+class NestedHyperlinkedIdentityField(
+    HyperlinkMixin, nested_relations.NestedHyperlinkedIdentityField
+):
+    pass
+
+
+class HyperlinkedFieldsMixin:
+    """
+    Use the hyperlink fields of this module for the generated model fields.
+
+    Like vng-api-common sets up for the DRF serializers, the generated related
+    fields validate the length of the URLs.
+    """
+
+    serializer_related_field = LengthHyperlinkedRelatedField
+    serializer_url_field = HyperlinkedIdentityField
+
+
+class HyperlinkedModelSerializer(
+    HyperlinkedFieldsMixin, serializers.HyperlinkedModelSerializer
+):
+    pass
+
+
+class NestedHyperlinkedModelSerializer(
+    HyperlinkedFieldsMixin, nested_serializers.NestedHyperlinkedModelSerializer
+):
+    serializer_url_field = NestedHyperlinkedIdentityField
@@ -0,0 +1,91 @@
+"""
+Load every zaak referenced in a request only once.
+
+The URL of the zaak in the body of a write request is resolved by the
+permission check and by the serializer field, and the validators and the view
+use the resulting zaak again. The zaken are kept in an identity map on the
+request, and the URLs are parsed with the compiled route templates of
+:mod:`zrc.api.hyperlinks` instead of the full URL resolver.
+"""
+import uuid
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from django.conf import settings
+
+from rest_framework.request import Request
+
+from zrc.datamodel.models import Zaak
+
+from .hyperlinks import LengthHyperlinkedRelatedField, get_lookup_value
+
+
+def get_identity_map(request: Request) -> Dict[uuid.UUID, Zaak]:
+    try:
+        return request._zaken
+    except AttributeError:
+        request._zaken = {}
+        return request._zaken
+
+
+def get_zaak(request: Request, zaak_uuid: uuid.UUID) -> Zaak:
+    """
+    Return the zaak ``zaak_uuid``, loading it once per request.
+
+    :raises: Zaak.DoesNotExist if the zaak doesn't exist.
+    """
+    zaken = get_identity_map(request)
+    if zaak_uuid not in zaken:
+        zaken[zaak_uuid] = Zaak.objects.get(uuid=zaak_uuid)
+    return zaken[zaak_uuid]
+
+
+def get_zaak_uuid(request: Request, url: str) -> Optional[uuid.UUID]:
+    """
+    Return the uuid of the zaak if ``url`` is the URL of a zaak in this API.
+    """
+    if not isinstance(url, str):
+        return None
+
+    version = getattr(request, "version", None)
+    if version is None:
+        version = settings.REST_FRAMEWORK["DEFAULT_VERSION"]
+
+    value = get_lookup_value("zaak-detail", "uuid", urlparse(url).path, version=version)
+    if value is None:
+        return None
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        return None
+
+
+class ZaakRelatedField(LengthHyperlinkedRelatedField):
+    """
+    Resolve hyperlinks to zaken through the identity map of the request.
+    """
+
+    def to_internal_value(self, data):
+        request = self.context.get("request")
+        zaak_uuid = get_zaak_uuid(request, data) if request is not None else None
+        if zaak_uuid is None:
+            return super().to_internal_value(data)
+
+        try:
+            return get_zaak(request, zaak_uuid)
+        except Zaak.DoesNotExist:
+            self.fail("does_not_exist")
+
+
+class ZaakRelatedFieldMixin:
+    """
+    Use :class:`ZaakRelatedField` for the generated hyperlinks to a zaak.
+    """
+
+    def build_relational_field(self, field_name, relation_info):
+        field_class, field_kwargs = super().build_relational_field(
+            field_name, relation_info
+        )
+        if relation_info.related_model is Zaak and not relation_info.to_many:
+            field_class = ZaakRelatedField
+        return field_class, field_kwargs
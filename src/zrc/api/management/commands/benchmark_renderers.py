@@ -0,0 +1,73 @@
+import timeit
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from djangorestframework_camel_case.render import CamelCaseJSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.versioning import URLPathVersioning
+
+from zrc.datamodel.models import Zaak
+
+from ...renderers import CamelCaseJSONRenderer as FastCamelCaseJSONRenderer
+from ...serializers import ZaakSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the time to render pages of zaken with the camelCase JSON "
+        "renderer of the API and the one of djangorestframework-camel-case"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=settings.REST_FRAMEWORK["PAGE_SIZE"],
+            help="Number of zaken on a page",
+        )
+        parser.add_argument(
+            "--number", type=int, default=50, help="Number of pages to render"
+        )
+        parser.add_argument(
+            "--host",
+            default=(settings.ALLOWED_HOSTS or ["localhost"])[0],
+            help="Host to build the URLs in the zaken with",
+        )
+
+    def handle(self, **options):
+        request = Request(APIRequestFactory().get("/", HTTP_HOST=options["host"]))
+        request.version = settings.REST_FRAMEWORK["DEFAULT_VERSION"]
+        request.versioning_scheme = URLPathVersioning()
+
+        zaken = Zaak.objects.order_by("-pk")[: options["page_size"]]
+        if not zaken:
+            raise CommandError("There are no zaken to render")
+
+        # serialize once, only the rendering is compared
+        data = {
+            "count": len(zaken),
+            "next": None,
+            "previous": None,
+            "results": ZaakSerializer(
+                zaken, many=True, context={"request": request}
+            ).data,
+        }
+
+        renderers = [FastCamelCaseJSONRenderer(), CamelCaseJSONRenderer()]
+        # the djangorestframework-camel-case renderer converts the lists in the
+        # data in place, so it goes last
+        output = {renderer.render(data) for renderer in renderers}
+        if len(output) != 1:
+            raise CommandError("The renderers produced different output")
+
+        for renderer in reversed(renderers):
+            seconds = timeit.timeit(
+                lambda: renderer.render(data), number=options["number"]
+            )
+            self.stdout.write(
+                f"{renderer.__module__}.{type(renderer).__name__}: "
+                f"{seconds / options['number'] * 1000:.2f} ms per page of "
+                f"{len(zaken)} zaken"
+            )
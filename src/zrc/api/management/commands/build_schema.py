@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from ...schema_artifacts import build_artifacts
+
+
+class Command(BaseCommand):
+    help = "Generate the OpenAPI schema artifacts served by the schema endpoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.SCHEMA_ARTIFACTS_DIR,
+            help="Directory to write the schema artifacts to",
+        )
+
+    def handle(self, **options):
+        manifest = build_artifacts(options["output"])
+        for format, entry in manifest.items():
+            self.stdout.write(f"Wrote {entry['filename']} (ETag {entry['etag']})")
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from ...oas import build_bundle, write_bundle
+
+
+class Command(BaseCommand):
+    help = "Download the remote API specs and compile them for offline validation"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.REMOTE_SPECS_BUNDLE,
+            help="Path of the bundle to write",
+        )
+
+    def handle(self, **options):
+        bundle = build_bundle()
+        write_bundle(bundle, options["output"])
+        self.stdout.write(f"Wrote {len(bundle)} API specs to {options['output']}")
@@ -1,8 +1,13 @@
-from typing import Optional
+from types import SimpleNamespace
+from typing import Dict, Optional, Set, Tuple
 
 from django.db import models
+from django.utils.translation import ugettext_lazy as _
 
+from djangorestframework_camel_case.util import camel_to_underscore
 from rest_framework import serializers
+from vng_api_common.polymorphism import Discriminator
+from vng_api_common.utils import underscore_to_camel
 
 from zrc.api.scopes import SCOPE_ZAKEN_GEFORCEERD_BIJWERKEN
 from zrc.datamodel.models import Zaak
@@ -65,3 +70,88 @@ class ClosedZaakMixin:
         zaak = instance.zaak
         self._check_zaak_closed(zaak)
         super().perform_destroy(instance)
+
+
+class SparseFieldsetMixin:
+    """
+    Limit the fields in list and retrieve responses with the ``fields`` query
+    parameter.
+
+    The unrequested fields are removed from the serializer before anything is
+    serialized, so their relations are never queried. ``prefetch_fields`` maps
+    fields to the lookups that are only prefetched when the field is requested,
+    and the model fields in ``defer_fields`` are only loaded when requested.
+    """
+
+    fields_query_param = "fields"
+    prefetch_fields: Dict[str, str] = {}
+    defer_fields: Tuple[str, ...] = ()
+
+    def get_requested_fields(self) -> Optional[Set[str]]:
+        """
+        Return the requested (snake_case) field names, or None for all fields.
+        """
+        if self.action not in ("list", "retrieve"):
+            return None
+        value = self.request.query_params.get(self.fields_query_param)
+        if not value:
+            return None
+        names = (name.strip() for name in value.split(","))
+        return {camel_to_underscore(name) for name in names if name}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        requested = self.get_requested_fields()
+
+        prefetches = [
+            lookup
+            for field, lookup in self.prefetch_fields.items()
+            if requested is None or field in requested
+        ]
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+
+        if requested is not None:
+            deferred = [field for field in self.defer_fields if field not in requested]
+            if deferred:
+                queryset = queryset.defer(*deferred)
+
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        requested = self.get_requested_fields()
+        if requested is None:
+            return serializer
+
+        child = getattr(serializer, "child", serializer)
+        # the polymorphic serializers add the group field to the output
+        discriminator = getattr(child, "discriminator", None)
+        group_field = discriminator.group_field if discriminator else None
+
+        unknown = requested - set(child.fields) - {group_field}
+        if unknown:
+            names = ", ".join(sorted(underscore_to_camel(name) for name in unknown))
+            raise serializers.ValidationError(
+                {self.fields_query_param: _("Onbekende velden: %s") % names},
+                code="unknown-fields",
+            )
+
+        for name in set(child.fields) - requested:
+            child.fields.pop(name)
+        if group_field and group_field not in requested:
+            # no serializer matches, so nothing is added
+            child.discriminator = Discriminator(
+                discriminator.discriminator_field, mapping={}
+            )
+
+        return serializer
+
+    def _check_query_params(self, request) -> None:
+        # the parameter is known to every endpoint, but not to the filterset
+        if self.fields_query_param not in request.query_params:
+            return super()._check_query_params(request)
+
+        query_params = request.query_params.copy()
+        del query_params[self.fields_query_param]
+        super()._check_query_params(SimpleNamespace(query_params=query_params))
@@ -0,0 +1,121 @@
+"""
+Notification mixins that write to the outbox instead of sending directly.
+
+The messages are constructed exactly like :mod:`vng_api_common` does (including
+the ``kenmerken``), but stored in the outbox table in the same transaction as
+the change itself. They are delivered by the ``deliver_notifications``
+management command, see :mod:`zrc.outbox.delivery`.
+
+The same messages record the change in the change feed, also when sending
+notifications is disabled.
+"""
+from typing import List
+
+from django.conf import settings
+
+from vng_api_common.notifications.viewsets import (
+    NotificationCreateMixin as _NotificationCreateMixin,
+    NotificationDestroyMixin as _NotificationDestroyMixin,
+    NotificationViewSetMixin as _NotificationViewSetMixin,
+)
+
+from zrc.changes.feed import record_change, record_deletions
+from zrc.changes.models import Change
+from zrc.datamodel.models import (
+    KlantContact,
+    Resultaat,
+    Rol,
+    Status,
+    Zaak,
+    ZaakBesluit,
+    ZaakContactMoment,
+    ZaakEigenschap,
+    ZaakInformatieObject,
+    ZaakObject,
+    ZaakVerzoek,
+)
+from zrc.outbox.models import OutboxNotification
+
+from .hyperlinks import reverse
+
+# the sub-resources of a zaak in the change feed, and whether their URLs are
+# nested in the URL of the zaak
+FEED_SUBRESOURCES = (
+    (Status, False),
+    (Resultaat, False),
+    (Rol, False),
+    (ZaakObject, False),
+    (ZaakInformatieObject, False),
+    (ZaakEigenschap, True),
+    (KlantContact, False),
+    (ZaakBesluit, True),
+    (ZaakContactMoment, False),
+    (ZaakVerzoek, False),
+)
+
+
+class OutboxMixin:
+    def notify(self, status_code: int, data, instance=None) -> None:
+        # only notify about successful operations
+        if not 200 <= status_code < 300:
+            return
+
+        message = self.construct_message(data, instance=instance)
+        record_change(message)
+
+        if settings.NOTIFICATIONS_DISABLED:
+            return
+        OutboxNotification.objects.create(message=message)
+
+
+class NotificationCreateMixin(OutboxMixin, _NotificationCreateMixin):
+    pass
+
+
+class NotificationDestroyMixin(OutboxMixin, _NotificationDestroyMixin):
+    pass
+
+
+class NotificationViewSetMixin(OutboxMixin, _NotificationViewSetMixin):
+    pass
+
+
+def record_cascaded_deletions(request, zaken: List[Zaak]) -> None:
+    """
+    Record the deletion of the deelzaken and the sub-resources of ``zaken`` in
+    the change feed.
+
+    :func:`zrc.datamodel.deletion.delete_zaken` deletes them without the
+    viewsets, so without notifications. The first zaak is the one deleted
+    through the API, which is notified as usual.
+    """
+    zaken_by_pk = {zaak.pk: zaak for zaak in zaken}
+    urls = {
+        zaak.pk: reverse("zaak-detail", kwargs={"uuid": zaak.uuid}, request=request)
+        for zaak in zaken
+    }
+
+    def build_change(resource: str, resource_url: str, zaak: Zaak) -> Change:
+        return Change(
+            resource=resource,
+            resource_url=resource_url,
+            hoofd_object=urls[zaak.pk],
+            zaaktype=zaak.zaaktype,
+            vertrouwelijkheidaanduiding=zaak.vertrouwelijkheidaanduiding,
+        )
+
+    changes = [build_change("zaak", urls[zaak.pk], zaak) for zaak in zaken[1:]]
+    for model, nested in FEED_SUBRESOURCES:
+        resource = model._meta.model_name
+        rows = model._base_manager.filter(zaak__in=list(zaken_by_pk)).values_list(
+            "uuid", "zaak_id"
+        )
+        for uuid, zaak_id in rows.order_by("pk"):
+            zaak = zaken_by_pk[zaak_id]
+            kwargs = {"uuid": uuid}
+            if nested:
+                kwargs["zaak_uuid"] = zaak.uuid
+            url = reverse(f"{resource}-detail", kwargs=kwargs, request=request)
+            changes.append(build_change(resource, url, zaak))
+
+    record_deletions(changes)
@@ -0,0 +1,150 @@
+"""
+Vendored shapes of the remote API resources we validate against.
+
+:class:`vng_api_common.validators.ResourceValidator` (and
+:class:`~vng_api_common.validators.PublishValidator`) download and parse the
+complete OpenAPI spec of the remote API on first use in every worker. Only the
+``required`` and ``properties`` of a handful of resources are needed for the
+shape checks, so those are extracted at build time by the
+``bundle_api_specs`` management command into a small JSON bundle.
+
+The bundle is read once when the app registry is ready and primes the schema
+cache of :mod:`vng_api_common`, so no remote spec is downloaded at runtime.
+"""
+import json
+import logging
+import os
+from typing import Dict, Iterable
+
+from django.conf import settings
+
+import requests
+import yaml
+from vng_api_common.validators import fetcher
+
+logger = logging.getLogger(__name__)
+
+# setting holding the spec URL -> resources validated with that spec
+REMOTE_SPECS = {
+    "ZTC_API_SPEC": (
+        "ZaakType",
+        "StatusType",
+        "RolType",
+        "ResultaatType",
+        "Eigenschap",
+    ),
+    "REFERENTIELIJSTEN_API_SPEC": ("CommunicatieKanaal", "Resultaat"),
+    "ZRC_API_SPEC": ("Zaak",),
+    "DRC_API_SPEC": ("EnkelvoudigInformatieObject",),
+    "CMC_API_SPEC": ("ContactMoment",),
+    "VRC_API_SPEC": ("Verzoek",),
+}
+
+SCHEMA_REF_PREFIX = "#/components/schemas/"
+
+# the keywords of a property that ``vng_api_common.oas.obj_has_shape`` reads
+PROPERTY_KEYWORDS = ("type", "nullable", "format", "$ref")
+
+
+def compile_property(schema: dict) -> dict:
+    compiled = {key: schema[key] for key in PROPERTY_KEYWORDS if key in schema}
+    if "type" not in compiled and "$ref" not in compiled:
+        # a composition (allOf/oneOf/...) - like a reference, the shape check
+        # skips it
+        compositions = (schema.get(key) for key in ("allOf", "oneOf", "anyOf"))
+        refs = [
+            part["$ref"]
+            for parts in compositions
+            if parts
+            for part in parts
+            if "$ref" in part
+        ]
+        compiled["$ref"] = refs[0] if refs else ""
+    return compiled
+
+
+def compile_shape(schemas: Dict[str, dict], resource: str) -> dict:
+    """
+    Reduce the schema of ``resource`` to what is needed for the shape check.
+
+    ``allOf`` compositions are flattened, since the shape check only looks at
+    the top-level ``required`` and ``properties``. Of every property, only the
+    keywords the shape check reads are kept.
+    """
+    schema = schemas[resource]
+    required = list(schema.get("required", []))
+    properties = {
+        name: compile_property(prop)
+        for name, prop in schema.get("properties", {}).items()
+    }
+
+    for part in schema.get("allOf", []):
+        ref = part.get("$ref", "")
+        if ref.startswith(SCHEMA_REF_PREFIX):
+            part = compile_shape(schemas, ref[len(SCHEMA_REF_PREFIX) :])
+        else:
+            part = {
+                "required": part.get("required", []),
+                "properties": {
+                    name: compile_property(prop)
+                    for name, prop in part.get("properties", {}).items()
+                },
+            }
+        required += [name for name in part["required"] if name not in required]
+        for name, prop in part["properties"].items():
+            properties.setdefault(name, prop)
+
+    return {"required": required, "properties": properties}
+
+
+def compile_spec(spec: dict, resources: Iterable[str]) -> dict:
+    schemas = spec["components"]["schemas"]
+    return {
+        "openapi": spec["openapi"],
+        "components": {
+            "schemas": {
+                resource: compile_shape(schemas, resource) for resource in resources
+            }
+        },
+    }
+
+
+def build_bundle() -> Dict[str, dict]:
+    """
+    Download the remote specs and compile them into a bundle.
+    """
+    bundle = {}
+    for setting, resources in REMOTE_SPECS.items():
+        url = getattr(settings, setting)
+        logger.info("Fetching %s for %s", url, ", ".join(resources))
+        response = requests.get(url)
+        response.raise_for_status()
+        spec = yaml.safe_load(response.content)
+        bundle[url] = compile_spec(spec, resources)
+    return bundle
+
+
+def write_bundle(bundle: Dict[str, dict], path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as outfile:
+        json.dump(bundle, outfile, indent=2, sort_keys=True)
+
+
+def load_bundle(path: str = None) -> int:
+    """
+    Prime the ``vng_api_common`` schema cache with the vendored specs.
+
+    :return: the number of specs loaded
+    """
+    path = path or settings.REMOTE_SPECS_BUNDLE
+    if not os.path.exists(path):
+        logger.info("No vendored API specs found at %s", path)
+        return 0
+
+    with open(path) as infile:
+        bundle = json.load(infile)
+
+    # don't override specs that were fetched already
+    for url, spec in bundle.items():
+        fetcher.cache.setdefault(url, spec)
+    return len(bundle)
@@ -0,0 +1,58 @@
+from collections import OrderedDict
+from typing import Optional
+
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class AuditTrailPagination(CursorPagination):
+    """
+    Page through an audit trail in the order it was written.
+
+    The cursor points into the index on the main object and ``aanmaakdatum``,
+    so every page is a range scan, no matter how long the audit trail is.
+    """
+
+    ordering = ("aanmaakdatum", "id")
+
+
+class ChangeFeedPagination(BasePagination):
+    """
+    Page through the change feed from the position given by ``since``.
+
+    Every page links to the next one with the position of its last change, as
+    long as there are more changes.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        changes = list(queryset[: self.page_size + 1])
+        self.has_next = len(changes) > self.page_size
+        self.changes = changes[: self.page_size]
+        return self.changes
+
+    def get_token(self) -> Optional[str]:
+        if self.changes:
+            return self.changes[-1].token
+        return self.request.query_params.get("since")
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, "since", self.get_token())
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("token", self.get_token()),
+                    ("results", data),
+                ]
+            )
+        )
@@ -0,0 +1,25 @@
+import json
+
+from django.conf import settings
+
+from djangorestframework_camel_case import parser
+from rest_framework.exceptions import ParseError
+
+from .camelcase import underscoreize_object
+
+
+class CamelCaseJSONParser(parser.CamelCaseJSONParser):
+    """
+    Parse to the same data as the ``djangorestframework_camel_case`` parser,
+    converting the keys while decoding instead of in a second pass.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        try:
+            data = stream.read().decode(encoding)
+            return json.loads(data, object_hook=underscoreize_object)
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -4,6 +4,8 @@ from vng_api_common.permissions import (
     RelatedObjAuthScopesRequired,
 )
 
+from .identity import get_zaak, get_zaak_uuid
+
 
 class ZaakAuthScopesRequired(MainObjAuthScopesRequired):
     """
@@ -23,6 +25,13 @@ class ZaakRelatedAuthScopesRequired(RelatedObjAuthScopesRequired):
     permission_fields = ("zaaktype", "vertrouwelijkheidaanduiding")
     obj_path = "zaak"
 
+    def _get_obj(self, view, request):
+        zaak_uuid = get_zaak_uuid(request, request.data.get(self.obj_path))
+        if zaak_uuid is None:
+            return super()._get_obj(view, request)
+        # the serializer gets the same zaak from the identity map
+        return get_zaak(request, zaak_uuid)
+
 
 class ZaakBaseAuthRequired(BaseAuthRequired):
     permission_fields = ("zaaktype", "vertrouwelijkheidaanduiding")
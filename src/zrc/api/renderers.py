@@ -0,0 +1,93 @@
+import json
+from functools import lru_cache
+
+from djangorestframework_camel_case import render
+from rest_framework.compat import LONG_SEPARATORS, SHORT_SEPARATORS
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .camelcase import camelize
+
+
+def render_line(data) -> bytes:
+    return f"{json.dumps(camelize(data), cls=JSONEncoder)}\n".encode()
+
+
+@lru_cache()
+def get_encoder(
+    encoder_class: type, ensure_ascii: bool, allow_nan: bool, separators: tuple
+) -> json.JSONEncoder:
+    # the rendered data is a fresh tree without cycles, checking for them only
+    # slows down the (C) encoder
+    return encoder_class(
+        ensure_ascii=ensure_ascii,
+        allow_nan=allow_nan,
+        separators=separators,
+        check_circular=False,
+    )
+
+
+class CamelCaseJSONRenderer(render.CamelCaseJSONRenderer):
+    """
+    Render the same bytes as the ``djangorestframework_camel_case`` renderer,
+    with cached key conversions and a reused encoder.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None:
+            # indented responses are only for humans
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encoder = get_encoder(
+            self.encoder_class,
+            self.ensure_ascii,
+            not self.strict,
+            SHORT_SEPARATORS if self.compact else LONG_SEPARATORS,
+        )
+        ret = encoder.encode(camelize(data))
+        # see rest_framework.renderers.JSONRenderer
+        ret = ret.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+        return ret.encode("utf-8")
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline delimited JSON, for responses streamed one record per line.
+
+    Streamed responses write their lines with :func:`render_line` themselves,
+    this renders the other responses (like errors) as a single line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return render_line(data)
+
+
+class MVTRenderer(BaseRenderer):
+    """
+    Mapbox vector tiles, which are generated by the database.
+
+    The other responses (like errors) are rendered as JSON.
+    """
+
+    media_type = "application/vnd.mapbox-vector-tile"
+    format = "pbf"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, bytes):
+            return data
+
+        response = (renderer_context or {}).get("response")
+        if response is not None:
+            response["Content-Type"] = "application/json"
+        return CamelCaseJSONRenderer().render(data)
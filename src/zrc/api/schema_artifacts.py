@@ -0,0 +1,206 @@
+"""
+Serve the OpenAPI schema from artifacts built ahead of time.
+
+Generating the schema walks every viewset, serializer and filterset and takes
+seconds of CPU on a cold worker. The ``build_schema`` management command
+renders the OpenAPI 3 schema served by :class:`vng_api_common.schema.SchemaView`
+once for every format at image build time, and writes the output and a
+manifest with the content type and checksum to ``settings.SCHEMA_ARTIFACTS_DIR``.
+The artifacts keep the relative ``servers`` of the schema, since the host of
+the deployment is not known at build time.
+
+At runtime, the artifacts are read once per process. Like the regular view,
+the ``servers`` are made absolute for the host of the request, and the schema
+is rendered once per set of servers and served with a strong ETag. If the
+artifacts are not present (e.g. in development), or the Swagger 2.0 version is
+requested (``?v=2``), the schema is generated on the fly by the regular view.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.urls import get_script_prefix
+from django.utils.cache import patch_response_headers, patch_vary_headers
+
+from drf_yasg.codecs import yaml_sane_load
+from vng_api_common.schema import SPEC_RENDERERS, SchemaView
+
+logger = logging.getLogger(__name__)
+
+RENDERERS = {renderer.format: renderer for renderer in SPEC_RENDERERS}
+
+FORMATS = tuple(RENDERERS)
+
+MANIFEST = "manifest.json"
+
+# bounds the renderings kept per artifact, the ``Host`` comes from the client
+MAX_RENDERINGS = 16
+
+# artifacts loaded in this process, ``None`` when they're not available
+_artifacts = {}
+
+generated_schema_view = SchemaView.without_ui(cache_timeout=settings.SPEC_CACHE_TIMEOUT)
+
+
+class Rendering:
+    def __init__(self, content: bytes):
+        self.content = content
+        self.etag = get_etag(content)
+        self.gzipped = gzip.compress(content)
+
+
+class SchemaArtifact:
+    def __init__(self, schema: dict, format: str, content_type: str):
+        self.schema = schema
+        self.format = format
+        self.content_type = content_type
+        # the renderings per set of (absolute) servers - one per host that
+        # serves the API
+        self._renderings = {}
+
+    def get_rendering(self, servers: Tuple[str, ...]) -> Rendering:
+        if servers not in self._renderings:
+            if len(self._renderings) >= MAX_RENDERINGS:
+                self._renderings.clear()
+            schema = {
+                **self.schema,
+                "servers": [
+                    {**server, "url": url}
+                    for server, url in zip(self.schema["servers"], servers)
+                ],
+            }
+            self._renderings[servers] = Rendering(render(schema, self.format))
+        return self._renderings[servers]
+
+    def get_response(self, request) -> HttpResponse:
+        rendering = self.get_rendering(get_server_urls(self.schema, request))
+        use_gzip = "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", "")
+        # strong ETags must differ between the encoded representations
+        etag = f'"{rendering.etag}-gzip"' if use_gzip else f'"{rendering.etag}"'
+
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH", "")
+        if etag in re.split(r"\s*,\s*", if_none_match):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(
+                rendering.gzipped if use_gzip else rendering.content,
+                content_type=self.content_type,
+            )
+            if use_gzip:
+                response["Content-Encoding"] = "gzip"
+
+        response["ETag"] = etag
+        response["X-OAS-Version"] = self.schema["openapi"]
+        patch_vary_headers(response, ("Accept-Encoding",))
+        patch_response_headers(response, cache_timeout=settings.SPEC_CACHE_TIMEOUT)
+        return response
+
+
+def get_server_urls(schema: dict, request) -> Tuple[str, ...]:
+    """
+    Make the relative ``servers`` of the schema absolute, like ``SchemaView``.
+    """
+    prefix = get_script_prefix().rstrip("/")
+    urls = []
+    for server in schema["servers"]:
+        url = server["url"]
+        if not urlsplit(url).netloc:
+            url = request.build_absolute_uri(f"{prefix}{url}")
+        urls.append(url)
+    return tuple(urls)
+
+
+def render(schema: dict, format: str) -> bytes:
+    return RENDERERS[format]().render(schema).encode("utf-8")
+
+
+def get_content_type(format: str) -> str:
+    renderer = RENDERERS[format]
+    if renderer.charset:
+        return f"{renderer.media_type}; charset={renderer.charset}"
+    return renderer.media_type
+
+
+def parse(content: bytes, format: str) -> dict:
+    if format == ".json":
+        return json.loads(content)
+    return yaml_sane_load(content)
+
+
+def get_etag(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def build_artifacts(directory: str) -> Dict[str, dict]:
+    """
+    Render the OpenAPI 3 schema of the runtime view in every format and write
+    them to ``directory``.
+
+    No request is involved, so the ``servers`` stay relative and the build
+    doesn't depend on the allowed hosts.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    with open(SchemaView().get_schema_path(), "r") as infile:
+        schema = yaml_sane_load(infile)
+
+    manifest = {}
+    for format in FORMATS:
+        content = render(schema, format)
+        filename = f"openapi{format}"
+        with open(os.path.join(directory, filename), "wb") as outfile:
+            outfile.write(content)
+
+        manifest[format] = {
+            "filename": filename,
+            "content_type": get_content_type(format),
+            "etag": get_etag(content),
+        }
+
+    with open(os.path.join(directory, MANIFEST), "w") as outfile:
+        json.dump(manifest, outfile, indent=2)
+
+    return manifest
+
+
+def load_artifact(format: str) -> Optional[SchemaArtifact]:
+    directory = settings.SCHEMA_ARTIFACTS_DIR
+    try:
+        with open(os.path.join(directory, MANIFEST)) as infile:
+            entry = json.load(infile)[format]
+        with open(os.path.join(directory, entry["filename"]), "rb") as infile:
+            content = infile.read()
+    except (OSError, KeyError, ValueError):
+        logger.info("No prebuilt schema for %s, falling back to generating it", format)
+        return None
+
+    # don't serve an artifact that was modified after it was built
+    if get_etag(content) != entry["etag"]:
+        logger.warning("Prebuilt schema for %s does not match its manifest", format)
+        return None
+
+    return SchemaArtifact(parse(content, format), format, entry["content_type"])
+
+
+def get_artifact(format: str) -> Optional[SchemaArtifact]:
+    if format not in _artifacts:
+        _artifacts[format] = load_artifact(format)
+    return _artifacts[format]
+
+
+def schema_view(request, version, format):
+    # the Swagger 2.0 version is generated from the code, it isn't prebuilt
+    if request.GET.get("v", "3").startswith("2"):
+        return generated_schema_view(request, version=version, format=format)
+
+    artifact = get_artifact(format)
+    if artifact is None:
+        return generated_schema_view(request, version=version, format=format)
+    return artifact.get_response(request)
@@ -0,0 +1,35 @@
+from django.utils.translation import ugettext_lazy as _
+
+from rest_framework import serializers
+
+from zrc.changes.models import Change
+
+__all__ = ["ChangeSerializer"]
+
+
+class ChangeSerializer(serializers.ModelSerializer):
+    token = serializers.CharField(
+        read_only=True,
+        help_text=_(
+            "De positie in de feed. Gebruik deze als `since` om de wijzigingen "
+            "na deze wijziging op te vragen."
+        ),
+    )
+
+    class Meta:
+        model = Change
+        fields = (
+            "token",
+            "type",
+            "resource",
+            "resource_url",
+            "hoofd_object",
+            "timestamp",
+        )
+        extra_kwargs = {
+            "type": {"help_text": _("Het soort wijziging van de resource.")},
+            "resource": {"help_text": _("De naam van de gewijzigde resource.")},
+            "resource_url": {"help_text": _("URL-referentie naar de resource.")},
+            "hoofd_object": {"help_text": _("URL-referentie naar de ZAAK.")},
+            "timestamp": {"help_text": _("Het moment waarop de wijziging plaatsvond.")},
+        }
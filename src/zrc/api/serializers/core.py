@@ -1,6 +1,7 @@
 import logging
 
 from django.conf import settings
+from django.contrib.gis.db import models as gis_models
 from django.db import transaction
 from django.utils.encoding import force_text
 from django.utils.module_loading import import_string
@@ -12,8 +13,6 @@ from rest_framework import serializers
 from rest_framework.settings import api_settings
 from rest_framework.validators import UniqueTogetherValidator
 from rest_framework_gis.fields import GeometryField
-from rest_framework_nested.relations import NestedHyperlinkedRelatedField
-from rest_framework_nested.serializers import NestedHyperlinkedModelSerializer
 from vng_api_common.constants import (
     Archiefnominatie,
     Archiefstatus,
@@ -62,6 +61,17 @@ from zrc.sync.signals import SyncError
 from zrc.utils.exceptions import DetermineProcessEndDateException
 
 from ..auth import get_auth
+from ..geojson import GeometryField as GeoJSONGeometryField
+from ..hyperlinks import (
+    HyperlinkedFieldsMixin,
+    HyperlinkedModelSerializer,
+    HyperlinkedRelatedField,
+    NestedHyperlinkedModelSerializer,
+    NestedHyperlinkedRelatedField,
+)
+from ..identity import ZaakRelatedFieldMixin
+from ..tiles import MAX_ZOOM
+from ..utils import get_bbox
 from ..validators import (
     CorrectZaaktypeValidator,
     DateNotInFutureValidator,
@@ -109,7 +119,7 @@ logger = logging.getLogger(__name__)
 
 
 # Zaak API
-class ZaakKenmerkSerializer(serializers.HyperlinkedModelSerializer):
+class ZaakKenmerkSerializer(HyperlinkedModelSerializer):
     class Meta:
         model = ZaakKenmerk
         fields = ("kenmerk", "bron")
@@ -157,10 +167,11 @@ class RelevanteZaakSerializer(serializers.ModelSerializer):
 
 
 class ZaakSerializer(
+    ZaakRelatedFieldMixin,
     NestedGegevensGroepMixin,
     NestedCreateMixin,
     NestedUpdateMixin,
-    serializers.HyperlinkedModelSerializer,
+    HyperlinkedModelSerializer,
 ):
     eigenschappen = NestedHyperlinkedRelatedField(
         many=True,
@@ -170,7 +181,7 @@ class ZaakSerializer(
         parent_lookup_kwargs={"zaak_uuid": "zaak__uuid"},
         source="zaakeigenschap_set",
     )
-    status = serializers.HyperlinkedRelatedField(
+    status = HyperlinkedRelatedField(
         source="current_status_uuid",
         read_only=True,
         allow_null=True,
@@ -209,7 +220,7 @@ class ZaakSerializer(
         ),
     )
 
-    deelzaken = serializers.HyperlinkedRelatedField(
+    deelzaken = HyperlinkedRelatedField(
         read_only=True,
         many=True,
         view_name="zaak-detail",
@@ -218,7 +229,7 @@ class ZaakSerializer(
         help_text=_("URL-referenties naar deel ZAAKen."),
     )
 
-    resultaat = serializers.HyperlinkedRelatedField(
+    resultaat = HyperlinkedRelatedField(
         read_only=True,
         allow_null=True,
         view_name="resultaat-detail",
@@ -233,6 +244,12 @@ class ZaakSerializer(
         many=True, required=False, help_text=_("Een lijst van relevante andere zaken.")
     )
 
+    # outputs the GeoJSON selected in the database, see zrc.api.geojson
+    serializer_field_mapping = {
+        **HyperlinkedModelSerializer.serializer_field_mapping,
+        gis_models.GeometryField: GeoJSONGeometryField,
+    }
+
     class Meta:
         model = Zaak
         fields = (
@@ -466,9 +483,39 @@ class ZaakSerializer(
 
         return super().create(validated_data)
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # the related resources requested with the ``expand`` query parameter
+        expanded = self.context.get("expanded")
+        if expanded is not None:
+            data["_expand"] = expanded.get(instance.pk, {})
+        return data
+
 
 class GeoWithinSerializer(serializers.Serializer):
-    within = GeometryField(required=False)
+    within = GeometryField(
+        required=False, help_text=_("Zaken waarvan de geometrie binnen dit vlak ligt.")
+    )
+    intersects = GeometryField(
+        required=False,
+        help_text=_("Zaken waarvan de geometrie deze geometrie snijdt of raakt."),
+    )
+    bbox = serializers.ListField(
+        child=serializers.FloatField(),
+        min_length=4,
+        max_length=4,
+        required=False,
+        help_text=_(
+            "Zaken waarvan de geometrie de rechthoek `[minx, miny, maxx, maxy]` "
+            "snijdt, bijvoorbeeld het zichtbare deel van een kaart."
+        ),
+    )
+
+    def validate_bbox(self, value):
+        try:
+            return get_bbox(value)
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc), code="invalid-bbox")
 
 
 class ZaakZoekSerializer(serializers.Serializer):
@@ -478,6 +525,21 @@ class ZaakZoekSerializer(serializers.Serializer):
         required=False,
         help_text=_("Array of unieke resource identifiers (UUID4)"),
     )
+    zoekterm = serializers.CharField(
+        required=False,
+        help_text=_(
+            "Zoek op woorden in de omschrijving en toelichting van de zaak. De "
+            "resultaten worden gesorteerd op relevantie."
+        ),
+    )
+    status__statustype = serializers.URLField(
+        required=False,
+        max_length=1000,
+        help_text=_(
+            "Zaken waarvan de huidige status (de laatst gezette status) van het "
+            "opgegeven STATUSTYPE is."
+        ),
+    )
 
     def validate(self, attrs):
         validated_attrs = super().validate(attrs)
@@ -488,7 +550,37 @@ class ZaakZoekSerializer(serializers.Serializer):
         return validated_attrs
 
 
-class StatusSerializer(serializers.HyperlinkedModelSerializer):
+class ZaakClusterParametersSerializer(serializers.Serializer):
+    zoom = serializers.IntegerField(
+        min_value=0,
+        max_value=MAX_ZOOM,
+        help_text=_(
+            "Het zoomniveau van de kaart, dat de grootte van de cellen bepaalt: "
+            "een cel is 1/8 van de breedte van een tile op dit zoomniveau."
+        ),
+    )
+    groepering = serializers.ChoiceField(
+        choices=("zaaktype", "statustype"),
+        required=False,
+        help_text=_(
+            "Tel de ZAAKen per cel apart per `zaaktype` of per `statustype` van "
+            "de huidige status."
+        ),
+    )
+
+
+class ZaakClusterSerializer(serializers.Serializer):
+    geometrie = GeometryField(help_text=_("Het zwaartepunt van de ZAAKen in de cel."))
+    aantal = serializers.IntegerField(help_text=_("Het aantal ZAAKen in de cel."))
+    groep = serializers.CharField(
+        allow_null=True,
+        help_text=_(
+            "Het `zaaktype` of `statustype` van de ZAAKen, indien gegroepeerd."
+        ),
+    )
+
+
+class StatusSerializer(ZaakRelatedFieldMixin, HyperlinkedModelSerializer):
     class Meta:
         model = Status
         fields = (
@@ -646,7 +738,9 @@ class StatusSerializer(serializers.HyperlinkedModelSerializer):
         return obj
 
 
-class ZaakObjectSerializer(PolymorphicSerializer):
+class ZaakObjectSerializer(
+    ZaakRelatedFieldMixin, HyperlinkedFieldsMixin, PolymorphicSerializer
+):
     discriminator = Discriminator(
         discriminator_field="object_type",
         mapping={
@@ -761,7 +855,7 @@ class ZaakObjectSerializer(PolymorphicSerializer):
         return zaakobject
 
 
-class ZaakInformatieObjectSerializer(serializers.HyperlinkedModelSerializer):
+class ZaakInformatieObjectSerializer(ZaakRelatedFieldMixin, HyperlinkedModelSerializer):
     aard_relatie_weergave = serializers.ChoiceField(
         source="get_aard_relatie_display",
         read_only=True,
@@ -861,7 +955,7 @@ class ZaakEigenschapSerializer(NestedHyperlinkedModelSerializer):
         return attrs
 
 
-class KlantContactSerializer(serializers.HyperlinkedModelSerializer):
+class KlantContactSerializer(ZaakRelatedFieldMixin, HyperlinkedModelSerializer):
     class Meta:
         model = KlantContact
         fields = (
@@ -883,7 +977,9 @@ class KlantContactSerializer(serializers.HyperlinkedModelSerializer):
         }
 
 
-class RolSerializer(PolymorphicSerializer):
+class RolSerializer(
+    ZaakRelatedFieldMixin, HyperlinkedFieldsMixin, PolymorphicSerializer
+):
     discriminator = Discriminator(
         discriminator_field="betrokkene_type",
         mapping={
@@ -973,7 +1069,7 @@ class RolSerializer(PolymorphicSerializer):
         return rol
 
 
-class ResultaatSerializer(serializers.HyperlinkedModelSerializer):
+class ResultaatSerializer(ZaakRelatedFieldMixin, HyperlinkedModelSerializer):
     class Meta:
         model = Resultaat
         fields = ("url", "uuid", "zaak", "resultaattype", "toelichting")
@@ -1011,7 +1107,7 @@ class ZaakBesluitSerializer(NestedHyperlinkedModelSerializer):
         return super().create(validated_data)
 
 
-class ZaakContactMomentSerializer(serializers.HyperlinkedModelSerializer):
+class ZaakContactMomentSerializer(ZaakRelatedFieldMixin, HyperlinkedModelSerializer):
     class Meta:
         model = ZaakContactMoment
         fields = ("url", "uuid", "zaak", "contactmoment")
@@ -1042,7 +1138,7 @@ class ZaakContactMomentSerializer(serializers.HyperlinkedModelSerializer):
             ) from sync_error
 
 
-class ZaakVerzoekSerializer(serializers.HyperlinkedModelSerializer):
+class ZaakVerzoekSerializer(ZaakRelatedFieldMixin, HyperlinkedModelSerializer):
     class Meta:
         model = ZaakVerzoek
         fields = ("url", "uuid", "zaak", "verzoek")
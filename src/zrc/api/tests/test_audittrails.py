@@ -5,15 +5,16 @@ from unittest.mock import patch
 from django.test import override_settings
 
 from rest_framework import status
-from rest_framework.test import APITestCase
-from vng_api_common.audittrails.models import AuditTrail
+from rest_framework.test import APITransactionTestCase
 from vng_api_common.constants import VertrouwelijkheidsAanduiding
 from vng_api_common.tests import JWTAuthMixin, reverse
 from vng_api_common.utils import get_uuid_from_path
 from zds_client.tests.mocks import mock_client
 
+from zrc.audit.history import reconstruct
+from zrc.audit.models import AuditTrail
 from zrc.datamodel.models import Resultaat, Zaak, ZaakInformatieObject
-from zrc.tests.utils import ZAAK_WRITE_KWARGS
+from zrc.tests.utils import ZAAK_READ_KWARGS, ZAAK_WRITE_KWARGS
 
 from ...datamodel.tests.factories import RolFactory
 from .mixins import ZaakInformatieObjectSyncMixin
@@ -33,11 +34,21 @@ INFORMATIEOBJECT_TYPE = (
 )
 
 
+def get_audittrails(hoofd_object: str) -> list:
+    audittrails = AuditTrail.objects.filter(hoofd_object=hoofd_object)
+    return reconstruct(list(audittrails.order_by("pk")))
+
+
 @override_settings(
     LINK_FETCHER="vng_api_common.mocks.link_fetcher_200",
     ZDS_CLIENT_CLASS="vng_api_common.mocks.MockClient",
 )
-class AuditTrailTests(ZaakInformatieObjectSyncMixin, JWTAuthMixin, APITestCase):
+class AuditTrailTests(
+    ZaakInformatieObjectSyncMixin, JWTAuthMixin, APITransactionTestCase
+):
+    """
+    The audit trail is written after the transaction is committed.
+    """
 
     heeft_alle_autorisaties = True
 
@@ -56,6 +67,16 @@ class AuditTrailTests(ZaakInformatieObjectSyncMixin, JWTAuthMixin, APITestCase):
         },
     }
 
+    def setUp(self):
+        super().setUp()
+
+        self.applicatie, self.autorisatie = self._create_credentials(
+            self.client_id,
+            self.secret,
+            self.heeft_alle_autorisaties,
+            self.max_vertrouwelijkheidaanduiding,
+        )
+
     @patch("vng_api_common.validators.fetcher")
     @patch("vng_api_common.validators.obj_has_shape", return_value=True)
     def _create_zaak(self, *mocks, **headers):
@@ -80,12 +101,12 @@ class AuditTrailTests(ZaakInformatieObjectSyncMixin, JWTAuthMixin, APITestCase):
     def test_create_zaak_audittrail(self):
         zaak_response = self._create_zaak()
 
-        audittrails = AuditTrail.objects.filter(hoofd_object=zaak_response["url"])
-        self.assertEqual(audittrails.count(), 1)
+        audittrails = get_audittrails(zaak_response["url"])
+        self.assertEqual(len(audittrails), 1)
 
         # Verify that the audittrail for the Zaak creation contains the correct
         # information
-        zaak_create_audittrail = audittrails.get()
+        zaak_create_audittrail = audittrails[0]
         self.assertEqual(zaak_create_audittrail.bron, "ZRC")
         self.assertEqual(zaak_create_audittrail.actie, "create")
         self.assertEqual(zaak_create_audittrail.resultaat, 201)
@@ -107,10 +128,8 @@ class AuditTrailTests(ZaakInformatieObjectSyncMixin, JWTAuthMixin, APITestCase):
 
         resultaat_response = response.data
 
-        audittrails = AuditTrail.objects.filter(
-            hoofd_object=zaak_response["url"]
-        ).order_by("pk")
-        self.assertEqual(audittrails.count(), 2)
+        audittrails = get_audittrails(zaak_response["url"])
+        self.assertEqual(len(audittrails), 2)
 
         # Verify that the audittrail for the Resultaat creation contains the
         # correct information
@@ -122,7 +141,8 @@ class AuditTrailTests(ZaakInformatieObjectSyncMixin, JWTAuthMixin, APITestCase):
         self.assertEqual(resultaat_create_audittrail.nieuw, resultaat_response)
 
         response = self.client.delete(resultaat_response["url"], **ZAAK_WRITE_KWARGS)
-        self.assertEqual(audittrails.count(), 3)
+        audittrails = get_audittrails(zaak_response["url"])
+        self.assertEqual(len(audittrails), 3)
 
         # Verify that the audittrail for the Resultaat deletion contains the
         # correct information
@@ -147,10 +167,8 @@ class AuditTrailTests(ZaakInformatieObjectSyncMixin, JWTAuthMixin, APITestCase):
             response = self.client.put(url, modified_data, **ZAAK_WRITE_KWARGS)
             zaak_response = response.data
 
-        audittrails = AuditTrail.objects.filter(
-            hoofd_object=zaak_response["url"]
-        ).order_by("pk")
-        self.assertEqual(audittrails.count(), 2)
+        audittrails = get_audittrails(zaak_response["url"])
+        self.assertEqual(len(audittrails), 2)
 
         # Verify that the audittrail for the Zaak update contains the correct
         # information
@@ -170,8 +188,8 @@ class AuditTrailTests(ZaakInformatieObjectSyncMixin, JWTAuthMixin, APITestCase):
             )
             zaak_response = response.data
 
-        audittrails = AuditTrail.objects.filter(hoofd_object=zaak_response["url"])
-        self.assertEqual(audittrails.count(), 2)
+        audittrails = get_audittrails(zaak_response["url"])
+        self.assertEqual(len(audittrails), 2)
 
         # Verify that the audittrail for the Zaak partial_update contains the
         # correct information
@@ -182,6 +200,119 @@ class AuditTrailTests(ZaakInformatieObjectSyncMixin, JWTAuthMixin, APITestCase):
         self.assertEqual(zaak_update_audittrail.oud, zaak_data)
         self.assertEqual(zaak_update_audittrail.nieuw, zaak_response)
 
+    def test_partial_update_zaak_stores_changes(self):
+        zaak_data = self._create_zaak()
+
+        with mock_client(self.responses):
+            self.client.patch(
+                zaak_data["url"], {"toelichting": "aangepast"}, **ZAAK_WRITE_KWARGS
+            )
+
+        audittrail = AuditTrail.objects.get(actie="partial_update")
+
+        self.assertIsNone(audittrail.snapshot)
+        self.assertEqual(audittrail.diff, {"toelichting": "aangepast"})
+
+    def test_partial_update_after_change_without_audittrail(self):
+        zaak_data = self._create_zaak()
+        # e.g. the einddatum set by the last status of the zaak
+        Zaak.objects.update(einddatum="2019-01-07")
+
+        with mock_client(self.responses):
+            response = self.client.patch(
+                zaak_data["url"], {"toelichting": "aangepast"}, **ZAAK_WRITE_KWARGS
+            )
+
+        audittrails = get_audittrails(zaak_data["url"])
+        update = audittrails[1]
+        self.assertEqual(update.oud, {**zaak_data, "einddatum": "2019-01-07"})
+        self.assertEqual(update.nieuw, response.data)
+        self.assertEqual(update.diff_before, {"einddatum": "2019-01-07"})
+        self.assertEqual(update.diff, {"toelichting": "aangepast"})
+
+    def test_partial_updates_after_read(self):
+        zaak_data = self._create_zaak()
+        # the first read after a change saves the ETag of the zaak
+        self.client.get(zaak_data["url"], **ZAAK_READ_KWARGS)
+
+        with patch(
+            "zrc.api.viewsets.ZaakViewSet.get_audittrail_version_before"
+        ) as get_version_before:
+            with mock_client(self.responses):
+                self.client.patch(
+                    zaak_data["url"], {"toelichting": "aangepast"}, **ZAAK_WRITE_KWARGS
+                )
+                self.client.get(zaak_data["url"], **ZAAK_READ_KWARGS)
+                self.client.patch(
+                    zaak_data["url"], {"omschrijving": "aangepast"}, **ZAAK_WRITE_KWARGS
+                )
+
+        get_version_before.assert_not_called()
+        audittrails = get_audittrails(zaak_data["url"])
+        self.assertEqual(audittrails[2].oud, audittrails[1].nieuw)
+        self.assertEqual(audittrails[2].diff, {"omschrijving": "aangepast"})
+
+    def test_read_audittrail_wijzigingen(self):
+        zaak_data = self._create_zaak()
+        with mock_client(self.responses):
+            self.client.patch(
+                zaak_data["url"], {"toelichting": "aangepast"}, **ZAAK_WRITE_KWARGS
+            )
+        zaak = Zaak.objects.get()
+        url = reverse("audittrail-list", kwargs={"zaak_uuid": zaak.uuid})
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        create, update = response.json()["results"]
+        self.assertIsNone(create["wijzigingen"]["oud"])
+        self.assertEqual(create["wijzigingen"]["nieuw"]["toelichting"], "")
+        self.assertEqual(update["wijzigingen"]["oud"], create["wijzigingen"]["nieuw"])
+        self.assertEqual(update["wijzigingen"]["nieuw"]["toelichting"], "aangepast")
+
+    def test_read_audittrail_without_wijzigingen(self):
+        zaak_data = self._create_zaak()
+        zaak = Zaak.objects.get()
+        url = reverse("audittrail-list", kwargs={"zaak_uuid": zaak.uuid})
+
+        response = self.client.get(url, {"wijzigingen": "false"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result = response.json()["results"][0]
+        self.assertNotIn("wijzigingen", result)
+        self.assertEqual(result["resourceUrl"], zaak_data["url"])
+
+    @patch("zrc.api.pagination.AuditTrailPagination.page_size", 2)
+    def test_read_audittrail_paginated(self):
+        zaak_data = self._create_zaak()
+        for toelichting in ("een", "twee"):
+            with mock_client(self.responses):
+                self.client.patch(
+                    zaak_data["url"], {"toelichting": toelichting}, **ZAAK_WRITE_KWARGS
+                )
+        zaak = Zaak.objects.get()
+        url = reverse("audittrail-list", kwargs={"zaak_uuid": zaak.uuid})
+
+        first_page = self.client.get(url).json()
+        second_page = self.client.get(first_page["next"]).json()
+
+        self.assertEqual(
+            [result["actie"] for result in first_page["results"]],
+            ["create", "partial_update"],
+        )
+        self.assertEqual(len(second_page["results"]), 1)
+        wijzigingen = second_page["results"][0]["wijzigingen"]
+        self.assertEqual(wijzigingen["oud"]["toelichting"], "een")
+        self.assertEqual(wijzigingen["nieuw"]["toelichting"], "twee")
+        self.assertIsNone(second_page["next"])
+
+    def test_read_audittrail_unknown_zaak(self):
+        url = reverse("audittrail-list", kwargs={"zaak_uuid": uuid.uuid4()})
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     @patch("vng_api_common.validators.fetcher")
     @patch("vng_api_common.validators.obj_has_shape", return_value=True)
     def test_create_zaakinformatieobject_audittrail(self, *mocks):
@@ -196,10 +327,8 @@ class AuditTrailTests(ZaakInformatieObjectSyncMixin, JWTAuthMixin, APITestCase):
 
         zaakinformatieobject_response = response.data
 
-        audittrails = AuditTrail.objects.filter(hoofd_object=zaak_data["url"]).order_by(
-            "pk"
-        )
-        self.assertEqual(audittrails.count(), 2)
+        audittrails = get_audittrails(zaak_data["url"])
+        self.assertEqual(len(audittrails), 2)
 
         # Verify that the audittrail for the ZaakInformatieObject creation
         # contains the correct information
@@ -0,0 +1,200 @@
+"""
+Test the compiled and cached authorizations of client applications.
+"""
+from types import SimpleNamespace
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.authorizations.models import Autorisatie
+from vng_api_common.constants import ComponentTypes, VertrouwelijkheidsAanduiding
+from vng_api_common.tests import JWTAuthMixin, reverse
+
+from zrc.datamodel.tests.factories import ZaakFactory
+from zrc.tests.utils import ZAAK_READ_KWARGS
+
+from ..authorizations import AuthorizationIndex, get_authorization_index, get_cache_key
+from ..scopes import (
+    SCOPE_ZAKEN_ALLES_LEZEN,
+    SCOPE_ZAKEN_BIJWERKEN,
+    SCOPE_ZAKEN_GEFORCEERD_BIJWERKEN,
+)
+
+ZAAKTYPE = "https://zaaktype.nl/ok"
+ZAAKTYPE2 = "https://zaaktype.nl/ok2"
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "axes": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    "autorisaties": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+
+class FakeAutorisatie:
+    def __init__(self, zaaktype, scopes, max_vertrouwelijkheidaanduiding):
+        self.zaaktype = zaaktype
+        self.scopes = [scope.label for scope in scopes]
+        self.max_vertrouwelijkheidaanduiding = max_vertrouwelijkheidaanduiding
+
+
+class AuthorizationIndexTests(SimpleTestCase):
+    def _build(self, *autorisaties):
+        return AuthorizationIndex.build("ZRC", [], autorisaties)
+
+    def test_has_auth_vertrouwelijkheidaanduiding(self):
+        index = self._build(
+            FakeAutorisatie(
+                ZAAKTYPE,
+                [SCOPE_ZAKEN_ALLES_LEZEN],
+                VertrouwelijkheidsAanduiding.beperkt_openbaar,
+            )
+        )
+
+        self.assertTrue(
+            index.has_auth(
+                SCOPE_ZAKEN_ALLES_LEZEN,
+                zaaktype=ZAAKTYPE,
+                vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+            )
+        )
+        self.assertFalse(
+            index.has_auth(
+                SCOPE_ZAKEN_ALLES_LEZEN,
+                zaaktype=ZAAKTYPE,
+                vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.geheim,
+            )
+        )
+        self.assertFalse(
+            index.has_auth(
+                SCOPE_ZAKEN_ALLES_LEZEN,
+                zaaktype=ZAAKTYPE2,
+                vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+            )
+        )
+        self.assertFalse(index.has_auth(SCOPE_ZAKEN_BIJWERKEN, zaaktype=ZAAKTYPE))
+
+    def test_scopes_combine_over_autorisaties(self):
+        index = self._build(
+            FakeAutorisatie(
+                ZAAKTYPE, [SCOPE_ZAKEN_ALLES_LEZEN], VertrouwelijkheidsAanduiding.geheim
+            ),
+            FakeAutorisatie(
+                ZAAKTYPE, [SCOPE_ZAKEN_BIJWERKEN], VertrouwelijkheidsAanduiding.openbaar
+            ),
+        )
+
+        self.assertEqual(
+            index.get_max_order(ZAAKTYPE, SCOPE_ZAKEN_ALLES_LEZEN),
+            VertrouwelijkheidsAanduiding.get_choice("geheim").order,
+        )
+        self.assertEqual(
+            index.get_max_order(ZAAKTYPE, SCOPE_ZAKEN_BIJWERKEN),
+            VertrouwelijkheidsAanduiding.get_choice("openbaar").order,
+        )
+        self.assertEqual(
+            index.get_max_order(
+                ZAAKTYPE, SCOPE_ZAKEN_BIJWERKEN | SCOPE_ZAKEN_GEFORCEERD_BIJWERKEN
+            ),
+            VertrouwelijkheidsAanduiding.get_choice("openbaar").order,
+        )
+        self.assertIsNone(
+            index.get_max_order(ZAAKTYPE, SCOPE_ZAKEN_GEFORCEERD_BIJWERKEN)
+        )
+
+    def test_has_auth_without_zaaktype(self):
+        index = self._build(
+            FakeAutorisatie(
+                ZAAKTYPE, [SCOPE_ZAKEN_ALLES_LEZEN], VertrouwelijkheidsAanduiding.geheim
+            )
+        )
+
+        self.assertTrue(index.has_auth(SCOPE_ZAKEN_ALLES_LEZEN))
+        self.assertFalse(index.has_auth(SCOPE_ZAKEN_BIJWERKEN))
+        # a missing zaaktype is left to the validation
+        self.assertTrue(index.has_auth(SCOPE_ZAKEN_ALLES_LEZEN, zaaktype=None))
+
+    def test_get_max_orders(self):
+        index = self._build(
+            FakeAutorisatie(
+                ZAAKTYPE, [SCOPE_ZAKEN_ALLES_LEZEN], VertrouwelijkheidsAanduiding.geheim
+            ),
+            FakeAutorisatie(
+                ZAAKTYPE2, [SCOPE_ZAKEN_BIJWERKEN], VertrouwelijkheidsAanduiding.geheim
+            ),
+        )
+
+        max_orders = index.get_max_orders(SCOPE_ZAKEN_ALLES_LEZEN)
+
+        self.assertEqual(
+            max_orders,
+            {ZAAKTYPE: VertrouwelijkheidsAanduiding.get_choice("geheim").order},
+        )
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CachedAuthorizationsTests(JWTAuthMixin, APITestCase):
+    scopes = [SCOPE_ZAKEN_ALLES_LEZEN]
+    zaaktype = ZAAKTYPE
+    max_vertrouwelijkheidaanduiding = VertrouwelijkheidsAanduiding.openbaar
+
+    def setUp(self):
+        super().setUp()
+        caches["autorisaties"].clear()
+
+    def test_authorizations_cached(self):
+        zaak = ZaakFactory.create(
+            zaaktype=ZAAKTYPE,
+            vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+        )
+
+        response = self.client.get(reverse(zaak), **ZAAK_READ_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(caches["autorisaties"].get(get_cache_key(self.client_id)))
+
+    def test_autorisatie_change_invalidates_cache(self):
+        zaak = ZaakFactory.create(
+            zaaktype=ZAAKTYPE2,
+            vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+        )
+
+        response = self.client.get(reverse(zaak), **ZAAK_READ_KWARGS)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        Autorisatie.objects.create(
+            applicatie=self.applicatie,
+            component=ComponentTypes.zrc,
+            scopes=[SCOPE_ZAKEN_ALLES_LEZEN.label],
+            zaaktype=ZAAKTYPE2,
+            max_vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+        )
+
+        self.assertIsNone(caches["autorisaties"].get(get_cache_key(self.client_id)))
+
+        response = self.client.get(reverse(zaak), **ZAAK_READ_KWARGS)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_applicatie_change_invalidates_cache(self):
+        zaak = ZaakFactory.create(
+            zaaktype=ZAAKTYPE2,
+            vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.zeer_geheim,
+        )
+
+        response = self.client.get(reverse(zaak), **ZAAK_READ_KWARGS)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.applicatie.heeft_alle_autorisaties = True
+        self.applicatie.save()
+
+        response = self.client.get(reverse(zaak), **ZAAK_READ_KWARGS)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unresolved_authorizations_not_cached(self):
+        jwt_auth = SimpleNamespace(client_id="unknown", applicaties=[])
+
+        index = get_authorization_index(jwt_auth)
+
+        self.assertFalse(index.has_auth(SCOPE_ZAKEN_ALLES_LEZEN))
+        self.assertIsNone(caches["autorisaties"].get(get_cache_key("unknown")))
@@ -0,0 +1,107 @@
+import hashlib
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import override_settings
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.constants import RolTypes
+from vng_api_common.tests import JWTAuthMixin, get_operation_url, reverse
+
+from zrc.datamodel.models import NatuurlijkPersoon
+from zrc.datamodel.tests.factories import RolFactory, ZaakFactory
+from zrc.tests.utils import ZAAK_READ_KWARGS
+
+from ..bsn import get_cache_key, get_rollen
+
+BSN = "183068142"
+
+
+class BSNLookupTests(JWTAuthMixin, APITestCase):
+    heeft_alle_autorisaties = True
+
+    def setUp(self):
+        super().setUp()
+        caches["bsn"].clear()
+        self.addCleanup(caches["bsn"].clear)
+
+    def create_rol(self, zaak, bsn: str = BSN):
+        rol = RolFactory.create(
+            zaak=zaak, betrokkene_type=RolTypes.natuurlijk_persoon, betrokkene=""
+        )
+        NatuurlijkPersoon.objects.create(rol=rol, inp_bsn=bsn)
+        return rol
+
+    def test_zaak_listed_once(self):
+        zaak = ZaakFactory.create()
+        self.create_rol(zaak)
+        self.create_rol(zaak)
+        self.create_rol(ZaakFactory.create(), bsn="650237481")
+
+        response = self.client.get(
+            reverse("zaak-list"),
+            {"rol__betrokkeneIdentificatie__natuurlijkPersoon__inpBsn": BSN},
+            **ZAAK_READ_KWARGS,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(
+            response.data["results"][0]["url"], f"http://testserver{reverse(zaak)}"
+        )
+
+    def test_rollen(self):
+        rol = self.create_rol(ZaakFactory.create())
+        self.create_rol(ZaakFactory.create(), bsn="650237481")
+
+        response = self.client.get(
+            get_operation_url("rol_list"),
+            {"betrokkeneIdentificatie__natuurlijkPersoon__inpBsn": BSN},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result["url"] for result in response.json()["results"]],
+            [f"http://testserver{reverse(rol)}"],
+        )
+
+    def test_cache_invalidated_by_new_rol(self):
+        url = reverse("zaak-list")
+        query = {"rol__betrokkeneIdentificatie__natuurlijkPersoon__inpBsn": BSN}
+        self.create_rol(ZaakFactory.create())
+
+        response = self.client.get(url, query, **ZAAK_READ_KWARGS)
+        self.assertEqual(response.data["count"], 1)
+
+        with self.subTest(change="create"):
+            self.create_rol(ZaakFactory.create())
+
+            response = self.client.get(url, query, **ZAAK_READ_KWARGS)
+
+            self.assertEqual(response.data["count"], 2)
+
+        with self.subTest(change="delete"):
+            NatuurlijkPersoon.objects.filter(inp_bsn=BSN).first().rol.delete()
+
+            response = self.client.get(url, query, **ZAAK_READ_KWARGS)
+
+            self.assertEqual(response.data["count"], 1)
+
+    def test_bsn_not_in_cache_key(self):
+        self.assertNotIn(BSN, get_cache_key(BSN))
+
+    def test_cache_key_not_a_plain_hash(self):
+        key = get_cache_key(BSN)
+
+        self.assertNotIn(hashlib.sha256(BSN.encode()).hexdigest(), key)
+        with override_settings(SECRET_KEY="another secret"):
+            self.assertNotEqual(get_cache_key(BSN), key)
+
+    def test_lookup_reads_from_primary(self):
+        rol = self.create_rol(ZaakFactory.create())
+
+        with patch("zrc.utils.replicas.get_replica", return_value="replica_0"):
+            rollen = get_rollen(BSN)
+
+        self.assertEqual(rollen, [(rol.pk, rol.zaak_id)])
@@ -0,0 +1,198 @@
+from unittest.mock import patch
+
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from vng_api_common.constants import VertrouwelijkheidsAanduiding
+from vng_api_common.tests import JWTAuthMixin, reverse
+
+from zrc.changes.feed import record_change
+from zrc.changes.models import Change
+from zrc.datamodel.tests.factories import (
+    RolFactory,
+    StatusFactory,
+    ZaakEigenschapFactory,
+    ZaakFactory,
+)
+from zrc.tests.utils import ZAAK_WRITE_KWARGS
+
+from ..pagination import ChangeFeedPagination
+from ..scopes import SCOPE_ZAKEN_ALLES_LEZEN
+
+ZAAKTYPE = "https://example.com/ztc/api/v1/zaaktypen/1"
+OTHER_ZAAKTYPE = "https://example.com/ztc/api/v1/zaaktypen/2"
+
+
+def build_message(
+    url: str,
+    actie: str = "create",
+    zaaktype: str = ZAAKTYPE,
+    vertrouwelijkheidaanduiding: str = VertrouwelijkheidsAanduiding.openbaar,
+) -> dict:
+    return {
+        "kanaal": "zaken",
+        "hoofdObject": "http://testserver/api/v1/zaken/1",
+        "resource": "zaak",
+        "resourceUrl": url,
+        "actie": actie,
+        "aanmaakdatum": "2020-01-01T00:00:00Z",
+        "kenmerken": {
+            "bronorganisatie": "517439943",
+            "zaaktype": zaaktype,
+            "vertrouwelijkheidaanduiding": vertrouwelijkheidaanduiding,
+        },
+    }
+
+
+class ChangeFeedMixin(JWTAuthMixin):
+    """
+    The feed only shows committed changes, which a ``TestCase`` never has.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        self._create_credentials(
+            self.client_id,
+            self.secret,
+            self.heeft_alle_autorisaties,
+            self.max_vertrouwelijkheidaanduiding,
+            scopes=self.scopes,
+            zaaktype=self.zaaktype,
+        )
+
+
+class ChangeFeedTests(ChangeFeedMixin, APITransactionTestCase):
+    heeft_alle_autorisaties = True
+
+    def test_destroy_records_change(self):
+        rol = RolFactory.create()
+        rol_url = reverse(rol)
+
+        response = self.client.delete(rol_url)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        change = Change.objects.get()
+        self.assertEqual(change.type, "deleted")
+        self.assertEqual(change.resource, "rol")
+        self.assertEqual(change.resource_url, f"http://testserver{rol_url}")
+        self.assertEqual(change.zaaktype, rol.zaak.zaaktype)
+
+    def test_destroy_zaak_records_cascaded_changes(self):
+        zaak = ZaakFactory.create()
+        deelzaak = ZaakFactory.create(hoofdzaak=zaak)
+        status_ = StatusFactory.create(zaak=zaak)
+        rol = RolFactory.create(zaak=deelzaak)
+        eigenschap = ZaakEigenschapFactory.create(zaak=deelzaak)
+        zaak_url = reverse(zaak)
+        eigenschap_url = reverse(eigenschap, kwargs={"zaak_uuid": deelzaak.uuid})
+
+        response = self.client.delete(zaak_url, **ZAAK_WRITE_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        changes = Change.objects.order_by("pk")
+        self.assertTrue(all(change.type == "deleted" for change in changes))
+        self.assertEqual(
+            {(change.resource, change.resource_url) for change in changes},
+            {
+                ("zaak", f"http://testserver{zaak_url}"),
+                ("zaak", f"http://testserver{reverse(deelzaak)}"),
+                ("status", f"http://testserver{reverse(status_)}"),
+                ("rol", f"http://testserver{reverse(rol)}"),
+                ("zaakeigenschap", f"http://testserver{eigenschap_url}"),
+            },
+        )
+        rol_change = changes.get(resource="rol")
+        self.assertEqual(
+            rol_change.hoofd_object, f"http://testserver{reverse(deelzaak)}"
+        )
+        self.assertEqual(rol_change.zaaktype, deelzaak.zaaktype)
+
+    def test_changes_since_token(self):
+        record_change(build_message("http://testserver/api/v1/zaken/1"))
+        record_change(build_message("http://testserver/api/v1/zaken/1", "update"))
+        record_change(build_message("http://testserver/api/v1/zaken/1", "destroy"))
+
+        response = self.client.get(reverse(Change))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()["results"]
+        self.assertEqual(
+            [change["type"] for change in results], ["created", "updated", "deleted"]
+        )
+        self.assertEqual(response.json()["token"], results[-1]["token"])
+        self.assertIsNone(response.json()["next"])
+
+        response = self.client.get(reverse(Change), {"since": results[0]["token"]})
+
+        self.assertEqual(
+            [change["type"] for change in response.json()["results"]],
+            ["updated", "deleted"],
+        )
+
+    def test_no_changes_since_token(self):
+        record_change(build_message("http://testserver/api/v1/zaken/1"))
+        token = Change.objects.get().token
+
+        response = self.client.get(reverse(Change), {"since": token})
+
+        self.assertEqual(response.json()["results"], [])
+        self.assertEqual(response.json()["token"], token)
+
+    @patch.object(ChangeFeedPagination, "page_size", 2)
+    def test_next_page(self):
+        for i in range(3):
+            record_change(build_message(f"http://testserver/api/v1/zaken/{i}"))
+
+        response = self.client.get(reverse(Change))
+
+        data = response.json()
+        self.assertEqual(len(data["results"]), 2)
+        self.assertIn(f"since={data['token']}", data["next"])
+
+        response = self.client.get(data["next"])
+
+        self.assertEqual(len(response.json()["results"]), 1)
+        self.assertIsNone(response.json()["next"])
+
+    def test_invalid_token(self):
+        response = self.client.get(reverse(Change), {"since": "invalid"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["invalidParams"][0]["name"], "since")
+
+    def test_stream(self):
+        record_change(build_message("http://testserver/api/v1/zaken/1"))
+        record_change(build_message("http://testserver/api/v1/zaken/2"))
+
+        response = self.client.get(reverse(Change), HTTP_ACCEPT="application/x-ndjson")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('"resourceUrl": "http://testserver/api/v1/zaken/2"', lines[1])
+
+
+class ChangeFeedAuthorizationTests(ChangeFeedMixin, APITransactionTestCase):
+    scopes = [SCOPE_ZAKEN_ALLES_LEZEN]
+    zaaktype = ZAAKTYPE
+    max_vertrouwelijkheidaanduiding = VertrouwelijkheidsAanduiding.beperkt_openbaar
+
+    def test_filtered_by_authorizations(self):
+        record_change(build_message("http://testserver/api/v1/zaken/1"))
+        record_change(
+            build_message("http://testserver/api/v1/zaken/2", zaaktype=OTHER_ZAAKTYPE)
+        )
+        record_change(
+            build_message(
+                "http://testserver/api/v1/zaken/3",
+                vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.geheim,
+            )
+        )
+
+        response = self.client.get(reverse(Change))
+
+        self.assertEqual(
+            [change["resourceUrl"] for change in response.json()["results"]],
+            ["http://testserver/api/v1/zaken/1"],
+        )
@@ -0,0 +1,97 @@
+import uuid
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import NoReverseMatch, reverse as django_reverse, set_script_prefix
+
+from rest_framework.request import Request
+from rest_framework.reverse import reverse as drf_reverse
+from rest_framework.test import APIRequestFactory
+from rest_framework.versioning import URLPathVersioning
+
+from ..hyperlinks import LengthHyperlinkedRelatedField, build_path, reverse
+from ..serializers import ZaakInformatieObjectSerializer
+
+
+def get_request(**extra) -> Request:
+    request = Request(APIRequestFactory().get("/api/v1/zaken", **extra))
+    request.version = "1"
+    request.versioning_scheme = URLPathVersioning()
+    return request
+
+
+class BuildPathTests(SimpleTestCase):
+    def test_same_path_as_reverse(self):
+        cases = [
+            ("zaak-detail", {"version": "1", "uuid": uuid.uuid4()}),
+            ("zaak-list", {"version": "1"}),
+            (
+                "zaakeigenschap-detail",
+                {"version": "1", "zaak_uuid": uuid.uuid4(), "uuid": uuid.uuid4()},
+            ),
+            ("rol-detail", {"version": "1", "uuid": "a b"}),
+        ]
+
+        for viewname, kwargs in cases:
+            with self.subTest(viewname=viewname):
+                # the second time is built from the compiled template
+                for _ in range(2):
+                    self.assertEqual(
+                        build_path(viewname, kwargs),
+                        django_reverse(viewname, kwargs=kwargs),
+                    )
+
+    def test_unknown_route(self):
+        with self.assertRaises(NoReverseMatch):
+            build_path("zaak-detail", {"version": "1", "pk": 1})
+
+    def test_script_prefix(self):
+        kwargs = {"version": "1", "uuid": uuid.uuid4()}
+        build_path("zaak-detail", kwargs)
+
+        set_script_prefix("/zrc/")
+        try:
+            path = build_path("zaak-detail", kwargs)
+        finally:
+            set_script_prefix("/")
+
+        self.assertEqual(path, f"/zrc/api/v1/zaken/{kwargs['uuid']}")
+
+
+class ReverseTests(SimpleTestCase):
+    def test_same_url_as_drf_reverse(self):
+        request = get_request()
+        kwargs = {"uuid": uuid.uuid4()}
+
+        self.assertEqual(
+            reverse("zaak-detail", kwargs=kwargs, request=request),
+            drf_reverse("zaak-detail", kwargs=kwargs, request=request),
+        )
+
+    @override_settings(ALLOWED_HOSTS=["example.com"])
+    def test_host_of_request(self):
+        request = get_request(HTTP_HOST="example.com", secure=True)
+        zaak_uuid = uuid.uuid4()
+
+        url = reverse("zaak-detail", kwargs={"uuid": zaak_uuid}, request=request)
+
+        self.assertEqual(url, f"https://example.com/api/v1/zaken/{zaak_uuid}")
+
+    def test_format_override(self):
+        request = get_request(data={"format": "json"})
+        kwargs = {"uuid": uuid.uuid4()}
+
+        url = reverse("zaak-detail", kwargs=kwargs, request=request)
+
+        self.assertEqual(
+            url, drf_reverse("zaak-detail", kwargs=kwargs, request=request)
+        )
+        self.assertTrue(url.endswith("?format=json"))
+
+
+class HyperlinkedModelSerializerTests(SimpleTestCase):
+    def test_generated_fields_validate_length(self):
+        field = ZaakInformatieObjectSerializer().fields["zaak"]
+
+        self.assertIsInstance(field, LengthHyperlinkedRelatedField)
+        self.assertEqual(field.max_length, 1000)
+        self.assertEqual(field.min_length, 1)
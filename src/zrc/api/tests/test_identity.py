@@ -0,0 +1,120 @@
+import uuid
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+import requests_mock
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from vng_api_common.constants import RolOmschrijving, RolTypes
+from vng_api_common.tests import JWTAuthMixin, get_operation_url, reverse
+from zds_client.tests.mocks import mock_client
+
+from zrc.datamodel.models import Rol, Zaak
+from zrc.datamodel.tests.factories import ZaakFactory
+
+from ..identity import get_zaak, get_zaak_uuid
+from ..scopes import SCOPE_ZAKEN_CREATE
+
+ZAAKTYPE = "https://ztc.nl/zaaktypen/123"
+ROLTYPE = "https://ztc.nl/roltypen/123"
+ROLTYPE_RESPONSE = {
+    "url": ROLTYPE,
+    "zaaktype": ZAAKTYPE,
+    "omschrijving": RolOmschrijving.initiator,
+    "omschrijvingGeneriek": RolOmschrijving.initiator,
+}
+
+
+def get_request() -> Request:
+    request = Request(APIRequestFactory().get("/"))
+    request.version = "1"
+    return request
+
+
+class IdentityMapTests(TestCase):
+    def test_get_zaak_uuid(self):
+        zaak_uuid = uuid.uuid4()
+        request = get_request()
+
+        self.assertEqual(
+            get_zaak_uuid(request, f"http://testserver/api/v1/zaken/{zaak_uuid}"),
+            zaak_uuid,
+        )
+
+    def test_get_zaak_uuid_other_urls(self):
+        request = get_request()
+        urls = [
+            f"http://testserver/api/v1/rollen/{uuid.uuid4()}",
+            f"http://testserver/api/v1/zaken/{uuid.uuid4()}/zaakeigenschappen",
+            "http://testserver/api/v1/zaken/not-a-uuid",
+            "http://testserver/api/v1/zaken/",
+            None,
+        ]
+
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertIsNone(get_zaak_uuid(request, url))
+
+    def test_zaak_loaded_once(self):
+        zaak = ZaakFactory.create()
+        request = get_request()
+
+        with self.assertNumQueries(1):
+            first = get_zaak(request, zaak.uuid)
+            second = get_zaak(request, zaak.uuid)
+
+        self.assertEqual(first, zaak)
+        self.assertIs(first, second)
+
+    def test_zaak_does_not_exist(self):
+        with self.assertRaises(Zaak.DoesNotExist):
+            get_zaak(get_request(), uuid.uuid4())
+
+
+class ResolveZaakTests(JWTAuthMixin, APITestCase):
+    scopes = [SCOPE_ZAKEN_CREATE]
+    zaaktype = ZAAKTYPE
+
+    @patch("vng_api_common.validators.fetcher")
+    @patch("vng_api_common.validators.obj_has_shape", return_value=True)
+    def test_create_loads_zaak_once(self, *mocks):
+        zaak = ZaakFactory.create(zaaktype=ZAAKTYPE)
+        data = {
+            "zaak": f"http://testserver{reverse(zaak)}",
+            "betrokkene": "https://example.com/betrokkene/1",
+            "betrokkene_type": RolTypes.natuurlijk_persoon,
+            "roltype": ROLTYPE,
+            "roltoelichting": "toelichting",
+        }
+
+        with requests_mock.Mocker() as m, CaptureQueriesContext(connection) as queries:
+            m.get(ROLTYPE, json=ROLTYPE_RESPONSE)
+            with mock_client({ROLTYPE: ROLTYPE_RESPONSE}):
+                response = self.client.post(get_operation_url("rol_create"), data)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(Rol.objects.get().zaak, zaak)
+        zaak_lookups = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+            and 'FROM "datamodel_zaak" WHERE "datamodel_zaak"."uuid"' in query["sql"]
+        ]
+        self.assertEqual(len(zaak_lookups), 1)
+
+    def test_create_unknown_zaak(self):
+        data = {
+            "zaak": f"http://testserver/api/v1/zaken/{uuid.uuid4()}",
+            "betrokkene": "https://example.com/betrokkene/1",
+            "betrokkene_type": RolTypes.natuurlijk_persoon,
+            "roltype": ROLTYPE,
+            "roltoelichting": "toelichting",
+        }
+
+        response = self.client.post(get_operation_url("rol_create"), data)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,137 @@
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from vng_api_common.validators import fetcher, obj_has_shape
+
+from ..oas import compile_spec, load_bundle, write_bundle
+
+SPEC_URL = "https://example.com/api/openapi.yaml"
+
+SPEC = {
+    "openapi": "3.0.0",
+    "components": {
+        "schemas": {
+            "Base": {
+                "required": ["url"],
+                "properties": {"url": {"type": "string", "format": "uri"}},
+            },
+            "ZaakType": {
+                "allOf": [
+                    {"$ref": "#/components/schemas/Base"},
+                    {
+                        "type": "object",
+                        "required": ["identificatie"],
+                        "properties": {
+                            "identificatie": {
+                                "title": "Identificatie",
+                                "type": "string",
+                                "maxLength": 80,
+                            },
+                            "omschrijving": {"type": "string", "nullable": True},
+                            "concept": {"type": "boolean"},
+                            "referentieproces": {
+                                "allOf": [
+                                    {"$ref": "#/components/schemas/Referentieproces"}
+                                ]
+                            },
+                        },
+                    },
+                ]
+            },
+            "StatusType": {
+                "required": ["url", "zaaktype"],
+                "properties": {
+                    "url": {"type": "string", "format": "uri"},
+                    "zaaktype": {"type": "string", "format": "uri"},
+                },
+            },
+        }
+    },
+}
+
+
+class CompileSpecTests(SimpleTestCase):
+    def test_compile_spec(self):
+        compiled = compile_spec(SPEC, ["ZaakType"])
+
+        self.assertEqual(
+            compiled,
+            {
+                "openapi": "3.0.0",
+                "components": {
+                    "schemas": {
+                        "ZaakType": {
+                            "required": ["url", "identificatie"],
+                            "properties": {
+                                "url": {"type": "string", "format": "uri"},
+                                "identificatie": {"type": "string"},
+                                "omschrijving": {"type": "string", "nullable": True},
+                                "concept": {"type": "boolean"},
+                                "referentieproces": {
+                                    "$ref": "#/components/schemas/Referentieproces"
+                                },
+                            },
+                        }
+                    }
+                },
+            },
+        )
+
+    def test_compiled_shape_check(self):
+        compiled = compile_spec(SPEC, ["ZaakType"])
+
+        self.assertTrue(
+            obj_has_shape(
+                {"url": "https://example.com", "identificatie": "1"},
+                compiled,
+                "ZaakType",
+            )
+        )
+        self.assertFalse(
+            obj_has_shape({"url": "https://example.com"}, compiled, "ZaakType")
+        )
+
+    def test_compiled_shape_check_remote_object(self):
+        compiled = compile_spec(SPEC, ["ZaakType"])
+        zaaktype = {
+            "url": "https://example.com/ztc/api/v1/zaaktypen/1",
+            "identificatie": "ZT-1",
+            "omschrijving": None,
+            "concept": False,
+            "referentieproces": {"naam": "proces", "link": ""},
+        }
+
+        self.assertTrue(obj_has_shape(zaaktype, compiled, "ZaakType"))
+        # the types are still checked
+        self.assertFalse(
+            obj_has_shape({**zaaktype, "concept": "nee"}, compiled, "ZaakType")
+        )
+        self.assertFalse(
+            obj_has_shape({**zaaktype, "identificatie": None}, compiled, "ZaakType")
+        )
+
+
+class LoadBundleTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(lambda: fetcher.cache.pop(SPEC_URL, None))
+
+    def test_load_bundle(self):
+        compiled = compile_spec(SPEC, ["StatusType"])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "oas", "bundle.json")
+            write_bundle({SPEC_URL: compiled}, path)
+
+            loaded = load_bundle(path)
+
+        self.assertEqual(loaded, 1)
+        self.assertEqual(fetcher.cache[SPEC_URL], compiled)
+
+    def test_missing_bundle(self):
+        loaded = load_bundle("/does/not/exist.json")
+
+        self.assertEqual(loaded, 0)
+        self.assertNotIn(SPEC_URL, fetcher.cache)
@@ -0,0 +1,112 @@
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from djangorestframework_camel_case.parser import (
+    CamelCaseJSONParser as LibCamelCaseJSONParser,
+)
+from djangorestframework_camel_case.render import (
+    CamelCaseJSONRenderer as LibCamelCaseJSONRenderer,
+)
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.test import APITestCase
+from vng_api_common.tests import JWTAuthMixin, reverse
+
+from zrc.datamodel.tests.factories import (
+    RelevanteZaakRelatieFactory,
+    ZaakEigenschapFactory,
+    ZaakFactory,
+)
+from zrc.tests.utils import ZAAK_READ_KWARGS
+
+from ..parsers import CamelCaseJSONParser
+from ..renderers import CamelCaseJSONRenderer
+
+
+def build_data() -> dict:
+    return {
+        "url": "http://testserver/api/v1/zaken/1",
+        "einddatum_gepland": date(2020, 1, 1),
+        "registratie_tijdstip": datetime(2020, 1, 1, 12, 30, tzinfo=timezone.utc),
+        "uuid": uuid4(),
+        "bedrag": Decimal("1.10"),
+        "omschrijving": "Überlast\u2028in de Oude_Gracht",
+        "verlenging": {"reden": "", "duur": None},
+        "producten_of_diensten": ["https://example.com/product/1"],
+        "kenmerken": [{"kenmerk_bron": "a", "nested_groep": {"a_b_c": 1.5}}],
+        "_expand": {"status": None},
+    }
+
+
+class CamelCaseJSONRendererTests(SimpleTestCase):
+    def test_same_output(self):
+        data = build_data()
+
+        output = CamelCaseJSONRenderer().render(data)
+
+        self.assertEqual(output, LibCamelCaseJSONRenderer().render(build_data()))
+        # the rendered data is left as is
+        self.assertEqual(data, build_data())
+
+    def test_same_output_indented(self):
+        renderer_context = {"indent": 2}
+
+        self.assertEqual(
+            CamelCaseJSONRenderer().render(
+                build_data(), renderer_context=renderer_context
+            ),
+            LibCamelCaseJSONRenderer().render(
+                build_data(), renderer_context=renderer_context
+            ),
+        )
+
+    def test_render_none(self):
+        self.assertEqual(CamelCaseJSONRenderer().render(None), b"")
+
+
+class CamelCaseJSONParserTests(SimpleTestCase):
+    def parse(self, parser, content: bytes):
+        return parser.parse(io.BytesIO(content))
+
+    def test_same_data(self):
+        content = json.dumps(
+            {
+                "einddatumGepland": "2020-01-01",
+                "verlenging": {"reden": "", "duur": None},
+                "relevanteAndereZaken": [{"aardRelatie": "vervolg", "url": "x"}],
+                "betrokkeneIdentificatie": {"inpBsn": "123456782"},
+                "lijst": [[{"geneste_lijst": 1}]],
+            }
+        ).encode()
+
+        self.assertEqual(
+            self.parse(CamelCaseJSONParser(), content),
+            self.parse(LibCamelCaseJSONParser(), content),
+        )
+
+    def test_parse_error(self):
+        with self.assertRaises(ParseError):
+            self.parse(CamelCaseJSONParser(), b"{invalid")
+
+
+class RenderZakenTests(JWTAuthMixin, APITestCase):
+    heeft_alle_autorisaties = True
+
+    def test_zaken_page(self):
+        for _ in range(3):
+            zaak = ZaakFactory.create()
+            ZaakEigenschapFactory.create(zaak=zaak)
+            RelevanteZaakRelatieFactory.create(zaak=zaak)
+
+        response = self.client.get(reverse("zaak-list"), **ZAAK_READ_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.content, LibCamelCaseJSONRenderer().render(response.data)
+        )
@@ -0,0 +1,106 @@
+import gzip
+import json
+import os
+import tempfile
+
+from django.test import override_settings
+
+import yaml
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.tests import reverse
+
+from .. import schema_artifacts
+from ..schema_artifacts import build_artifacts
+
+
+class PrebuiltSchemaTests(APITestCase):
+    def setUp(self):
+        super().setUp()
+
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.directory = tmpdir.name
+        self.manifest = build_artifacts(self.directory)
+
+        override = override_settings(SCHEMA_ARTIFACTS_DIR=self.directory)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        schema_artifacts._artifacts.clear()
+        self.addCleanup(schema_artifacts._artifacts.clear)
+
+    def test_artifact_servers_relative(self):
+        with open(os.path.join(self.directory, "openapi.json")) as infile:
+            schema = json.load(infile)
+
+        self.assertEqual(schema["servers"], [{"url": "/api/v1"}])
+
+    def test_serve_prebuilt_json(self):
+        url = reverse("schema-json", kwargs={"format": ".json"})
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("application/json", response["Content-Type"])
+        self.assertTrue(response.has_header("ETag"))
+        doc = response.json()
+        self.assertGreaterEqual(doc["openapi"], "3.0.0")
+        self.assertEqual(doc["servers"], [{"url": "http://testserver/api/v1"}])
+
+    def test_servers_per_host(self):
+        url = reverse("schema-json", kwargs={"format": ".json"})
+
+        with override_settings(ALLOWED_HOSTS=["zrc.example.com", "testserver"]):
+            response = self.client.get(url, HTTP_HOST="zrc.example.com")
+            other_response = self.client.get(url)
+
+        self.assertEqual(
+            response.json()["servers"], [{"url": "http://zrc.example.com/api/v1"}]
+        )
+        self.assertEqual(
+            other_response.json()["servers"], [{"url": "http://testserver/api/v1"}]
+        )
+        self.assertNotEqual(response["ETag"], other_response["ETag"])
+
+    def test_serve_prebuilt_yaml_gzipped(self):
+        url = reverse("schema-json", kwargs={"format": ".yaml"})
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertTrue(response["ETag"].endswith('-gzip"'))
+        doc = yaml.safe_load(gzip.decompress(response.content))
+        self.assertGreaterEqual(doc["openapi"], "3.0.0")
+
+    def test_not_modified(self):
+        url = reverse("schema-json", kwargs={"format": ".json"})
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_swagger2_generated(self):
+        url = reverse("schema-json", kwargs={"format": ".json"})
+
+        response = self.client.get(url, {"v": "2"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["swagger"], "2.0")
+
+    def test_redoc_loads_swagger2(self):
+        response = self.client.get(reverse("schema-redoc"), {"format": "openapi"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["swagger"], "2.0")
+
+    @override_settings(SCHEMA_ARTIFACTS_DIR="/does/not/exist")
+    def test_fallback_to_generated_schema(self):
+        url = reverse("schema-json", kwargs={"format": ".json"})
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreaterEqual(response.json()["openapi"], "3.0.0")
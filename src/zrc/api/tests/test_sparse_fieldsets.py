@@ -0,0 +1,117 @@
+"""
+Test limiting the fields in responses with the ``fields`` parameter.
+"""
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.tests import JWTAuthMixin, reverse
+
+from zrc.datamodel.tests.factories import RolFactory, StatusFactory, ZaakFactory
+from zrc.tests.utils import ZAAK_READ_KWARGS
+
+
+class SparseFieldsetTests(JWTAuthMixin, APITestCase):
+    heeft_alle_autorisaties = True
+
+    def test_list_fields(self):
+        ZaakFactory.create()
+
+        response = self.client.get(
+            reverse("zaak-list"),
+            {"fields": "url,identificatie,einddatumGepland"},
+            **ZAAK_READ_KWARGS,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(
+            set(response.json()["results"][0]),
+            {"url", "identificatie", "einddatumGepland"},
+        )
+
+    def test_retrieve_fields(self):
+        zaak = ZaakFactory.create()
+
+        response = self.client.get(
+            reverse(zaak), {"fields": "url,zaakgeometrie"}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(set(response.json()), {"url", "zaakgeometrie"})
+
+    def test_without_fields(self):
+        zaak = ZaakFactory.create()
+
+        response = self.client.get(reverse(zaak), **ZAAK_READ_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("deelzaken", response.json())
+        self.assertIn("kenmerken", response.json())
+
+    def test_unrequested_relations_not_queried(self):
+        for _ in range(3):
+            zaak = ZaakFactory.create()
+            ZaakFactory.create(hoofdzaak=zaak)
+            StatusFactory.create(zaak=zaak)
+
+        def count_queries(params: dict) -> int:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(
+                    reverse("zaak-list"), params, **ZAAK_READ_KWARGS
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(context.captured_queries)
+
+        # warm up the authorization lookups
+        count_queries({})
+        num_queries = count_queries({"fields": "url"})
+
+        # the deelzaken are prefetched when requested
+        self.assertEqual(count_queries({"fields": "url,deelzaken"}), num_queries + 1)
+        self.assertGreater(count_queries({}), num_queries + 6)
+
+    def test_fields_with_filters(self):
+        zaak = ZaakFactory.create(identificatie="ZAAK-1")
+        ZaakFactory.create(identificatie="ZAAK-2")
+
+        response = self.client.get(
+            reverse("zaak-list"),
+            {"identificatie": "ZAAK-1", "fields": "url"},
+            **ZAAK_READ_KWARGS,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(
+            response.json()["results"], [{"url": f"http://testserver{reverse(zaak)}"}]
+        )
+
+    def test_unknown_fields(self):
+        zaak = ZaakFactory.create()
+
+        response = self.client.get(
+            reverse("zaak-list"), {"fields": "url,besluiten"}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(
+            reverse(zaak), {"fields": "url,besluiten"}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_polymorphic_group_field(self):
+        rol = RolFactory.create()
+
+        response = self.client.get(reverse(rol), {"fields": "url,betrokkeneType"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(set(response.json()), {"url", "betrokkeneType"})
+
+        response = self.client.get(
+            reverse(rol), {"fields": "url,betrokkeneIdentificatie"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(set(response.json()), {"url", "betrokkeneIdentificatie"})
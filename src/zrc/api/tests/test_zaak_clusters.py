@@ -0,0 +1,158 @@
+from django.contrib.gis.geos import Point
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.tests import JWTAuthMixin, get_validation_errors, reverse
+
+from zrc.datamodel.tests.factories import StatusFactory, ZaakFactory
+from zrc.tests.utils import ZAAK_READ_KWARGS, utcdatetime
+
+from ..scopes import SCOPE_ZAKEN_ALLES_LEZEN
+
+ZAAKTYPE = "https://example.com/zaaktypen/1"
+ZAAKTYPE2 = "https://example.com/zaaktypen/2"
+
+# within a single grid cell at zoom level 10
+CENTRUM = [Point(4.898, 52.358), Point(4.9, 52.36), Point(4.902, 52.362)]
+
+# the edge between two tiles at zoom level 10
+TILE_EDGE = 4.921875
+
+
+class ZaakClustersTests(JWTAuthMixin, APITestCase):
+    heeft_alle_autorisaties = True
+
+    def setUp(self):
+        super().setUp()
+        self.url = f"{reverse('zaak-list')}/clusters"
+
+    def test_clusters(self):
+        for point in CENTRUM:
+            ZaakFactory.create(zaakgeometrie=point)
+        ZaakFactory.create(zaakgeometrie=Point(5.5, 52.0))
+        ZaakFactory.create(zaakgeometrie=None)
+
+        response = self.client.get(self.url, {"zoom": 10}, **ZAAK_READ_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual([cluster["aantal"] for cluster in data], [3, 1])
+        self.assertEqual(data[0]["geometrie"]["type"], "Point")
+        self.assertAlmostEqual(data[0]["geometrie"]["coordinates"][0], 4.9, places=6)
+        self.assertAlmostEqual(data[0]["geometrie"]["coordinates"][1], 52.36, places=6)
+        self.assertIsNone(data[0]["groep"])
+
+    def test_cells_line_up_with_tiles(self):
+        ZaakFactory.create(zaakgeometrie=Point(TILE_EDGE - 0.0001, 52.36))
+        ZaakFactory.create(zaakgeometrie=Point(TILE_EDGE + 0.0001, 52.36))
+
+        response = self.client.get(self.url, {"zoom": 10}, **ZAAK_READ_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([cluster["aantal"] for cluster in response.json()], [1, 1])
+
+    def test_low_zoom_merges_clusters(self):
+        for point in CENTRUM:
+            ZaakFactory.create(zaakgeometrie=point)
+        ZaakFactory.create(zaakgeometrie=Point(5.5, 52.0))
+
+        response = self.client.get(self.url, {"zoom": 2}, **ZAAK_READ_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([cluster["aantal"] for cluster in response.json()], [4])
+
+    def test_group_by_zaaktype(self):
+        ZaakFactory.create(zaaktype=ZAAKTYPE, zaakgeometrie=CENTRUM[0])
+        ZaakFactory.create(zaaktype=ZAAKTYPE, zaakgeometrie=CENTRUM[1])
+        ZaakFactory.create(zaaktype=ZAAKTYPE2, zaakgeometrie=CENTRUM[2])
+
+        response = self.client.get(
+            self.url, {"zoom": 10, "groepering": "zaaktype"}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(cluster["groep"], cluster["aantal"]) for cluster in response.json()],
+            [(ZAAKTYPE, 2), (ZAAKTYPE2, 1)],
+        )
+
+    def test_group_by_current_statustype(self):
+        zaak1, zaak2 = [
+            ZaakFactory.create(zaakgeometrie=point) for point in CENTRUM[:2]
+        ]
+        StatusFactory.create(
+            zaak=zaak1,
+            statustype="https://example.com/statustypen/1",
+            datum_status_gezet=utcdatetime(2020, 1, 1),
+        )
+        StatusFactory.create(
+            zaak=zaak1,
+            statustype="https://example.com/statustypen/2",
+            datum_status_gezet=utcdatetime(2020, 1, 2),
+        )
+        StatusFactory.create(
+            zaak=zaak2,
+            statustype="https://example.com/statustypen/2",
+            datum_status_gezet=utcdatetime(2020, 1, 1),
+        )
+
+        response = self.client.get(
+            self.url, {"zoom": 10, "groepering": "statustype"}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(cluster["groep"], cluster["aantal"]) for cluster in response.json()],
+            [("https://example.com/statustypen/2", 2)],
+        )
+
+    def test_filters(self):
+        for point in CENTRUM:
+            ZaakFactory.create(zaakgeometrie=point)
+        ZaakFactory.create(zaakgeometrie=Point(5.5, 52.0))
+
+        response = self.client.get(
+            self.url,
+            {"zoom": 10, "zaakgeometrie__bbox": "5.4,51.9,5.6,52.1"},
+            **ZAAK_READ_KWARGS,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([cluster["aantal"] for cluster in response.json()], [1])
+
+    def test_invalid_parameters(self):
+        cases = [
+            ({}, "zoom"),
+            ({"zoom": 23}, "zoom"),
+            ({"zoom": 10, "groepering": "resultaattype"}, "groepering"),
+        ]
+
+        for params, field in cases:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params, **ZAAK_READ_KWARGS)
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIsNotNone(get_validation_errors(response, field))
+
+    def test_unknown_parameter(self):
+        response = self.client.get(
+            self.url, {"zoom": 10, "foo": "bar"}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ZaakClustersAuthorizationsTests(JWTAuthMixin, APITestCase):
+    scopes = [SCOPE_ZAKEN_ALLES_LEZEN]
+    zaaktype = ZAAKTYPE
+
+    def test_clusters_authorized_zaken(self):
+        ZaakFactory.create(zaaktype=ZAAKTYPE, zaakgeometrie=CENTRUM[0])
+        ZaakFactory.create(zaaktype=ZAAKTYPE2, zaakgeometrie=CENTRUM[1])
+
+        response = self.client.get(
+            f"{reverse('zaak-list')}/clusters", {"zoom": 10}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([cluster["aantal"] for cluster in response.json()], [1])
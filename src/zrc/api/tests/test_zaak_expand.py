@@ -0,0 +1,167 @@
+"""
+Test inlining the related resources of zaken with the ``expand`` parameter.
+"""
+from datetime import datetime
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.constants import VertrouwelijkheidsAanduiding
+from vng_api_common.tests import JWTAuthMixin, reverse
+
+from zrc.datamodel.tests.factories import (
+    ResultaatFactory,
+    RolFactory,
+    StatusFactory,
+    ZaakEigenschapFactory,
+    ZaakFactory,
+)
+from zrc.tests.utils import ZAAK_READ_KWARGS
+
+from ..scopes import SCOPE_ZAKEN_ALLES_LEZEN
+
+ZAAKTYPE = "https://example.com/api/v1/zaaktype/1"
+OTHER_ZAAKTYPE = "https://example.com/api/v1/zaaktype/2"
+
+
+class ZaakExpandTests(JWTAuthMixin, APITestCase):
+    heeft_alle_autorisaties = True
+
+    def test_retrieve_expand(self):
+        zaak = ZaakFactory.create(with_etag=True)
+        StatusFactory.create(
+            zaak=zaak, datum_status_gezet=datetime(2020, 1, 1, tzinfo=timezone.utc)
+        )
+        current = StatusFactory.create(
+            zaak=zaak, datum_status_gezet=datetime(2020, 2, 1, tzinfo=timezone.utc)
+        )
+        rol = RolFactory.create(zaak=zaak)
+
+        response = self.client.get(
+            reverse(zaak), {"expand": "status,rollen,resultaat"}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        expanded = response.json()["_expand"]
+        self.assertEqual(
+            expanded["status"]["url"], f"http://testserver{reverse(current)}"
+        )
+        self.assertEqual(
+            [rol_data["url"] for rol_data in expanded["rollen"]],
+            [f"http://testserver{reverse(rol)}"],
+        )
+        self.assertIsNone(expanded["resultaat"])
+        # the ETag of the zaak doesn't cover the expanded resources
+        self.assertNotIn("ETag", response)
+
+    def test_retrieve_without_expand(self):
+        zaak = ZaakFactory.create(with_etag=True)
+
+        response = self.client.get(reverse(zaak), **ZAAK_READ_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("_expand", response.json())
+        self.assertIn("ETag", response)
+
+    def test_list_expand(self):
+        zaak = ZaakFactory.create()
+        deelzaak = ZaakFactory.create(hoofdzaak=zaak)
+        resultaat = ResultaatFactory.create(zaak=zaak)
+
+        response = self.client.get(
+            reverse("zaak-list"), {"expand": "deelzaken,resultaat"}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        results = {
+            zaak_data["url"]: zaak_data for zaak_data in response.json()["results"]
+        }
+        expanded = results[f"http://testserver{reverse(zaak)}"]["_expand"]
+        self.assertEqual(
+            [zaak_data["url"] for zaak_data in expanded["deelzaken"]],
+            [f"http://testserver{reverse(deelzaak)}"],
+        )
+        self.assertEqual(
+            expanded["resultaat"]["url"], f"http://testserver{reverse(resultaat)}"
+        )
+        deelzaak_expanded = results[f"http://testserver{reverse(deelzaak)}"]["_expand"]
+        self.assertEqual(deelzaak_expanded, {"deelzaken": [], "resultaat": None})
+
+    def test_list_expand_one_query_per_expansion(self):
+        for _ in range(3):
+            zaak = ZaakFactory.create()
+            StatusFactory.create(zaak=zaak)
+            ResultaatFactory.create(zaak=zaak)
+            ZaakEigenschapFactory.create(zaak=zaak)
+
+        def count_queries(params: dict) -> int:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(
+                    reverse("zaak-list"), params, **ZAAK_READ_KWARGS
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(context.captured_queries)
+
+        # warm up the authorization lookups
+        count_queries({})
+        num_queries = count_queries({})
+
+        self.assertEqual(
+            count_queries({"expand": "status,resultaat,eigenschappen"}),
+            num_queries + 3,
+        )
+
+    def test_unknown_expand(self):
+        zaak = ZaakFactory.create()
+
+        response = self.client.get(
+            reverse("zaak-list"), {"expand": "besluiten"}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(
+            reverse(zaak), {"expand": "besluiten"}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ZaakExpandAuthorizationTests(JWTAuthMixin, APITestCase):
+    scopes = [SCOPE_ZAKEN_ALLES_LEZEN]
+    zaaktype = ZAAKTYPE
+    max_vertrouwelijkheidaanduiding = VertrouwelijkheidsAanduiding.beperkt_openbaar
+
+    def test_expand_filtered_by_authorizations(self):
+        zaak = ZaakFactory.create(
+            zaaktype=ZAAKTYPE,
+            vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+        )
+        allowed = ZaakFactory.create(
+            hoofdzaak=zaak,
+            zaaktype=ZAAKTYPE,
+            vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+        )
+        ZaakFactory.create(
+            hoofdzaak=zaak,
+            zaaktype=OTHER_ZAAKTYPE,
+            vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+        )
+        ZaakFactory.create(
+            hoofdzaak=zaak,
+            zaaktype=ZAAKTYPE,
+            vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.geheim,
+        )
+
+        response = self.client.get(
+            reverse(zaak), {"expand": "deelzaken"}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(
+            [zaak_data["url"] for zaak_data in response.json()["_expand"]["deelzaken"]],
+            [f"http://testserver{reverse(allowed)}"],
+        )
@@ -0,0 +1,129 @@
+from django.contrib.gis.geos import LineString, Point, Polygon
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.tests import (
+    JWTAuthMixin,
+    get_operation_url,
+    get_validation_errors,
+    reverse,
+)
+
+from zrc.datamodel.models import Zaak
+from zrc.datamodel.tests.factories import ZaakFactory
+from zrc.tests.utils import ZAAK_READ_KWARGS, ZAAK_WRITE_KWARGS
+
+# a street crossing the viewport, with its envelope partly outside of it
+LINE = LineString((4.88, 52.36), (4.90, 52.38), srid=4326)
+
+
+class ZaakGeometrieTriggerTests(TestCase):
+    def test_envelop_maintained(self):
+        zaak = ZaakFactory.create(zaakgeometrie=LINE)
+
+        zaak = Zaak.objects.get(pk=zaak.pk)
+        self.assertEqual(zaak.zaakgeometrie_envelop.extent, LINE.extent)
+        self.assertIsNotNone(zaak.zaakgeometrie_vereenvoudigd)
+
+        zaak.zaakgeometrie = Point(4.9, 52.37)
+        zaak.save()
+
+        zaak = Zaak.objects.get(pk=zaak.pk)
+        self.assertEqual(zaak.zaakgeometrie_envelop, zaak.zaakgeometrie)
+
+
+class ZaakGeoFilterTests(JWTAuthMixin, APITestCase):
+    heeft_alle_autorisaties = True
+
+    def setUp(self):
+        super().setUp()
+        self.inside = ZaakFactory.create(zaakgeometrie=Point(4.8915, 52.3712))
+        self.crossing = ZaakFactory.create(zaakgeometrie=LINE)
+        self.outside = ZaakFactory.create(zaakgeometrie=Point(5.1, 52.1))
+        ZaakFactory.create(zaakgeometrie=None)
+
+    def get_urls(self, response) -> set:
+        return {zaak["url"] for zaak in response.json()["results"]}
+
+    def test_list_bbox(self):
+        response = self.client.get(
+            reverse("zaak-list"),
+            {"zaakgeometrie__bbox": "4.89,52.37,4.892,52.372"},
+            **ZAAK_READ_KWARGS,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.get_urls(response),
+            {
+                f"http://testserver{reverse(self.inside)}",
+                f"http://testserver{reverse(self.crossing)}",
+            },
+        )
+
+    def test_list_bbox_invalid(self):
+        for bbox in ["4.89,52.37,4.892", "4.9,52.37,4.89,52.38", "a,b,c,d"]:
+            with self.subTest(bbox=bbox):
+                response = self.client.get(
+                    reverse("zaak-list"),
+                    {"zaakgeometrie__bbox": bbox},
+                    **ZAAK_READ_KWARGS,
+                )
+
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                error = get_validation_errors(response, "zaakgeometrie__bbox")
+                self.assertEqual(error["code"], "invalid")
+
+    def test_list_intersects(self):
+        response = self.client.get(
+            reverse("zaak-list"),
+            {"zaakgeometrie__intersects": "POINT (4.8915 52.3712)"},
+            **ZAAK_READ_KWARGS,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.get_urls(response), {f"http://testserver{reverse(self.inside)}"}
+        )
+
+    def test_zoek_intersects(self):
+        polygon = Polygon.from_bbox((4.879, 52.359, 4.881, 52.361))
+
+        response = self.client.post(
+            get_operation_url("zaak__zoek"),
+            {"zaakgeometrie": {"intersects": json_geometry(polygon)}},
+            **ZAAK_WRITE_KWARGS,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.get_urls(response), {f"http://testserver{reverse(self.crossing)}"}
+        )
+
+    def test_zoek_bbox(self):
+        response = self.client.post(
+            get_operation_url("zaak__zoek"),
+            {"zaakgeometrie": {"bbox": [5.0, 52.0, 5.2, 52.2]}},
+            **ZAAK_WRITE_KWARGS,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.get_urls(response), {f"http://testserver{reverse(self.outside)}"}
+        )
+
+    def test_zoek_bbox_invalid(self):
+        response = self.client.post(
+            get_operation_url("zaak__zoek"),
+            {"zaakgeometrie": {"bbox": [5.2, 52.0, 5.0, 52.2]}},
+            **ZAAK_WRITE_KWARGS,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        error = get_validation_errors(response, "zaakgeometrie.bbox")
+        self.assertEqual(error["code"], "invalid-bbox")
+
+
+def json_geometry(geometry) -> dict:
+    return {"type": geometry.geom_type, "coordinates": geometry.coords}
@@ -0,0 +1,100 @@
+from django.contrib.gis.geos import Point
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.tests import (
+    JWTAuthMixin,
+    get_operation_url,
+    get_validation_errors,
+    reverse,
+)
+
+from zrc.datamodel.tests.factories import ZaakFactory
+from zrc.tests.utils import ZAAK_READ_KWARGS, ZAAK_WRITE_KWARGS
+
+
+class ZaakGeoJSONTests(JWTAuthMixin, APITestCase):
+    heeft_alle_autorisaties = True
+
+    def setUp(self):
+        super().setUp()
+        self.zaak = ZaakFactory.create(zaakgeometrie=Point(4.891234567, 52.371234567))
+
+    def test_list(self):
+        ZaakFactory.create(zaakgeometrie=None)
+
+        response = self.client.get(reverse("zaak-list"), **ZAAK_READ_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        geometries = [zaak["zaakgeometrie"] for zaak in response.json()["results"]]
+        self.assertEqual(
+            geometries,
+            [None, {"type": "Point", "coordinates": [4.891234567, 52.371234567]}],
+        )
+
+    def test_list_precision(self):
+        response = self.client.get(
+            reverse("zaak-list"), {"precisie": 3}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["results"][0]["zaakgeometrie"],
+            {"type": "Point", "coordinates": [4.891, 52.371]},
+        )
+
+    def test_list_simplified(self):
+        response = self.client.get(
+            reverse("zaak-list"), {"vereenvoudigd": "true"}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["results"][0]["zaakgeometrie"]["type"], "Point"
+        )
+
+    def test_list_invalid_precision(self):
+        response = self.client.get(
+            reverse("zaak-list"), {"precisie": 16}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        error = get_validation_errors(response, "precisie")
+        self.assertEqual(error["code"], "max_value")
+
+    def test_list_fields_without_geometry(self):
+        response = self.client.get(
+            reverse("zaak-list"),
+            {"fields": "url", "precisie": 3},
+            **ZAAK_READ_KWARGS,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["results"],
+            [{"url": f"http://testserver{reverse(self.zaak)}"}],
+        )
+
+    def test_zoek_precision(self):
+        response = self.client.post(
+            f"{get_operation_url('zaak__zoek')}?precisie=1",
+            {"zaakgeometrie": {"bbox": [4.8, 52.3, 5.0, 52.4]}},
+            **ZAAK_WRITE_KWARGS,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["results"][0]["zaakgeometrie"],
+            {"type": "Point", "coordinates": [4.9, 52.4]},
+        )
+
+    def test_retrieve_loads_geometry(self):
+        response = self.client.get(
+            reverse(self.zaak), {"precisie": 3}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["zaakgeometrie"],
+            {"type": "Point", "coordinates": [4.891234567, 52.371234567]},
+        )
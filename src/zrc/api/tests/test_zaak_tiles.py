@@ -0,0 +1,227 @@
+from unittest.mock import patch
+
+from django.contrib.gis.geos import Point
+from django.core.cache import caches
+from django.test import SimpleTestCase
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.constants import VertrouwelijkheidsAanduiding
+from vng_api_common.tests import JWTAuthMixin, reverse
+
+from zrc.datamodel.models import Zaak
+from zrc.datamodel.tests.factories import RolFactory, StatusFactory, ZaakFactory
+
+from ..scopes import SCOPE_ZAKEN_ALLES_LEZEN
+from ..tiles import (
+    INVALIDATION_MAX_ZOOM,
+    MAX_INVALIDATED_TILES,
+    MIN_INVALIDATION_ZOOM,
+    WEB_MERCATOR_EXTENT,
+    generate_tile,
+    get_invalidated_tiles,
+    get_tile_bounds,
+    get_tiles,
+)
+
+ZAAKTYPE = "https://example.com/zaaktypen/1"
+
+# the tile with Amsterdam at zoom level 10
+TILE = {"z": 10, "x": 525, "y": 336}
+
+
+def get_tile_url(z: int, x: int, y: int) -> str:
+    return f"{reverse('zaak-list')}/tiles/{z}/{x}/{y}.pbf"
+
+
+class TileMathTests(SimpleTestCase):
+    def test_tile_bounds(self):
+        self.assertEqual(
+            get_tile_bounds(0, 0, 0),
+            (
+                -WEB_MERCATOR_EXTENT,
+                -WEB_MERCATOR_EXTENT,
+                WEB_MERCATOR_EXTENT,
+                WEB_MERCATOR_EXTENT,
+            ),
+        )
+        self.assertEqual(
+            get_tile_bounds(1, 1, 0), (0, 0, WEB_MERCATOR_EXTENT, WEB_MERCATOR_EXTENT)
+        )
+
+    def test_tiles_of_point(self):
+        self.assertEqual(
+            get_tiles(10, Point(4.9, 52.37).extent), [(10, TILE["x"], TILE["y"])]
+        )
+
+    def test_invalidated_tiles(self):
+        point = Point(4.9, 52.37).extent
+        tiles = get_invalidated_tiles(point)
+        self.assertEqual(
+            {z for z, x, y in tiles},
+            set(range(MIN_INVALIDATION_ZOOM, INVALIDATION_MAX_ZOOM + 1)),
+        )
+        self.assertIn((10, TILE["x"], TILE["y"]), tiles)
+
+        # the Netherlands
+        tiles = get_invalidated_tiles((3.3, 50.7, 7.3, 53.6))
+        self.assertEqual(min(z for z, x, y in tiles), MIN_INVALIDATION_ZOOM)
+        self.assertLess(max(z for z, x, y in tiles), INVALIDATION_MAX_ZOOM)
+        for z in range(MIN_INVALIDATION_ZOOM, INVALIDATION_MAX_ZOOM + 1):
+            self.assertLessEqual(
+                len([tile for tile in tiles if tile[0] == z]), MAX_INVALIDATED_TILES
+            )
+
+    def test_invalidated_tiles_far_away(self):
+        amsterdam = set(get_invalidated_tiles(Point(4.9, 52.37).extent))
+        elsewhere = set(get_invalidated_tiles(Point(-70, -30).extent))
+
+        self.assertEqual(amsterdam & elsewhere, set())
+
+    def test_invalidated_tiles_world(self):
+        self.assertIsNone(get_invalidated_tiles((-180, -85, 180, 85)))
+
+
+class ZaakTilesTests(JWTAuthMixin, APITestCase):
+    scopes = [SCOPE_ZAKEN_ALLES_LEZEN]
+    zaaktype = ZAAKTYPE
+
+    def setUp(self):
+        super().setUp()
+        caches["tiles"].clear()
+        self.addCleanup(caches["tiles"].clear)
+
+    def test_tile(self):
+        ZaakFactory.create(zaaktype=ZAAKTYPE, zaakgeometrie=Point(4.9, 52.37))
+
+        response = self.client.get(get_tile_url(**TILE))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/vnd.mapbox-vector-tile")
+        self.assertEqual(response["Content-Crs"], "EPSG:3857")
+        self.assertNotEqual(response.content, b"")
+
+    def test_empty_tile(self):
+        ZaakFactory.create(zaaktype=ZAAKTYPE, zaakgeometrie=Point(4.9, 52.37))
+
+        response = self.client.get(get_tile_url(10, 0, 0))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b"")
+
+    def test_invalid_tile(self):
+        response = self.client.get(get_tile_url(1, 2, 0))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_authorizations(self):
+        ZaakFactory.create(
+            zaaktype="https://example.com/zaaktypen/2", zaakgeometrie=Point(4.9, 52.37)
+        )
+
+        response = self.client.get(get_tile_url(**TILE))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b"")
+
+    def test_filters(self):
+        ZaakFactory.create(zaaktype=ZAAKTYPE, zaakgeometrie=Point(4.9, 52.37))
+
+        response = self.client.get(
+            get_tile_url(**TILE), {"identificatie": "does-not-exist"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b"")
+
+    def test_unknown_filter(self):
+        response = self.client.get(get_tile_url(**TILE), {"foo": "bar"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cached_until_geometry_changes(self):
+        zaak = ZaakFactory.create(zaaktype=ZAAKTYPE, zaakgeometrie=Point(4.9, 52.37))
+        url = get_tile_url(**TILE)
+
+        with patch("zrc.api.tiles.generate_tile", wraps=generate_tile) as generate:
+            first = self.client.get(url)
+            self.client.get(url)
+            self.assertEqual(generate.call_count, 1)
+
+            zaak = Zaak.objects.get(pk=zaak.pk)
+            zaak.zaakgeometrie = Point(0, 0)
+            zaak.save()
+
+            response = self.client.get(url)
+
+        self.assertEqual(generate.call_count, 2)
+        self.assertNotEqual(first.content, b"")
+        self.assertEqual(response.content, b"")
+
+    def test_other_changes_invalidate_zaak_tiles(self):
+        zaak = ZaakFactory.create(
+            zaaktype=ZAAKTYPE,
+            zaakgeometrie=Point(4.9, 52.37),
+            vertrouwelijkheidaanduiding=VertrouwelijkheidsAanduiding.openbaar,
+        )
+        url = get_tile_url(**TILE)
+        query = {
+            "maximaleVertrouwelijkheidaanduiding": VertrouwelijkheidsAanduiding.openbaar
+        }
+
+        with patch("zrc.api.tiles.generate_tile", wraps=generate_tile) as generate:
+            self.client.get(url, query)
+
+            zaak = Zaak.objects.get(pk=zaak.pk)
+            zaak.vertrouwelijkheidaanduiding = VertrouwelijkheidsAanduiding.geheim
+            zaak.save()
+
+            response = self.client.get(url, query)
+
+        self.assertEqual(generate.call_count, 2)
+        self.assertEqual(response.content, b"")
+
+    def test_status_and_rol_invalidate_zaak_tiles(self):
+        zaak = ZaakFactory.create(zaaktype=ZAAKTYPE, zaakgeometrie=Point(4.9, 52.37))
+        url = get_tile_url(**TILE)
+
+        with patch("zrc.api.tiles.generate_tile", wraps=generate_tile) as generate:
+            for factory in (StatusFactory, RolFactory):
+                with self.subTest(factory=factory):
+                    generate.reset_mock()
+                    self.client.get(url)
+
+                    factory.create(zaak=zaak)
+                    self.client.get(url)
+
+                    self.assertEqual(generate.call_count, 2)
+
+    def test_changes_elsewhere_keep_cache(self):
+        ZaakFactory.create(zaaktype=ZAAKTYPE, zaakgeometrie=Point(4.9, 52.37))
+        url = get_tile_url(**TILE)
+
+        with patch("zrc.api.tiles.generate_tile", wraps=generate_tile) as generate:
+            self.client.get(url)
+
+            # a zaak far away
+            zaak = ZaakFactory.create(zaaktype=ZAAKTYPE, zaakgeometrie=Point(-70, -30))
+            zaak.toelichting = "gewijzigd"
+            zaak.save()
+            StatusFactory.create(zaak=zaak)
+
+            self.client.get(url)
+
+        self.assertEqual(generate.call_count, 1)
+
+    def test_etag_keeps_cache(self):
+        zaak = ZaakFactory.create(zaaktype=ZAAKTYPE, zaakgeometrie=Point(4.9, 52.37))
+        url = get_tile_url(**TILE)
+
+        with patch("zrc.api.tiles.generate_tile", wraps=generate_tile) as generate:
+            self.client.get(url)
+
+            zaak.calculate_etag_value()
+
+            self.client.get(url)
+
+        self.assertEqual(generate.call_count, 1)
@@ -16,7 +16,7 @@ class ZaakZoekTests(JWTAuthMixin, TypeCheckMixin, APITestCase):
     heeft_alle_autorisaties = True
 
     def test_zoek_uuid_in(self):
-        zaak1, zaak2, zaak3 = ZaakFactory.create_batch(3)
+        zaak1, zaak2, zaak3 = ZaakFactory.create_batch(3, bronorganisatie="517439943")
         url = get_operation_url("zaak__zoek")
         data = {"uuid__in": [zaak1.uuid, zaak2.uuid]}
 
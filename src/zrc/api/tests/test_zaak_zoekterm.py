@@ -0,0 +1,101 @@
+"""
+Test the full text search on zaken with the ``zoekterm`` parameter.
+"""
+from rest_framework import status
+from rest_framework.test import APITestCase
+from vng_api_common.constants import VertrouwelijkheidsAanduiding
+from vng_api_common.tests import JWTAuthMixin, get_operation_url, reverse
+
+from zrc.datamodel.tests.factories import ZaakFactory
+from zrc.tests.utils import ZAAK_READ_KWARGS, ZAAK_WRITE_KWARGS
+
+from ..scopes import SCOPE_ZAKEN_ALLES_LEZEN
+
+ZAAKTYPE = "https://example.com/api/v1/zaaktype/1"
+
+
+class ZoektermTests(JWTAuthMixin, APITestCase):
+    scopes = [SCOPE_ZAKEN_ALLES_LEZEN]
+    zaaktype = ZAAKTYPE
+    max_vertrouwelijkheidaanduiding = VertrouwelijkheidsAanduiding.zeer_geheim
+
+    def test_list_zoekterm(self):
+        zaak = ZaakFactory.create(
+            zaaktype=ZAAKTYPE, omschrijving="Aanvraag omgevingsvergunning"
+        )
+        ZaakFactory.create(zaaktype=ZAAKTYPE, omschrijving="Melding openbare ruimte")
+        url = reverse("zaak-list")
+
+        # matches on the stem: "vergunningen" ~ "vergunning"
+        response = self.client.get(
+            url, {"zoekterm": "omgevingsvergunningen"}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["count"], 1)
+        self.assertEqual(data["results"][0]["url"], f"http://testserver{reverse(zaak)}")
+
+    def test_list_zoekterm_ranked(self):
+        in_toelichting = ZaakFactory.create(
+            zaaktype=ZAAKTYPE, omschrijving="Melding", toelichting="Losliggende tegels"
+        )
+        in_omschrijving = ZaakFactory.create(
+            zaaktype=ZAAKTYPE, omschrijving="Tegels", toelichting="Stoep"
+        )
+        url = reverse("zaak-list")
+
+        response = self.client.get(url, {"zoekterm": "tegels"}, **ZAAK_READ_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        urls = [zaak["url"] for zaak in response.json()["results"]]
+        self.assertEqual(
+            urls,
+            [
+                f"http://testserver{reverse(in_omschrijving)}",
+                f"http://testserver{reverse(in_toelichting)}",
+            ],
+        )
+
+    def test_list_zoekterm_authorizations(self):
+        ZaakFactory.create(
+            zaaktype="https://example.com/api/v1/zaaktype/2",
+            omschrijving="Aanvraag omgevingsvergunning",
+        )
+        url = reverse("zaak-list")
+
+        response = self.client.get(
+            url, {"zoekterm": "omgevingsvergunning"}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 0)
+
+    def test_zoekterm_updated(self):
+        zaak = ZaakFactory.create(zaaktype=ZAAKTYPE, omschrijving="Melding")
+        zaak.toelichting = "Geluidsoverlast"
+        zaak.save()
+        url = reverse("zaak-list")
+
+        response = self.client.get(
+            url, {"zoekterm": "geluidsoverlast"}, **ZAAK_READ_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 1)
+
+    def test_zoek_zoekterm(self):
+        zaak = ZaakFactory.create(
+            zaaktype=ZAAKTYPE, omschrijving="Aanvraag omgevingsvergunning"
+        )
+        ZaakFactory.create(zaaktype=ZAAKTYPE, omschrijving="Melding openbare ruimte")
+        url = get_operation_url("zaak__zoek")
+
+        response = self.client.post(
+            url, {"zoekterm": "omgevingsvergunning"}, **ZAAK_WRITE_KWARGS
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()["results"]
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["url"], f"http://testserver{reverse(zaak)}")
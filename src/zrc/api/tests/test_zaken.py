@@ -563,6 +563,71 @@ class ZakenTests(JWTAuthMixin, APITestCase):
         self.assertEqual(data[1]["startdatum"], "2019-02-01")
         self.assertEqual(data[2]["startdatum"], "2019-01-01")
 
+    def test_filter_einddatum_isnull(self):
+        open_zaak = ZaakFactory.create(zaaktype=ZAAKTYPE, einddatum=None)
+        ZaakFactory.create(zaaktype=ZAAKTYPE, einddatum="2019-02-01")
+        url = reverse("zaak-list")
+
+        response = self.client.get(url, {"einddatum__isnull": True}, **ZAAK_READ_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(
+            response.data["results"][0]["url"], f"http://testserver{reverse(open_zaak)}"
+        )
+
+    def test_sort_deadlines(self):
+        ZaakFactory.create(
+            zaaktype=ZAAKTYPE,
+            registratiedatum="2019-01-01",
+            einddatum_gepland="2019-03-01",
+            uiterlijke_einddatum_afdoening="2019-02-01",
+        )
+        ZaakFactory.create(
+            zaaktype=ZAAKTYPE,
+            registratiedatum="2019-02-01",
+            einddatum_gepland="2019-01-01",
+            uiterlijke_einddatum_afdoening="2019-03-01",
+        )
+        url = reverse("zaak-list")
+
+        for ordering in [
+            "einddatum_gepland",
+            "uiterlijke_einddatum_afdoening",
+            "registratiedatum",
+        ]:
+            with self.subTest(ordering=ordering):
+                response = self.client.get(
+                    url,
+                    {"ordering": ordering, "einddatum__isnull": True},
+                    **ZAAK_READ_KWARGS,
+                )
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                data = response.data["results"]
+                self.assertEqual(data[0][ordering], "2019-01-01")
+                self.assertEqual(data[1][ordering], "2019-02-01")
+
+    def test_sort_ties_by_pk(self):
+        zaken = ZaakFactory.create_batch(
+            3, zaaktype=ZAAKTYPE, einddatum_gepland="2019-01-01"
+        )
+        urls = [f"http://testserver{reverse(zaak)}" for zaak in zaken]
+
+        for ordering, expected in [
+            ("einddatum_gepland", urls),
+            ("-einddatum_gepland", urls[::-1]),
+        ]:
+            with self.subTest(ordering=ordering):
+                response = self.client.get(
+                    reverse("zaak-list"), {"ordering": ordering}, **ZAAK_READ_KWARGS
+                )
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    [zaak["url"] for zaak in response.data["results"]], expected
+                )
+
     def test_zaak_eigenschappen_as_inline(self):
         zaak1 = ZaakFactory.create(zaaktype=ZAAKTYPE)
         zaak2 = ZaakFactory.create(zaaktype=ZAAKTYPE)
@@ -1029,3 +1094,47 @@ class ZakenWerkVoorraadTests(JWTAuthMixin, APITestCase):
 
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertEqual(response.data["count"], 1)
+
+    def test_status_statustype(self):
+        url = reverse(Zaak)
+        STATUSTYPE = "https://ztc.nl/api/v1/statustypen/1"
+        zaak1, zaak2, zaak3 = ZaakFactory.create_batch(3)
+        StatusFactory.create(
+            zaak=zaak1,
+            statustype=STATUSTYPE,
+            datum_status_gezet=utcdatetime(2020, 1, 1),
+        )
+        # the statustype is no longer the current one
+        StatusFactory.create(
+            zaak=zaak2,
+            statustype=STATUSTYPE,
+            datum_status_gezet=utcdatetime(2020, 1, 1),
+        )
+        StatusFactory.create(zaak=zaak2, datum_status_gezet=utcdatetime(2020, 2, 1))
+        StatusFactory.create(zaak=zaak3, datum_status_gezet=utcdatetime(2020, 1, 1))
+
+        with self.subTest(operation="list"):
+            response = self.client.get(
+                url, {"status__statustype": STATUSTYPE}, **ZAAK_READ_KWARGS
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["count"], 1)
+            self.assertEqual(
+                response.data["results"][0]["url"],
+                f"http://testserver{reverse(zaak1)}",
+            )
+
+        with self.subTest(operation="_zoek"):
+            response = self.client.post(
+                get_operation_url("zaak__zoek"),
+                {"status__statustype": STATUSTYPE},
+                **ZAAK_WRITE_KWARGS,
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["count"], 1)
+            self.assertEqual(
+                response.data["results"][0]["url"],
+                f"http://testserver{reverse(zaak1)}",
+            )
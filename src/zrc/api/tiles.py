@@ -0,0 +1,387 @@
+"""
+Mapbox vector tiles (MVT) of the geometries of zaken, generated by PostGIS.
+
+A tile is generated with ``ST_AsMVT`` from the (filtered) zaken queryset of the
+request, so the database clips and encodes the geometries and no geometry is
+ever loaded in Python.
+
+Generated tiles are cached per authorization fingerprint and filter
+parameters. Every tile from ``MIN_INVALIDATION_ZOOM`` up to
+``INVALIDATION_MAX_ZOOM`` has a generation in the cache, and the cache key of a
+tile contains the generations of the tile and its ancestors down to
+``MIN_INVALIDATION_ZOOM``. Any change of a zaak, or of its statussen and
+rollen, can change the (filtered) tiles the zaak is on, and replaces the
+generations of the tiles its geometry lies in (before and after the change) at
+these zoom levels, which invalidates these tiles and all their descendants.
+Large geometries stop at a coarser zoom level.
+
+The coarser tiles cover so large an area that nearly every change is in them,
+so they are cached for ``COARSE_TILE_TIMEOUT`` instead of being invalidated.
+"""
+import hashlib
+import logging
+import math
+import uuid
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from django.contrib.gis.geos import GEOSGeometry, Polygon
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import connections, transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from rest_framework.request import Request
+
+from zrc.datamodel.models import Rol, Status, Zaak
+
+from .authorizations import AuthorizationIndex
+from .hyperlinks import reverse
+from .scopes import SCOPE_ZAKEN_ALLES_LEZEN
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = "tiles"
+
+LAYER = "zaken"
+EXTENT = 4096
+# the geometries just outside of a tile are included, so that lines and
+# polygons continue seamlessly in the neighbouring tiles
+BUFFER = 64
+
+MAX_ZOOM = 22
+# up to this zoom level the simplified geometry is detailed enough
+SIMPLIFIED_MAX_ZOOM = 12
+# the tiles from this zoom level are invalidated by the changes in them
+MIN_INVALIDATION_ZOOM = 6
+# the tiles below this zoom level are invalidated together with their ancestor
+INVALIDATION_MAX_ZOOM = 14
+# seconds the tiles above MIN_INVALIDATION_ZOOM are cached
+COARSE_TILE_TIMEOUT = 5 * 60
+# a single change invalidates at most this many tiles per zoom level
+MAX_INVALIDATED_TILES = 16
+
+# the zaken on a map are clustered in a grid of this many cells per tile width
+CELLS_PER_TILE = 8
+
+# half the width of the world in web mercator (EPSG:3857)
+WEB_MERCATOR_EXTENT = 20037508.342789244
+MAX_LATITUDE = 85.0511287798066
+
+# a lookup value to cut the URLs of the zaken in a prefix and suffix
+URL_MARKER = "00000000-0000-4000-8000-000000000000"
+
+TILE_SQL = """
+SELECT ST_AsMVT(tile, %s, %s, 'geom')
+FROM (
+    SELECT
+        %s || zaak.uuid::text || %s AS url,
+        zaak.identificatie,
+        zaak.zaaktype,
+        ST_AsMVTGeom(
+            ST_Transform(zaak.{geometry}, 3857),
+            ST_MakeEnvelope(%s, %s, %s, %s, 3857),
+            %s,
+            %s,
+            true
+        ) AS geom
+    FROM {table} AS zaak
+    WHERE zaak.{pk} IN ({zaken})
+) AS tile
+WHERE tile.geom IS NOT NULL
+"""
+
+Tile = Tuple[int, int, int]
+
+
+def is_valid_tile(z: int, x: int, y: int) -> bool:
+    return 0 <= z <= MAX_ZOOM and 0 <= x < 2**z and 0 <= y < 2**z
+
+
+def get_cell_size(z: int) -> float:
+    """
+    Return the size in web mercator (EPSG:3857) of the cluster grid cells at
+    zoom level ``z``.
+
+    The grid starts at the origin of web mercator, which is on a tile edge at
+    every zoom level, so every tile is ``CELLS_PER_TILE`` cells wide and high.
+    """
+    return 2 * WEB_MERCATOR_EXTENT / 2**z / CELLS_PER_TILE
+
+
+def get_tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """
+    Return the bounds of the tile in web mercator (EPSG:3857).
+    """
+    size = 2 * WEB_MERCATOR_EXTENT / 2**z
+    minx = -WEB_MERCATOR_EXTENT + x * size
+    maxy = WEB_MERCATOR_EXTENT - y * size
+    return (minx, maxy - size, minx + size, maxy)
+
+
+def get_lon_lat(z: int, x: float, y: float) -> Tuple[float, float]:
+    """
+    Return the WGS84 coordinates of the (fractional) tile coordinates.
+    """
+    n = 2**z
+    lon = x / n * 360 - 180
+    lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    return (lon, lat)
+
+
+def get_tile_xy(z: int, lon: float, lat: float) -> Tuple[float, float]:
+    """
+    Return the fractional tile coordinates of the WGS84 coordinates.
+    """
+    n = 2**z
+    lat = math.radians(min(max(lat, -MAX_LATITUDE), MAX_LATITUDE))
+    x = (lon + 180) / 360 * n
+    y = (1 - math.asinh(math.tan(lat)) / math.pi) / 2 * n
+    return (x, y)
+
+
+def get_tile_envelope(z: int, x: int, y: int) -> Polygon:
+    """
+    Return the area of the tile, including its buffer, in WGS84.
+    """
+    margin = BUFFER / EXTENT
+    minlon, minlat = get_lon_lat(z, x - margin, y + 1 + margin)
+    maxlon, maxlat = get_lon_lat(z, x + 1 + margin, y - margin)
+    envelope = Polygon.from_bbox((minlon, minlat, maxlon, maxlat))
+    envelope.srid = 4326
+    return envelope
+
+
+def get_tiles(z: int, extent: Tuple[float, float, float, float]) -> List[Tile]:
+    """
+    Return the tiles at zoom level ``z`` of which the area intersects ``extent``.
+    """
+    margin = BUFFER / EXTENT
+    minlon, minlat, maxlon, maxlat = extent
+    minx, miny = get_tile_xy(z, minlon, maxlat)
+    maxx, maxy = get_tile_xy(z, maxlon, minlat)
+
+    n = 2**z
+    xs = range(max(int(minx - margin), 0), min(int(maxx + margin), n - 1) + 1)
+    ys = range(max(int(miny - margin), 0), min(int(maxy + margin), n - 1) + 1)
+    return [(z, x, y) for x in xs for y in ys]
+
+
+def get_ancestors(z: int, x: int, y: int) -> Iterator[Tile]:
+    """
+    Return the tile and its ancestors from ``MIN_INVALIDATION_ZOOM`` up to
+    ``INVALIDATION_MAX_ZOOM``.
+    """
+    for level in range(MIN_INVALIDATION_ZOOM, min(z, INVALIDATION_MAX_ZOOM) + 1):
+        shift = z - level
+        yield (level, x >> shift, y >> shift)
+
+
+# the generation of all tiles, for the changes of which the area is unknown
+GENERATION_KEY = "tiles:generation"
+
+
+def get_generation_key(tile: Tile) -> str:
+    return "{}:{}/{}/{}".format(GENERATION_KEY, *tile)
+
+
+def get_fingerprint(authorizations: AuthorizationIndex) -> str:
+    """
+    Return a fingerprint of the zaken the authorizations give access to.
+    """
+    if authorizations.heeft_alle_autorisaties:
+        return "*"
+    max_orders = authorizations.get_max_orders(SCOPE_ZAKEN_ALLES_LEZEN)
+    return repr(sorted(max_orders.items()))
+
+
+def get_cache_key(request: Request, z: int, x: int, y: int) -> str:
+    cache = caches[CACHE_ALIAS]
+    keys = [
+        GENERATION_KEY,
+        *(get_generation_key(tile) for tile in get_ancestors(z, x, y)),
+    ]
+    generations = cache.get_many(keys)
+
+    bits = [
+        request.version,
+        get_fingerprint(request.jwt_auth.authorization_index),
+        repr(sorted(request.query_params.lists())),
+        f"{z}/{x}/{y}",
+        *(generations.get(key, "") for key in keys),
+    ]
+    digest = hashlib.sha1("\n".join(bits).encode()).hexdigest()
+    return f"tiles:{digest}"
+
+
+def generate_tile(
+    request: Request, queryset: QuerySet, z: int, x: int, y: int
+) -> bytes:
+    """
+    Generate the tile of the zaken in ``queryset`` in the database.
+    """
+    geometry = (
+        "zaakgeometrie_vereenvoudigd" if z <= SIMPLIFIED_MAX_ZOOM else "zaakgeometrie"
+    )
+    # the filtered zaken are selected by primary key - selecting the geometry
+    # in the queryset would convert it to EWKB
+    zaken = (
+        queryset.filter(zaakgeometrie_envelop__bboverlaps=get_tile_envelope(z, x, y))
+        .order_by()
+        .values("pk")
+    )
+    sql, params = zaken.query.sql_with_params()
+    opts = Zaak._meta
+
+    url = reverse("zaak-detail", kwargs={"uuid": URL_MARKER}, request=request)
+    prefix, suffix = url.split(URL_MARKER)
+
+    connection = connections[zaken.db]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            TILE_SQL.format(
+                geometry=opts.get_field(geometry).column,
+                table=connection.ops.quote_name(opts.db_table),
+                pk=opts.pk.column,
+                zaken=sql,
+            ),
+            [
+                LAYER,
+                EXTENT,
+                prefix,
+                suffix,
+                *get_tile_bounds(z, x, y),
+                EXTENT,
+                BUFFER,
+                *params,
+            ],
+        )
+        (tile,) = cursor.fetchone()
+    return bytes(tile) if tile is not None else b""
+
+
+def get_tile(request: Request, queryset: QuerySet, z: int, x: int, y: int) -> bytes:
+    cache = caches[CACHE_ALIAS]
+    cache_key = get_cache_key(request, z, x, y)
+    tile = cache.get(cache_key)
+    if tile is None:
+        tile = generate_tile(request, queryset, z, x, y)
+        timeout = COARSE_TILE_TIMEOUT if z < MIN_INVALIDATION_ZOOM else DEFAULT_TIMEOUT
+        cache.set(cache_key, tile, timeout)
+    return tile
+
+
+def get_invalidated_tiles(
+    extent: Tuple[float, float, float, float]
+) -> Optional[List[Tile]]:
+    """
+    Return the tiles to invalidate for a change within ``extent``, or ``None``
+    if ``extent`` is too large to invalidate per tile.
+    """
+    tiles = []
+    for z in range(MIN_INVALIDATION_ZOOM, INVALIDATION_MAX_ZOOM + 1):
+        covering = get_tiles(z, extent)
+        if len(covering) > MAX_INVALIDATED_TILES:
+            if z == MIN_INVALIDATION_ZOOM:
+                return None
+            # the deeper tiles are invalidated with their ancestors
+            break
+        tiles += covering
+    return tiles
+
+
+def invalidate_tiles(tiles: Optional[Iterable[Tile]]) -> None:
+    """
+    Invalidate the cached tiles ``tiles`` and their descendants, or all tiles
+    if ``tiles`` is ``None``.
+    """
+    if tiles is None:
+        keys = [GENERATION_KEY]
+    else:
+        keys = [get_generation_key(tile) for tile in tiles]
+    if not keys:
+        return
+
+    logger.debug("Invalidating the tiles %r", keys)
+    cache = caches[CACHE_ALIAS]
+
+    def replace_generations():
+        cache.set_many({key: uuid.uuid4().hex for key in keys})
+
+    replace_generations()
+    # and again after commit, so that a concurrent request can't cache a tile
+    # with the old geometries under the new generation in the meantime
+    transaction.on_commit(replace_generations)
+
+
+def invalidate(geometries: Iterable[Optional[GEOSGeometry]]) -> None:
+    """
+    Invalidate the cached tiles that (may) contain one of ``geometries``.
+    """
+    tiles = set()
+    for geometry in geometries:
+        if geometry is None or geometry.empty:
+            continue
+        invalidated = get_invalidated_tiles(geometry.extent)
+        if invalidated is None:
+            invalidate_tiles(None)
+            return
+        tiles.update(invalidated)
+    invalidate_tiles(tiles)
+
+
+def get_zaak_geometry(pk: int, using: str) -> Optional[GEOSGeometry]:
+    return (
+        Zaak._base_manager.using(using)
+        .filter(pk=pk)
+        .values_list("zaakgeometrie", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Zaak, dispatch_uid="api.invalidate_zaak_tiles")
+def invalidate_zaak(sender, instance: Zaak, created: bool, using: str, **kwargs):
+    # vng-api-common saves the ETag of the zaak after every change and on the
+    # first read after it, that doesn't change the tiles
+    if kwargs["update_fields"] == {"_etag"}:
+        return
+
+    # any change of the zaak (e.g. its vertrouwelijkheidaanduiding or
+    # einddatum) can add it to or remove it from the tiles of a filter
+    if "zaakgeometrie" not in instance.__dict__:
+        # a deferred geometry isn't saved, it's the one in the database
+        invalidate([get_zaak_geometry(instance.pk, using)])
+        return
+
+    geometry = instance.zaakgeometrie
+    if created:
+        invalidate([geometry])
+    elif hasattr(instance, "_loaded_zaakgeometrie"):
+        invalidate([instance._loaded_zaakgeometrie, geometry])
+    else:
+        # the geometry was set on an instance without it, the previous
+        # geometry is unknown
+        invalidate_tiles(None)
+
+    instance._loaded_zaakgeometrie = geometry
+
+
+@receiver(post_delete, sender=Zaak, dispatch_uid="api.invalidate_deleted_zaak_tiles")
+def invalidate_deleted_zaak(sender, instance: Zaak, **kwargs):
+    if "zaakgeometrie" in instance.__dict__:
+        invalidate([instance.zaakgeometrie])
+    else:
+        invalidate_tiles(None)
+
+
+@receiver(
+    [post_save, post_delete], sender=Status, dispatch_uid="api.invalidate_status_tiles"
+)
+@receiver([post_save, post_delete], sender=Rol, dispatch_uid="api.invalidate_rol_tiles")
+def invalidate_zaak_of(sender, instance, using: str, **kwargs):
+    if kwargs.get("update_fields") == {"_etag"}:
+        return
+
+    # the tiles can be filtered on the statussen and rollen of the zaken
+    invalidate([get_zaak_geometry(instance.zaak_id, using)])
@@ -5,7 +5,9 @@ from django.urls import include, path
 from vng_api_common import routers
 from vng_api_common.schema import SchemaView
 
+from .schema_artifacts import schema_view
 from .viewsets import (
+    ChangeViewSet,
     KlantContactViewSet,
     ResultaatViewSet,
     RolViewSet,
@@ -38,6 +40,7 @@ router.register("resultaten", ResultaatViewSet)
 router.register("zaakinformatieobjecten", ZaakInformatieObjectViewSet)
 router.register("zaakcontactmomenten", ZaakContactMomentViewSet)
 router.register("zaakverzoeken", ZaakVerzoekViewSet)
+router.register("_changes", ChangeViewSet)
 
 
 # TODO: the EndpointEnumerator seems to choke on path and re_path
@@ -50,7 +53,7 @@ urlpatterns = [
                 # API documentation
                 url(
                     r"^schema/openapi(?P<format>\.json|\.yaml)$",
-                    SchemaView.without_ui(cache_timeout=settings.SPEC_CACHE_TIMEOUT),
+                    schema_view,
                     name="schema-json",
                 ),
                 url(
@@ -1,14 +1,34 @@
+from typing import Sequence
+
 from django.conf import settings
+from django.contrib.gis.geos import Polygon
 from django.contrib.sites.models import Site
 
-from rest_framework.reverse import reverse
+from .hyperlinks import build_path
 
 
 def get_absolute_url(url_name: str, uuid: str) -> str:
-    path = reverse(
+    path = build_path(
         url_name,
-        kwargs={"version": settings.REST_FRAMEWORK["DEFAULT_VERSION"], "uuid": uuid},
+        {"version": settings.REST_FRAMEWORK["DEFAULT_VERSION"], "uuid": uuid},
     )
     domain = Site.objects.get_current().domain
     protocol = "https" if settings.IS_HTTPS else "http"
     return f"{protocol}://{domain}{path}"
+
+
+def get_bbox(coordinates: Sequence[float]) -> Polygon:
+    """
+    Return the rectangle ``minx, miny, maxx, maxy`` in WGS84.
+
+    :raises: ValueError if the coordinates do not describe a rectangle.
+    """
+    if len(coordinates) != 4:
+        raise ValueError("A bbox consists of 4 coordinates")
+    minx, miny, maxx, maxy = coordinates
+    if minx > maxx or miny > maxy:
+        raise ValueError("The minimum coordinates exceed the maximum coordinates")
+
+    bbox = Polygon.from_bbox(coordinates)
+    bbox.srid = 4326
+    return bbox
@@ -1,35 +1,36 @@
 import logging
+import uuid
+from functools import partial
+from types import SimpleNamespace
+from typing import Optional
 
 from django.core.cache import caches
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.translation import ugettext_lazy as _
 
 from rest_framework import mixins, serializers, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
-from rest_framework.filters import OrderingFilter
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
 from rest_framework.serializers import ValidationError
 from rest_framework.settings import api_settings
-from vng_api_common.audittrails.viewsets import (
-    AuditTrailCreateMixin,
-    AuditTrailDestroyMixin,
-    AuditTrailViewSet,
-    AuditTrailViewsetMixin,
-)
+from vng_api_common.audittrails.viewsets import AuditTrailViewSet
 from vng_api_common.caching import conditional_retrieve
 from vng_api_common.filters import Backend
 from vng_api_common.geo import GeoMixin
 from vng_api_common.notifications.kanalen import Kanaal
-from vng_api_common.notifications.viewsets import (
-    NotificationCreateMixin,
-    NotificationDestroyMixin,
-    NotificationViewSetMixin,
-)
-from vng_api_common.permissions import permission_class_factory
+from vng_api_common.permissions import AuthScopesRequired, permission_class_factory
 from vng_api_common.search import SearchMixin
 from vng_api_common.utils import lookup_kwargs_to_filters
 from vng_api_common.viewsets import CheckQueryParamsMixin, NestedViewSetMixin
 
+from zrc.audit.history import reconstruct
+from zrc.audit.models import AuditTrail
+from zrc.changes.feed import Position, get_changes, parse_token
+from zrc.changes.models import Change
+from zrc.datamodel.deletion import delete_zaken, get_zaken_to_delete
 from zrc.datamodel.models import (
     KlantContact,
     Resultaat,
@@ -42,14 +43,23 @@ from zrc.datamodel.models import (
     ZaakInformatieObject,
     ZaakObject,
 )
+from zrc.sync.deletion import sync_delete_zaak_relations
 from zrc.sync.signals import SyncError
 
-from .audits import AUDIT_ZRC
+from .audits import (
+    AUDIT_ZRC,
+    AuditTrailCreateMixin,
+    AuditTrailDestroyMixin,
+    AuditTrailViewsetMixin,
+)
 from .data_filtering import ListFilterByAuthorizationsMixin
+from .expand import conditional_retrieve_unexpanded, expand_zaken, get_expand
 from .filters import (
+    AuditTrailFilter,
     KlantContactFilter,
     ResultaatFilter,
     RolFilter,
+    StableOrderingFilter,
     StatusFilter,
     ZaakContactMomentFilter,
     ZaakFilter,
@@ -57,13 +67,22 @@ from .filters import (
     ZaakObjectFilter,
     ZaakVerzoekFilter,
 )
+from .geojson import GeoJSONMixin
 from .kanalen import KANAAL_ZAKEN
-from .mixins import ClosedZaakMixin
+from .mixins import ClosedZaakMixin, SparseFieldsetMixin
+from .notifications import (
+    NotificationCreateMixin,
+    NotificationDestroyMixin,
+    NotificationViewSetMixin,
+    record_cascaded_deletions,
+)
+from .pagination import AuditTrailPagination, ChangeFeedPagination
 from .permissions import (
     ZaakAuthScopesRequired,
     ZaakBaseAuthRequired,
     ZaakRelatedAuthScopesRequired,
 )
+from .renderers import MVTRenderer, NDJSONRenderer, render_line
 from .scopes import (
     SCOPE_STATUSSEN_TOEVOEGEN,
     SCOPE_ZAKEN_ALLES_LEZEN,
@@ -74,11 +93,14 @@ from .scopes import (
     SCOPEN_ZAKEN_HEROPENEN,
 )
 from .serializers import (
+    ChangeSerializer,
     KlantContactSerializer,
     ResultaatSerializer,
     RolSerializer,
     StatusSerializer,
     ZaakBesluitSerializer,
+    ZaakClusterParametersSerializer,
+    ZaakClusterSerializer,
     ZaakContactMomentSerializer,
     ZaakEigenschapSerializer,
     ZaakInformatieObjectSerializer,
@@ -88,17 +110,20 @@ from .serializers import (
     ZaakVerzoekSerializer,
     ZaakZoekSerializer,
 )
+from .tiles import get_cell_size, get_tile, is_valid_tile
 from .validators import ZaakBesluitValidator
 
 logger = logging.getLogger(__name__)
 
 
-@conditional_retrieve()
+@conditional_retrieve_unexpanded()
 class ZaakViewSet(
     NotificationViewSetMixin,
     AuditTrailViewsetMixin,
     GeoMixin,
     SearchMixin,
+    GeoJSONMixin,
+    SparseFieldsetMixin,
     CheckQueryParamsMixin,
     ListFilterByAuthorizationsMixin,
     viewsets.ModelViewSet,
@@ -136,6 +161,9 @@ class ZaakViewSet(
 
     Deze lijst kan gefilterd wordt met query-string parameters.
 
+    Met de query parameter `expand` worden gerelateerde resources direct in
+    `_expand` meegegeven.
+
     **Opmerking**
     - er worden enkel zaken getoond van de zaaktypes waar u toe geautoriseerd
       bent.
@@ -145,6 +173,9 @@ class ZaakViewSet(
 
     Een specifieke ZAAK opvragen.
 
+    Met de query parameter `expand` worden gerelateerde resources direct in
+    `_expand` meegegeven.
+
     update:
     Werk een ZAAK in zijn geheel bij.
 
@@ -208,20 +239,36 @@ class ZaakViewSet(
     - `klantcontact` - alle klantcontacten bij een zaak
     """
 
-    queryset = Zaak.objects.prefetch_related("deelzaken").order_by("-pk")
+    # the envelope and simplified geometry are only used in queries
+    queryset = Zaak.objects.defer(
+        "zaakgeometrie_envelop", "zaakgeometrie_vereenvoudigd"
+    ).order_by("-pk")
+    prefetch_fields = {"deelzaken": "deelzaken"}
+    defer_fields = ("zaakgeometrie",)
+    geojson_fields = {"zaakgeometrie": "zaakgeometrie_vereenvoudigd"}
     serializer_class = ZaakSerializer
     search_input_serializer_class = ZaakZoekSerializer
-    filter_backends = (Backend, OrderingFilter)
+    filter_backends = (Backend, StableOrderingFilter)
     filterset_class = ZaakFilter
-    ordering_fields = ("startdatum",)
+    # the orderings of the open zaken are backed by partial indexes
+    ordering_fields = (
+        "startdatum",
+        "einddatum_gepland",
+        "uiterlijke_einddatum_afdoening",
+        "registratiedatum",
+    )
     lookup_field = "uuid"
     pagination_class = PageNumberPagination
+    replica_actions = ("list", "retrieve", "_zoek", "tiles", "clusters")
+    filtered_actions = ("list", "tiles", "clusters")
 
     permission_classes = (ZaakAuthScopesRequired,)
     required_scopes = {
         "list": SCOPE_ZAKEN_ALLES_LEZEN,
         "retrieve": SCOPE_ZAKEN_ALLES_LEZEN,
         "_zoek": SCOPE_ZAKEN_ALLES_LEZEN,
+        "tiles": SCOPE_ZAKEN_ALLES_LEZEN,
+        "clusters": SCOPE_ZAKEN_ALLES_LEZEN,
         "create": SCOPE_ZAKEN_CREATE,
         "update": SCOPE_ZAKEN_BIJWERKEN | SCOPE_ZAKEN_GEFORCEERD_BIJWERKEN,
         "partial_update": SCOPE_ZAKEN_BIJWERKEN | SCOPE_ZAKEN_GEFORCEERD_BIJWERKEN,
@@ -230,6 +277,26 @@ class ZaakViewSet(
     notifications_kanaal = KANAAL_ZAKEN
     audit = AUDIT_ZRC
 
+    _expanded = None
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self._expanded is not None:
+            context["expanded"] = self._expanded
+        return context
+
+    def get_serializer(self, *args, **kwargs):
+        expand = get_expand(self.request) if self.action in ("list", "retrieve") else []
+        if not args or not expand:
+            return super().get_serializer(*args, **kwargs)
+
+        many = kwargs.get("many", False)
+        zaken = list(args[0]) if many else [args[0]]
+        self._expanded = expand_zaken(zaken, expand, self.request)
+
+        args = (zaken if many else zaken[0],) + args[1:]
+        return super().get_serializer(*args, **kwargs)
+
     @action(methods=("post",), detail=False)
     def _zoek(self, request, *args, **kwargs):
         """
@@ -243,7 +310,15 @@ class ZaakViewSet(
 
         for name, value in search_input.items():
             if name == "zaakgeometrie":
-                queryset = queryset.filter(zaakgeometrie__within=value["within"])
+                if "within" in value:
+                    queryset = queryset.within(value["within"])
+                if "intersects" in value:
+                    queryset = queryset.intersects(value["intersects"])
+                if "bbox" in value:
+                    queryset = queryset.in_bbox(value["bbox"])
+            elif name in ("zoekterm", "status__statustype"):
+                # applied by the filterset, which reads the request body
+                continue
             else:
                 queryset = queryset.filter(**{name: value})
 
@@ -251,6 +326,79 @@ class ZaakViewSet(
 
     _zoek.is_search_action = True
 
+    @action(
+        methods=("get",),
+        detail=False,
+        url_path=r"tiles/(?P<z>[0-9]+)/(?P<x>[0-9]+)/(?P<y>[0-9]+)\.pbf",
+        renderer_classes=(MVTRenderer,),
+    )
+    def tiles(self, request, z, x, y, *args, **kwargs):
+        """
+        Vraag een vector tile op met de geometrieën van ZAAKen.
+
+        De tile is een Mapbox Vector Tile in EPSG:3857 met de laag `zaken`,
+        met per ZAAK de `url`, `identificatie` en `zaaktype`. De ZAAKen kunnen
+        gefilterd worden met dezelfde query-string parameters als bij het
+        opvragen van alle ZAAKen.
+
+        **Opmerking**
+        - er worden enkel zaken getoond van de zaaktypes waar u toe geautoriseerd
+          bent.
+        """
+        z, x, y = int(z), int(x), int(y)
+        if not is_valid_tile(z, x, y):
+            raise Http404
+
+        self._check_query_params(request)
+        queryset = self.filter_queryset(self.get_queryset())
+        tile = get_tile(request, queryset, z, x, y)
+
+        self.headers["Content-Crs"] = "EPSG:3857"
+        return Response(tile)
+
+    @action(methods=("get",), detail=False)
+    def clusters(self, request, *args, **kwargs):
+        """
+        Tel de ZAAKen per cel van een raster op de kaart.
+
+        De grootte van de cellen hangt af van het zoomniveau, zodat een kaart
+        van bijvoorbeeld een hele stad aantallen per gebied kan tonen in plaats
+        van alle ZAAKen. De ZAAKen kunnen gefilterd worden met dezelfde
+        query-string parameters als bij het opvragen van alle ZAAKen, zoals
+        `zaakgeometrie__bbox` voor het zichtbare deel van de kaart.
+
+        **Opmerking**
+        - er worden enkel zaken getoond van de zaaktypes waar u toe geautoriseerd
+          bent.
+        """
+        parameters = ZaakClusterParametersSerializer(data=request.query_params)
+        parameters.is_valid(raise_exception=True)
+
+        query_params = request.query_params.copy()
+        for name in parameters.fields:
+            query_params.pop(name, None)
+        self._check_query_params(SimpleNamespace(query_params=query_params))
+
+        group = parameters.validated_data.get("groepering")
+        queryset = self.filter_queryset(self.get_queryset()).cluster(
+            get_cell_size(parameters.validated_data["zoom"]), group
+        )
+        clusters = [
+            {
+                "geometrie": cluster["geometrie"],
+                "aantal": cluster["aantal"],
+                "groep": cluster[group] if group else None,
+            }
+            for cluster in queryset
+        ]
+        return Response(ZaakClusterSerializer(clusters, many=True).data)
+
+    def perform_crs_negotation(self, request):
+        # vector tiles are always in web mercator
+        if self.action == "tiles":
+            return
+        super().perform_crs_negotation(request)
+
     def perform_update(self, serializer):
         """
         Perform the update of the Case.
@@ -284,14 +432,27 @@ class ZaakViewSet(
             raise serializers.ValidationError(
                 {api_settings.NON_FIELD_ERRORS_KEY: exc}, code=exc.detail[0].code
             )
-        else:
-            super().perform_destroy(instance)
+
+        # clean up the remote relations concurrently, then delete the local
+        # data with set-based queries instead of through the collector
+        zaken = get_zaken_to_delete(instance)
+        try:
+            sync_delete_zaak_relations([zaak.pk for zaak in zaken])
+        except SyncError as sync_error:
+            raise ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: sync_error.args[0]}
+            ) from sync_error
+
+        delete_zaken(
+            zaken, before_delete=partial(record_cascaded_deletions, self.request)
+        )
 
 
 @conditional_retrieve()
 class StatusViewSet(
     NotificationCreateMixin,
     AuditTrailCreateMixin,
+    SparseFieldsetMixin,
     CheckQueryParamsMixin,
     ListFilterByAuthorizationsMixin,
     mixins.CreateModelMixin,
@@ -331,6 +492,7 @@ class StatusViewSet(
     filterset_class = StatusFilter
     lookup_field = "uuid"
     pagination_class = PageNumberPagination
+    replica_actions = ("list", "retrieve")
 
     permission_classes = (ZaakRelatedAuthScopesRequired,)
     required_scopes = {
@@ -381,6 +543,7 @@ class StatusViewSet(
 
 class ZaakObjectViewSet(
     NotificationCreateMixin,
+    SparseFieldsetMixin,
     CheckQueryParamsMixin,
     ListFilterByAuthorizationsMixin,
     AuditTrailCreateMixin,
@@ -429,6 +592,7 @@ class ZaakObjectViewSet(
 class ZaakInformatieObjectViewSet(
     NotificationCreateMixin,
     AuditTrailViewsetMixin,
+    SparseFieldsetMixin,
     CheckQueryParamsMixin,
     ListFilterByAuthorizationsMixin,
     ClosedZaakMixin,
@@ -534,6 +698,7 @@ class ZaakEigenschapViewSet(
     NotificationCreateMixin,
     AuditTrailCreateMixin,
     NestedViewSetMixin,
+    SparseFieldsetMixin,
     ListFilterByAuthorizationsMixin,
     ClosedZaakMixin,
     mixins.CreateModelMixin,
@@ -595,6 +760,7 @@ class ZaakEigenschapViewSet(
 
 class KlantContactViewSet(
     NotificationCreateMixin,
+    SparseFieldsetMixin,
     ListFilterByAuthorizationsMixin,
     AuditTrailCreateMixin,
     ClosedZaakMixin,
@@ -653,6 +819,7 @@ class RolViewSet(
     NotificationDestroyMixin,
     AuditTrailCreateMixin,
     AuditTrailDestroyMixin,
+    SparseFieldsetMixin,
     CheckQueryParamsMixin,
     ListFilterByAuthorizationsMixin,
     ClosedZaakMixin,
@@ -690,6 +857,7 @@ class RolViewSet(
     filterset_class = RolFilter
     lookup_field = "uuid"
     pagination_class = PageNumberPagination
+    replica_actions = ("list", "retrieve")
 
     permission_classes = (ZaakRelatedAuthScopesRequired,)
     required_scopes = {
@@ -706,6 +874,7 @@ class RolViewSet(
 class ResultaatViewSet(
     NotificationViewSetMixin,
     AuditTrailViewsetMixin,
+    SparseFieldsetMixin,
     CheckQueryParamsMixin,
     ListFilterByAuthorizationsMixin,
     ClosedZaakMixin,
@@ -786,7 +955,49 @@ class ZaakAuditTrailViewSet(AuditTrailViewSet):
     Een specifieke audit trail regel opvragen.
     """
 
+    queryset = AuditTrail.objects.all()
+    filter_backends = (Backend,)
+    filterset_class = AuditTrailFilter
+    pagination_class = AuditTrailPagination
     main_resource_lookup_field = "zaak_uuid"
+    replica_actions = ("list", "retrieve")
+
+    def get_queryset(self):
+        identifier = self.kwargs.get(self.main_resource_lookup_field)
+        # DRF introspection
+        if not identifier:
+            return self.queryset.all()
+
+        try:
+            zaak_uuid = uuid.UUID(identifier)
+        except ValueError:
+            raise Http404
+
+        queryset = self.queryset.filter(hoofd_object_uuid=zaak_uuid)
+        if not queryset.exists():
+            raise Http404
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if not args:
+            return super().get_serializer(*args, **kwargs)
+
+        many = kwargs.get("many", False)
+        entries = list(args[0]) if many else [args[0]]
+        # the versions aren't loaded if the wijzigingen are left out
+        with_wijzigingen = not any(
+            "snapshot" in entry.get_deferred_fields() for entry in entries
+        )
+        if with_wijzigingen:
+            # the versions are stored compactly and reconstructed for the output
+            reconstruct(entries)
+
+        args = (entries if many else entries[0],) + args[1:]
+        serializer = super().get_serializer(*args, **kwargs)
+        if not with_wijzigingen:
+            fields = serializer.child.fields if many else serializer.fields
+            fields.pop("wijzigingen")
+        return serializer
 
 
 class ZaakBesluitViewSet(
@@ -794,6 +1005,7 @@ class ZaakBesluitViewSet(
     AuditTrailCreateMixin,
     AuditTrailDestroyMixin,
     NestedViewSetMixin,
+    SparseFieldsetMixin,
     ListFilterByAuthorizationsMixin,
     ClosedZaakMixin,
     mixins.CreateModelMixin,
@@ -889,6 +1101,7 @@ class ZaakContactMomentViewSet(
     AuditTrailCreateMixin,
     AuditTrailDestroyMixin,
     ListFilterByAuthorizationsMixin,
+    SparseFieldsetMixin,
     CheckQueryParamsMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -956,6 +1169,7 @@ class ZaakVerzoekViewSet(
     AuditTrailCreateMixin,
     AuditTrailDestroyMixin,
     ListFilterByAuthorizationsMixin,
+    SparseFieldsetMixin,
     CheckQueryParamsMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -1016,3 +1230,51 @@ class ZaakVerzoekViewSet(
             raise ValidationError(
                 {api_settings.NON_FIELD_ERRORS_KEY: sync_error.args[0]}
             ) from sync_error
+
+
+class ChangeViewSet(
+    ListFilterByAuthorizationsMixin, mixins.ListModelMixin, viewsets.GenericViewSet
+):
+    """
+    Opvragen van de wijzigingen in ZAAKen en hun deelresources.
+
+    list:
+    Alle aangemaakte, gewijzigde en verwijderde resources opvragen.
+
+    De wijzigingen worden in volgorde van de transacties teruggegeven. Geef
+    het `token` van de laatst verwerkte wijziging mee als `since` om alleen
+    de wijzigingen daarna op te vragen. Met de header
+    `Accept: application/x-ndjson` worden alle wijzigingen als newline
+    delimited JSON gestreamd, zonder paginering.
+    """
+
+    queryset = Change.objects.all()
+    serializer_class = ChangeSerializer
+    pagination_class = ChangeFeedPagination
+    renderer_classes = tuple(api_settings.DEFAULT_RENDERER_CLASSES) + (NDJSONRenderer,)
+    permission_classes = (AuthScopesRequired,)
+    required_scopes = {"list": SCOPE_ZAKEN_ALLES_LEZEN}
+
+    def get_since(self) -> Optional[Position]:
+        token = self.request.query_params.get("since")
+        if not token:
+            return None
+
+        since = parse_token(token)
+        if since is None:
+            raise ValidationError({"since": _("Ongeldig token.")}, code="invalid-token")
+        return since
+
+    def list(self, request, *args, **kwargs):
+        changes = get_changes(self.get_queryset(), self.get_since())
+
+        if isinstance(request.accepted_renderer, NDJSONRenderer):
+            lines = (
+                render_line(self.get_serializer(change).data)
+                for change in changes.iterator()
+            )
+            return StreamingHttpResponse(lines, content_type=NDJSONRenderer.media_type)
+
+        page = self.paginate_queryset(changes)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
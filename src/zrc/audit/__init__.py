@@ -0,0 +1,4 @@
+"""
+Store the audit trail compactly and write it after the change is committed.
+"""
+default_app_config = "zrc.audit.apps.AuditConfig"
@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import AuditTrail
+
+
+@admin.register(AuditTrail)
+class AuditTrailAdmin(admin.ModelAdmin):
+    list_display = ("resource_url", "sequence", "actie", "resultaat", "aanmaakdatum")
+    list_filter = ("actie", "resource")
+    search_fields = ("hoofd_object", "resource_url")
+    readonly_fields = ("snapshot", "diff", "diff_before", "checksum")
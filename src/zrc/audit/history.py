@@ -0,0 +1,321 @@
+"""
+Write and reconstruct the versions of resources in the audit trail.
+
+Every entry of a resource gets the next ``sequence`` number in the history of
+that resource. Creates, destroys and every ``SNAPSHOT_INTERVAL``-th entry store
+a snapshot of the full version; all other entries only store the fields that
+changed since the previous entry. Reconstructing a version therefore never
+needs more than ``SNAPSHOT_INTERVAL`` entries.
+
+Before old entries are removed (dropping an expired partition, see
+``manage.py manage_partitions``), :func:`rebase` turns the oldest remaining
+entry of each resource into a snapshot, so that the remaining history can
+still be reconstructed.
+
+The version after an update is the response the API already produced, the
+version before it is the previous version in the audit trail - the resource
+isn't serialized a second time to determine it. Unless the resource was
+changed outside of the audit trail (e.g. the einddatum of a zaak set by a new
+status, or in the admin): every entry stores a checksum of the editable fields
+of the database row, and if the row before an update doesn't match it, the
+version before the update is serialized after all. The fields changed in the
+meantime are stored in ``diff_before``.
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime
+from functools import reduce
+from operator import or_
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, models, transaction
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+from vng_api_common.constants import CommonResourceAction
+
+from .models import AuditTrail
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_INTERVAL = 20
+
+Version = Optional[dict]
+
+
+def normalize(data) -> Version:
+    """
+    Convert serializer output to what is read back from the database.
+    """
+    if data is None:
+        return None
+    return json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+
+
+def get_diff(old: dict, new: dict) -> dict:
+    return {key: value for key, value in new.items() if old.get(key) != value}
+
+
+def get_checksum(instance: models.Model) -> str:
+    """
+    Return the checksum of the (loaded) editable fields of ``instance``.
+
+    The fields that aren't editable are maintained by vng-api-common (the ETag,
+    which changes on reads) or by the database (the search vector and derived
+    geometries), and aren't up to date on an instance that was just saved.
+    """
+    deferred = instance.get_deferred_fields()
+    values = {}
+    for field in instance._meta.concrete_fields:
+        if not field.editable or field.attname in deferred:
+            continue
+        value = field.value_from_object(instance)
+        if isinstance(value, datetime) and timezone.is_aware(value):
+            # as read back from the database
+            value = value.astimezone(timezone.utc)
+        values[field.attname] = value
+    encoded = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def get_latest_checksum(url: str) -> Optional[str]:
+    return (
+        AuditTrail.objects.filter(resource_url=url)
+        .order_by("-sequence")
+        .values_list("checksum", flat=True)
+        .first()
+    )
+
+
+def is_snapshot(entry: AuditTrail) -> bool:
+    return entry.snapshot is not None
+
+
+def _get_snapshot_start(sequence: int) -> int:
+    return sequence - sequence % SNAPSHOT_INTERVAL
+
+
+class History:
+    """
+    The (partially loaded) history of a set of resources.
+    """
+
+    def __init__(self, entries: Iterable[AuditTrail] = ()):
+        self.entries = {}
+        self._versions = {}
+        self.add(entries)
+
+    def add(self, entries: Iterable[AuditTrail]) -> None:
+        for entry in entries:
+            self.entries.setdefault((entry.resource_url, entry.sequence), entry)
+
+    def load(self, ranges: Dict[str, Tuple[int, int]]) -> None:
+        """
+        Load the entries within the (inclusive) sequence ranges per resource.
+        """
+        missing = [
+            Q(resource_url=url, sequence__gte=start, sequence__lte=end)
+            for url, (start, end) in ranges.items()
+            if any(
+                (url, sequence) not in self.entries
+                for sequence in range(start, end + 1)
+            )
+        ]
+        if missing:
+            self.add(AuditTrail.objects.filter(reduce(or_, missing)))
+
+    def get_version(self, url: str, sequence: int) -> Version:
+        """
+        Reconstruct the version of the resource after the entry ``sequence``.
+        """
+        key = (url, sequence)
+        if key in self._versions:
+            return self._versions[key]
+
+        # walk back to the nearest snapshot, then apply the diffs forwards
+        chain = []
+        while sequence >= 0 and (url, sequence) not in self._versions:
+            entry = self.entries.get((url, sequence))
+            if entry is None:
+                logger.warning("Missing audit trail entry %d of %s", sequence, url)
+                break
+            chain.append(entry)
+            if is_snapshot(entry):
+                break
+            sequence -= 1
+
+        version = self._versions.get((url, sequence))
+        for entry in reversed(chain):
+            if entry.actie == CommonResourceAction.destroy:
+                version = None
+            elif is_snapshot(entry):
+                version = entry.snapshot
+            else:
+                version = {**(version or {}), **(entry.diff_before or {}), **entry.diff}
+            self._versions[(url, entry.sequence)] = version
+
+        return self._versions.get(key)
+
+
+def reconstruct(entries: List[AuditTrail]) -> List[AuditTrail]:
+    """
+    Set the full ``oud`` and ``nieuw`` versions on the ``entries``.
+    """
+    ranges = {}
+    for entry in entries:
+        start = _get_snapshot_start(max(entry.sequence - 1, 0))
+        current = ranges.get(entry.resource_url, (start, entry.sequence))
+        ranges[entry.resource_url] = (
+            min(current[0], start),
+            max(current[1], entry.sequence),
+        )
+
+    history = History(entries)
+    history.load(ranges)
+
+    for entry in entries:
+        if entry.actie == CommonResourceAction.destroy:
+            entry.oud, entry.nieuw = entry.snapshot, None
+            continue
+
+        previous = (entry.resource_url, entry.sequence - 1)
+        # the previous entries are gone once their partition expired
+        if entry.actie != CommonResourceAction.create and previous in history.entries:
+            entry.oud = history.get_version(*previous)
+            if entry.diff_before:
+                entry.oud = {**(entry.oud or {}), **entry.diff_before}
+        entry.nieuw = history.get_version(entry.resource_url, entry.sequence)
+
+    return entries
+
+
+def _load_latest(urls: Iterable[str]) -> Dict[str, Tuple[int, Version]]:
+    latest = dict(
+        AuditTrail.objects.filter(resource_url__in=urls)
+        .values_list("resource_url")
+        .annotate(Max("sequence"))
+    )
+    history = History()
+    history.load(
+        {
+            url: (_get_snapshot_start(sequence), sequence)
+            for url, sequence in latest.items()
+        }
+    )
+    return {
+        url: (sequence, history.get_version(url, sequence))
+        for url, sequence in latest.items()
+    }
+
+
+def _prepare(entries: List[AuditTrail]) -> None:
+    latest = _load_latest({entry.resource_url for entry in entries})
+
+    for entry in entries:
+        previous_sequence, previous = latest.get(entry.resource_url, (-1, None))
+        entry.sequence = previous_sequence + 1
+        entry.snapshot = entry.diff = entry.diff_before = None
+
+        # the version before the update, if it was changed outside of the
+        # audit trail
+        before = normalize(getattr(entry, "version_before", None))
+        if before is None or before == previous:
+            before = previous
+        else:
+            entry.diff_before = get_diff(previous or {}, before)
+
+        version = normalize(entry.version)
+        if entry.actie == CommonResourceAction.destroy:
+            # the version before the destroy
+            entry.snapshot = version
+            version = None
+        elif (
+            previous is None
+            or entry.actie == CommonResourceAction.create
+            or entry.sequence % SNAPSHOT_INTERVAL == 0
+        ):
+            entry.snapshot = version
+        else:
+            entry.diff = get_diff(before, version)
+
+        latest[entry.resource_url] = (entry.sequence, version)
+
+
+def write_entries(entries: List[AuditTrail]) -> None:
+    """
+    Store ``entries`` in one go.
+
+    The entries must have the full version of the resource set as ``version``:
+    the version after the action, or before it for a destroy. An update can
+    have the version before it set as ``version_before``, if it may differ
+    from the previous version in the audit trail.
+    """
+    with transaction.atomic():
+        _lock({entry.resource_url for entry in entries})
+        _prepare(entries)
+        AuditTrail.objects.bulk_create(entries)
+
+
+def _lock(urls: Iterable[str]) -> None:
+    # concurrent writes for a resource would claim the same sequence number,
+    # which the partitioned table can't prevent with a unique constraint. The
+    # locks are taken in a fixed order to avoid deadlocks.
+    with connection.cursor() as cursor:
+        for url in sorted(urls):
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [url])
+
+
+def rebase(before: datetime, batch_size: int = 1000) -> int:
+    """
+    Store the oldest entry from ``before`` on of every resource with older
+    entries as a snapshot.
+
+    Must run in the same transaction that removes the entries older than
+    ``before``. Returns the number of entries that were rebased.
+    """
+    oldest = (
+        AuditTrail.objects.filter(
+            aanmaakdatum__gte=before,
+            resource_url__in=AuditTrail.objects.filter(aanmaakdatum__lt=before).values(
+                "resource_url"
+            ),
+        )
+        .values_list("resource_url")
+        .annotate(Min("sequence"))
+        .order_by()
+    )
+
+    rebased = 0
+    batch = []
+    for item in oldest.iterator():
+        batch.append(item)
+        if len(batch) == batch_size:
+            rebased += _rebase(dict(batch))
+            batch = []
+    if batch:
+        rebased += _rebase(dict(batch))
+    return rebased
+
+
+def _rebase(oldest: Dict[str, int]) -> int:
+    history = History()
+    history.load(
+        {
+            url: (_get_snapshot_start(sequence), sequence)
+            for url, sequence in oldest.items()
+        }
+    )
+
+    entries = []
+    for url, sequence in oldest.items():
+        entry = history.entries[(url, sequence)]
+        if is_snapshot(entry):
+            continue
+        entry.snapshot = history.get_version(url, sequence)
+        entry.diff = None
+        entries.append(entry)
+
+    AuditTrail.objects.bulk_update(entries, ["snapshot", "diff"])
+    return len(entries)
@@ -0,0 +1,101 @@
+import uuid
+
+import django.contrib.postgres.fields.jsonb
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="AuditTrail",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "uuid",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        help_text="Unieke identificatie van de audit regel.",
+                        unique=True,
+                    ),
+                ),
+                ("logrecord_id", models.CharField(blank=True, max_length=255)),
+                (
+                    "bron",
+                    models.CharField(
+                        choices=[
+                            ("ac", "Autorisaties API"),
+                            ("nrc", "Notificaties API"),
+                            ("zrc", "Zaken API"),
+                            ("ztc", "Catalogi API"),
+                            ("drc", "Documenten API"),
+                            ("brc", "Besluiten API"),
+                            ("cmc", "Contactmomenten API"),
+                            ("kc", "Klanten API"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("actie", models.CharField(max_length=50)),
+                ("actie_weergave", models.CharField(blank=True, max_length=200)),
+                ("resultaat", models.IntegerField()),
+                ("hoofd_object", models.URLField(max_length=1000)),
+                ("resource", models.CharField(max_length=50)),
+                ("resource_url", models.URLField(max_length=1000)),
+                (
+                    "aanmaakdatum",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("resource_weergave", models.CharField(max_length=200)),
+                ("applicatie_id", models.CharField(blank=True, max_length=100)),
+                ("applicatie_weergave", models.CharField(blank=True, max_length=200)),
+                ("gebruikers_id", models.CharField(blank=True, max_length=255)),
+                ("gebruikers_weergave", models.CharField(blank=True, max_length=255)),
+                ("toelichting", models.TextField(blank=True)),
+                (
+                    "sequence",
+                    models.PositiveIntegerField(
+                        help_text="The position of the entry in the history of the resource.",
+                        verbose_name="sequence",
+                    ),
+                ),
+                (
+                    "snapshot",
+                    django.contrib.postgres.fields.jsonb.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        help_text="The full version of the resource after the action, or before it for a destroy.",
+                        null=True,
+                        verbose_name="snapshot",
+                    ),
+                ),
+                (
+                    "diff",
+                    django.contrib.postgres.fields.jsonb.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        help_text="The fields that changed compared to the previous version.",
+                        null=True,
+                        verbose_name="diff",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "audit trail",
+                "verbose_name_plural": "audit trails",
+                "unique_together": {("resource_url", "sequence")},
+            },
+        )
+    ]
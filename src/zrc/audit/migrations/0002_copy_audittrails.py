@@ -0,0 +1,63 @@
+from django.db import migrations
+
+FIELDS = (
+    "uuid",
+    "logrecord_id",
+    "bron",
+    "actie",
+    "actie_weergave",
+    "resultaat",
+    "hoofd_object",
+    "resource",
+    "resource_url",
+    "aanmaakdatum",
+    "resource_weergave",
+    "applicatie_id",
+    "applicatie_weergave",
+    "gebruikers_id",
+    "gebruikers_weergave",
+    "toelichting",
+)
+
+BATCH_SIZE = 500
+
+
+def copy_audittrails(apps, _):
+    """
+    Copy the existing audit trail, storing every version as a snapshot.
+    """
+    LegacyAuditTrail = apps.get_model("audittrails", "AuditTrail")
+    AuditTrail = apps.get_model("audit", "AuditTrail")
+
+    legacy = LegacyAuditTrail.objects.order_by("resource_url", "aanmaakdatum", "pk")
+
+    batch = []
+    resource_url, sequence = None, 0
+    for trail in legacy.iterator():
+        if trail.resource_url != resource_url:
+            resource_url, sequence = trail.resource_url, 0
+        else:
+            sequence += 1
+
+        batch.append(
+            AuditTrail(
+                sequence=sequence,
+                snapshot=trail.nieuw if trail.nieuw is not None else trail.oud,
+                **{field: getattr(trail, field) for field in FIELDS},
+            )
+        )
+        if len(batch) == BATCH_SIZE:
+            AuditTrail.objects.bulk_create(batch)
+            batch = []
+
+    AuditTrail.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audit", "0001_initial"),
+        ("audittrails", "0014_auto_20201221_0905"),
+    ]
+
+    operations = [migrations.RunPython(copy_audittrails, migrations.RunPython.noop)]
@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+from vng_api_common.utils import get_uuid_from_path
+
+
+def set_hoofd_object_uuid(apps, _):
+    AuditTrail = apps.get_model("audit", "AuditTrail")
+
+    hoofd_objects = AuditTrail.objects.values_list("hoofd_object", flat=True)
+    for hoofd_object in hoofd_objects.distinct():
+        AuditTrail.objects.filter(hoofd_object=hoofd_object).update(
+            hoofd_object_uuid=get_uuid_from_path(hoofd_object)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("audit", "0002_copy_audittrails")]
+
+    operations = [
+        migrations.AddField(
+            model_name="audittrail",
+            name="hoofd_object_uuid",
+            field=models.UUIDField(
+                help_text="The UUID of the main object, to look up its audit trail.",
+                null=True,
+                verbose_name="hoofd object UUID",
+            ),
+        ),
+        migrations.RunPython(set_hoofd_object_uuid, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="audittrail",
+            name="hoofd_object_uuid",
+            field=models.UUIDField(
+                help_text="The UUID of the main object, to look up its audit trail.",
+                verbose_name="hoofd object UUID",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="audittrail",
+            index=models.Index(
+                fields=["hoofd_object_uuid", "aanmaakdatum", "id"],
+                name="audit_hoofd_object_idx",
+            ),
+        ),
+    ]
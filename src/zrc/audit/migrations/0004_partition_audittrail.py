@@ -0,0 +1,19 @@
+from django.db import migrations
+
+from zrc.utils.partitioning import partition_table
+
+
+def partition_audittrail(apps, schema_editor):
+    partition_table(
+        schema_editor.connection, "audit_audittrail", "aanmaakdatum", "month"
+    )
+
+
+class Migration(migrations.Migration):
+
+    # the indexes are built concurrently, outside of a transaction
+    atomic = False
+
+    dependencies = [("audit", "0003_audittrail_hoofd_object_uuid")]
+
+    operations = [migrations.RunPython(partition_audittrail, migrations.RunPython.noop)]
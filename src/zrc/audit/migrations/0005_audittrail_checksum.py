@@ -0,0 +1,31 @@
+import django.contrib.postgres.fields.jsonb
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("audit", "0004_partition_audittrail")]
+
+    operations = [
+        migrations.AddField(
+            model_name="audittrail",
+            name="diff_before",
+            field=django.contrib.postgres.fields.jsonb.JSONField(
+                encoder=django.core.serializers.json.DjangoJSONEncoder,
+                help_text="The fields that changed outside of the audit trail before the action, compared to the previous version.",
+                null=True,
+                verbose_name="diff before",
+            ),
+        ),
+        migrations.AddField(
+            model_name="audittrail",
+            name="checksum",
+            field=models.CharField(
+                blank=True,
+                help_text="The checksum of the database row of the resource after the action, to detect changes outside of the audit trail.",
+                max_length=64,
+                verbose_name="checksum",
+            ),
+        ),
+    ]
@@ -0,0 +1,106 @@
+import uuid
+
+from django.contrib.postgres.fields import JSONField
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+
+from vng_api_common.constants import ComponentTypes
+
+
+class AuditTrail(models.Model):
+    """
+    An audit trail entry, with the versions of the resource stored compactly.
+
+    The counterpart of :class:`vng_api_common.audittrails.models.AuditTrail`.
+    Instead of the full ``oud`` and ``nieuw`` versions of the resource, an
+    entry stores either a snapshot of the full version or the fields that
+    changed compared to the previous entry of the same resource. The
+    ``wijzigingen`` are reconstructed on read, see :mod:`zrc.audit.history`.
+    """
+
+    uuid = models.UUIDField(
+        unique=True,
+        default=uuid.uuid4,
+        help_text=_("Unieke identificatie van de audit regel."),
+    )
+    logrecord_id = models.CharField(max_length=255, blank=True)
+    bron = models.CharField(max_length=50, choices=ComponentTypes.choices)
+    actie = models.CharField(max_length=50)
+    actie_weergave = models.CharField(max_length=200, blank=True)
+    resultaat = models.IntegerField()
+    hoofd_object = models.URLField(max_length=1000)
+    hoofd_object_uuid = models.UUIDField(
+        _("hoofd object UUID"),
+        help_text=_("The UUID of the main object, to look up its audit trail."),
+    )
+    resource = models.CharField(max_length=50)
+    resource_url = models.URLField(max_length=1000)
+    aanmaakdatum = models.DateTimeField(default=timezone.now)
+    resource_weergave = models.CharField(max_length=200)
+    applicatie_id = models.CharField(max_length=100, blank=True)
+    applicatie_weergave = models.CharField(max_length=200, blank=True)
+    gebruikers_id = models.CharField(max_length=255, blank=True)
+    gebruikers_weergave = models.CharField(max_length=255, blank=True)
+    toelichting = models.TextField(blank=True)
+
+    sequence = models.PositiveIntegerField(
+        _("sequence"),
+        help_text=_("The position of the entry in the history of the resource."),
+    )
+    snapshot = JSONField(
+        _("snapshot"),
+        null=True,
+        encoder=DjangoJSONEncoder,
+        help_text=_(
+            "The full version of the resource after the action, or before it "
+            "for a destroy."
+        ),
+    )
+    diff = JSONField(
+        _("diff"),
+        null=True,
+        encoder=DjangoJSONEncoder,
+        help_text=_("The fields that changed compared to the previous version."),
+    )
+    diff_before = JSONField(
+        _("diff before"),
+        null=True,
+        encoder=DjangoJSONEncoder,
+        help_text=_(
+            "The fields that changed outside of the audit trail before the "
+            "action, compared to the previous version."
+        ),
+    )
+    checksum = models.CharField(
+        _("checksum"),
+        max_length=64,
+        blank=True,
+        help_text=_(
+            "The checksum of the database row of the resource after the action, "
+            "to detect changes outside of the audit trail."
+        ),
+    )
+
+    # set when the versions are reconstructed
+    oud = None
+    nieuw = None
+
+    class Meta:
+        verbose_name = _("audit trail")
+        verbose_name_plural = _("audit trails")
+        unique_together = ("resource_url", "sequence")
+        indexes = [
+            models.Index(
+                fields=["hoofd_object_uuid", "aanmaakdatum", "id"],
+                name="audit_hoofd_object_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.actie} {self.resource_url}"
+
+    @property
+    def wijzigingen(self) -> dict:
+        return {"oud": self.oud, "nieuw": self.nieuw}
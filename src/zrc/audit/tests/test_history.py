@@ -0,0 +1,212 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from zrc.datamodel.models import Status, Zaak
+from zrc.datamodel.tests.factories import StatusFactory, ZaakFactory
+
+from ..history import (
+    SNAPSHOT_INTERVAL,
+    get_checksum,
+    rebase,
+    reconstruct,
+    write_entries,
+)
+from ..models import AuditTrail
+
+ZAAK_UUID = "d4d50a7f-e3e5-4d2f-8d0b-5c1b9a5b4f2e"
+ZAAK = f"http://testserver/api/v1/zaken/{ZAAK_UUID}"
+ROL = "http://testserver/api/v1/rollen/1"
+
+
+def build_entry(actie: str, version: dict, resource_url: str = ZAAK) -> AuditTrail:
+    entry = AuditTrail(
+        bron="ZRC",
+        actie=actie,
+        resultaat=200,
+        hoofd_object=ZAAK,
+        hoofd_object_uuid=ZAAK_UUID,
+        resource="zaak",
+        resource_url=resource_url,
+        resource_weergave="ZAAK-1",
+    )
+    entry.version = version
+    return entry
+
+
+class WriteEntriesTests(TestCase):
+    def test_updates_store_changed_fields(self):
+        write_entries([build_entry("create", {"url": ZAAK, "a": 1, "b": 1})])
+        write_entries([build_entry("partial_update", {"url": ZAAK, "a": 1, "b": 2})])
+
+        create, update = AuditTrail.objects.order_by("sequence")
+
+        self.assertEqual(create.sequence, 0)
+        self.assertEqual(create.snapshot, {"url": ZAAK, "a": 1, "b": 1})
+        self.assertIsNone(create.diff)
+        self.assertEqual(update.sequence, 1)
+        self.assertIsNone(update.snapshot)
+        self.assertEqual(update.diff, {"b": 2})
+
+    def test_batch_with_several_versions_of_a_resource(self):
+        write_entries(
+            [
+                build_entry("create", {"url": ZAAK, "a": 1}),
+                build_entry("update", {"url": ZAAK, "a": 2}),
+                build_entry("create", {"url": ROL}, resource_url=ROL),
+            ]
+        )
+
+        update = AuditTrail.objects.get(actie="update")
+        self.assertEqual(update.sequence, 1)
+        self.assertEqual(update.diff, {"a": 2})
+        self.assertEqual(AuditTrail.objects.get(resource_url=ROL).sequence, 0)
+
+    def test_periodic_snapshot(self):
+        write_entries([build_entry("create", {"url": ZAAK, "a": 0})])
+        write_entries(
+            [
+                build_entry("update", {"url": ZAAK, "a": i})
+                for i in range(1, SNAPSHOT_INTERVAL + 1)
+            ]
+        )
+
+        snapshots = AuditTrail.objects.filter(snapshot__isnull=False)
+        self.assertEqual(
+            list(snapshots.values_list("sequence", flat=True).order_by("sequence")),
+            [0, SNAPSHOT_INTERVAL],
+        )
+
+    def test_destroy_stores_previous_version(self):
+        write_entries([build_entry("create", {"url": ROL}, resource_url=ROL)])
+        write_entries([build_entry("destroy", {"url": ROL}, resource_url=ROL)])
+
+        destroy = AuditTrail.objects.get(actie="destroy")
+        self.assertEqual(destroy.snapshot, {"url": ROL})
+
+
+class ReconstructTests(TestCase):
+    def test_reconstruct_history(self):
+        write_entries(
+            [build_entry("create", {"url": ZAAK, "a": 0})]
+            + [
+                build_entry("update", {"url": ZAAK, "a": i})
+                for i in range(1, SNAPSHOT_INTERVAL + 5)
+            ]
+        )
+
+        entries = reconstruct(list(AuditTrail.objects.order_by("sequence")))
+
+        self.assertIsNone(entries[0].oud)
+        self.assertEqual(entries[0].nieuw, {"url": ZAAK, "a": 0})
+        for i, entry in enumerate(entries[1:], start=1):
+            self.assertEqual(entry.oud, {"url": ZAAK, "a": i - 1})
+            self.assertEqual(entry.nieuw, {"url": ZAAK, "a": i})
+
+    def test_reconstruct_loads_previous_entries(self):
+        write_entries(
+            [build_entry("create", {"url": ZAAK, "a": 0, "b": 0})]
+            + [
+                build_entry("partial_update", {"url": ZAAK, "a": i, "b": 0})
+                for i in range(1, 4)
+            ]
+        )
+
+        with self.assertNumQueries(2):
+            entry = AuditTrail.objects.get(sequence=3)
+            reconstruct([entry])
+
+        self.assertEqual(entry.oud, {"url": ZAAK, "a": 2, "b": 0})
+        self.assertEqual(entry.nieuw, {"url": ZAAK, "a": 3, "b": 0})
+
+    def test_reconstruct_change_outside_of_audit_trail(self):
+        write_entries([build_entry("create", {"url": ZAAK, "a": 0, "b": 0})])
+        update = build_entry("partial_update", {"url": ZAAK, "a": 1, "b": 1})
+        update.version_before = {"url": ZAAK, "a": 0, "b": 1}
+        write_entries([update])
+
+        create, update = reconstruct(list(AuditTrail.objects.order_by("sequence")))
+
+        self.assertEqual(update.diff_before, {"b": 1})
+        self.assertEqual(update.diff, {"a": 1})
+        self.assertEqual(update.oud, {"url": ZAAK, "a": 0, "b": 1})
+        self.assertEqual(update.nieuw, {"url": ZAAK, "a": 1, "b": 1})
+
+    def test_reconstruct_destroy(self):
+        write_entries(
+            [
+                build_entry("create", {"url": ROL}, resource_url=ROL),
+                build_entry("destroy", {"url": ROL}, resource_url=ROL),
+            ]
+        )
+
+        create, destroy = reconstruct(list(AuditTrail.objects.order_by("sequence")))
+
+        self.assertEqual(create.nieuw, {"url": ROL})
+        self.assertEqual(destroy.oud, {"url": ROL})
+        self.assertIsNone(destroy.nieuw)
+
+
+class RebaseTests(TestCase):
+    def test_history_reconstructed_after_removing_old_entries(self):
+        cutoff = timezone.now() - timedelta(days=30)
+        old_entries = [build_entry("create", {"url": ZAAK, "a": 0, "b": 0})] + [
+            build_entry("partial_update", {"url": ZAAK, "a": i, "b": 0})
+            for i in range(1, 4)
+        ]
+        for entry in old_entries:
+            entry.aanmaakdatum = cutoff - timedelta(days=1)
+        write_entries(old_entries)
+        write_entries(
+            [
+                build_entry("partial_update", {"url": ZAAK, "a": 3, "b": i})
+                for i in range(1, 3)
+            ]
+        )
+
+        rebased = rebase(cutoff)
+        AuditTrail.objects.filter(aanmaakdatum__lt=cutoff).delete()
+
+        self.assertEqual(rebased, 1)
+        first, second = reconstruct(list(AuditTrail.objects.order_by("sequence")))
+        self.assertEqual(first.snapshot, {"url": ZAAK, "a": 3, "b": 1})
+        self.assertIsNone(first.diff)
+        self.assertIsNone(first.oud)
+        self.assertEqual(first.nieuw, {"url": ZAAK, "a": 3, "b": 1})
+        self.assertEqual(second.oud, {"url": ZAAK, "a": 3, "b": 1})
+        self.assertEqual(second.nieuw, {"url": ZAAK, "a": 3, "b": 2})
+
+    def test_resources_without_old_entries_untouched(self):
+        write_entries([build_entry("create", {"url": ROL}, resource_url=ROL)])
+        write_entries([build_entry("update", {"url": ROL, "a": 1}, resource_url=ROL)])
+
+        rebased = rebase(timezone.now() - timedelta(days=30))
+
+        self.assertEqual(rebased, 0)
+        update = AuditTrail.objects.get(actie="update")
+        self.assertIsNone(update.snapshot)
+        self.assertEqual(update.diff, {"a": 1})
+
+
+class ChecksumTests(TestCase):
+    def test_derived_fields_ignored(self):
+        zaak = ZaakFactory.create()
+        checksum = get_checksum(zaak)
+
+        zaak.calculate_etag_value()
+        self.assertEqual(get_checksum(Zaak.objects.get(pk=zaak.pk)), checksum)
+
+        zaak.toelichting = "gewijzigd"
+        self.assertNotEqual(get_checksum(zaak), checksum)
+
+    def test_saved_instance_matches_database(self):
+        status = StatusFactory.create(
+            datum_status_gezet=timezone.now().astimezone(
+                timezone.get_fixed_timezone(60)
+            )
+        )
+
+        self.assertEqual(
+            get_checksum(Status.objects.get(pk=status.pk)), get_checksum(status)
+        )
@@ -0,0 +1,4 @@
+"""
+Record every change to zaken and their sub-resources for the change feed.
+"""
+default_app_config = "zrc.changes.apps.ChangesConfig"
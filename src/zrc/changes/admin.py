@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import Change
+
+
+@admin.register(Change)
+class ChangeAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "resource", "timestamp")
+    list_filter = ("type", "resource")
+    search_fields = ("resource_url", "hoofd_object")
@@ -0,0 +1,7 @@
+from djchoices import ChoiceItem, DjangoChoices
+
+
+class ChangeTypes(DjangoChoices):
+    created = ChoiceItem("created", "Created")
+    updated = ChoiceItem("updated", "Updated")
+    deleted = ChoiceItem("deleted", "Deleted")
@@ -0,0 +1,89 @@
+"""
+Write and read the change feed.
+
+Every change is tagged with the ID of the transaction that made it. Transaction
+IDs are handed out when a transaction starts, not when it commits, so a change
+with a lower transaction ID can become visible after changes with a higher
+one. The feed therefore only exposes the changes of transactions older than
+the oldest transaction that is still running: those can't be followed by any
+change with a lower ``(transaction_id, id)`` anymore, which makes that pair a
+stable position in the feed.
+"""
+import re
+from typing import List, Optional, Tuple
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from vng_api_common.constants import CommonResourceAction
+
+from .constants import ChangeTypes
+from .models import Change, ChangeQuerySet
+
+TOKEN_RE = re.compile(r"^(?P<transaction_id>\d+)-(?P<id>\d+)$")
+
+Position = Tuple[int, int]
+
+
+def parse_token(token: str) -> Optional[Position]:
+    match = TOKEN_RE.match(token)
+    if match is None:
+        return None
+    return int(match.group("transaction_id")), int(match.group("id"))
+
+
+def get_change_type(actie: str) -> str:
+    if actie == CommonResourceAction.create:
+        return ChangeTypes.created
+    if actie == CommonResourceAction.destroy:
+        return ChangeTypes.deleted
+    return ChangeTypes.updated
+
+
+def record_change(message: dict) -> None:
+    """
+    Record the change described by a notification message.
+    """
+    kenmerken = message["kenmerken"]
+    Change.objects.create(
+        transaction_id=RawSQL("txid_current()", []),
+        resource=message["resource"],
+        resource_url=message["resourceUrl"],
+        hoofd_object=message["hoofdObject"],
+        type=get_change_type(message["actie"]),
+        zaaktype=kenmerken["zaaktype"],
+        vertrouwelijkheidaanduiding=kenmerken["vertrouwelijkheidaanduiding"],
+    )
+
+
+def record_deletions(changes: List[Change]) -> None:
+    """
+    Record the deletion of the resources of the (unsaved) ``changes`` at once.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT txid_current()")
+        (transaction_id,) = cursor.fetchone()
+
+    for change in changes:
+        change.transaction_id = transaction_id
+        change.type = ChangeTypes.deleted
+    Change.objects.bulk_create(changes)
+
+
+def get_changes(
+    queryset: ChangeQuerySet, since: Optional[Position] = None
+) -> ChangeQuerySet:
+    """
+    The committed changes after the position ``since``, in feed order.
+    """
+    queryset = queryset.filter(
+        transaction_id__lt=RawSQL("txid_snapshot_xmin(txid_current_snapshot())", [])
+    )
+    if since is not None:
+        transaction_id, pk = since
+        queryset = queryset.filter(
+            Q(transaction_id__gt=transaction_id)
+            | Q(transaction_id=transaction_id, id__gt=pk)
+        )
+    return queryset.order_by("transaction_id", "id")
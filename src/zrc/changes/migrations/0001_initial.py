@@ -0,0 +1,90 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+import vng_api_common.fields
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Change",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "transaction_id",
+                    models.BigIntegerField(
+                        help_text="The ID of the database transaction that made the change.",
+                        verbose_name="transaction ID",
+                    ),
+                ),
+                ("resource", models.CharField(max_length=50, verbose_name="resource")),
+                (
+                    "resource_url",
+                    models.URLField(max_length=1000, verbose_name="resource URL"),
+                ),
+                (
+                    "hoofd_object",
+                    models.URLField(max_length=1000, verbose_name="hoofd object"),
+                ),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("updated", "Updated"),
+                            ("deleted", "Deleted"),
+                        ],
+                        max_length=20,
+                        verbose_name="type",
+                    ),
+                ),
+                (
+                    "timestamp",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="timestamp"
+                    ),
+                ),
+                (
+                    "zaaktype",
+                    models.URLField(max_length=1000, verbose_name="zaaktype"),
+                ),
+                (
+                    "vertrouwelijkheidaanduiding",
+                    vng_api_common.fields.VertrouwelijkheidsAanduidingField(
+                        choices=[
+                            ("openbaar", "Openbaar"),
+                            ("beperkt_openbaar", "Beperkt openbaar"),
+                            ("intern", "Intern"),
+                            ("zaakvertrouwelijk", "Zaakvertrouwelijk"),
+                            ("vertrouwelijk", "Vertrouwelijk"),
+                            ("confidentieel", "Confidentieel"),
+                            ("geheim", "Geheim"),
+                            ("zeer_geheim", "Zeer geheim"),
+                        ],
+                        max_length=20,
+                        verbose_name="vertrouwelijkheidaanduiding",
+                    ),
+                ),
+            ],
+            options={"verbose_name": "change", "verbose_name_plural": "changes"},
+        ),
+        migrations.AddIndex(
+            model_name="change",
+            index=models.Index(
+                fields=["transaction_id", "id"], name="changes_order_idx"
+            ),
+        ),
+    ]
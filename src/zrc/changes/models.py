@@ -0,0 +1,55 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+
+from vng_api_common.fields import VertrouwelijkheidsAanduidingField
+
+from zrc.datamodel.query import AuthorizationsFilterMixin
+
+from .constants import ChangeTypes
+
+
+class ChangeQuerySet(AuthorizationsFilterMixin, models.QuerySet):
+    pass
+
+
+class Change(models.Model):
+    """
+    A created, updated or deleted resource, in the order of the transactions.
+
+    Written in the same transaction as the change itself. The ``zaaktype``
+    and ``vertrouwelijkheidaanduiding`` of the zaak are copied, so the feed can
+    be filtered by the authorizations of the client without joining the zaak,
+    which may no longer exist.
+    """
+
+    transaction_id = models.BigIntegerField(
+        _("transaction ID"),
+        help_text=_("The ID of the database transaction that made the change."),
+    )
+    resource = models.CharField(_("resource"), max_length=50)
+    resource_url = models.URLField(_("resource URL"), max_length=1000)
+    hoofd_object = models.URLField(_("hoofd object"), max_length=1000)
+    type = models.CharField(_("type"), max_length=20, choices=ChangeTypes.choices)
+    timestamp = models.DateTimeField(_("timestamp"), default=timezone.now)
+
+    zaaktype = models.URLField(_("zaaktype"), max_length=1000)
+    vertrouwelijkheidaanduiding = VertrouwelijkheidsAanduidingField(
+        _("vertrouwelijkheidaanduiding")
+    )
+
+    objects = ChangeQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("change")
+        verbose_name_plural = _("changes")
+        indexes = [
+            models.Index(fields=["transaction_id", "id"], name="changes_order_idx")
+        ]
+
+    def __str__(self):
+        return f"{self.type} {self.resource_url}"
+
+    @property
+    def token(self) -> str:
+        return f"{self.transaction_id}-{self.pk}"
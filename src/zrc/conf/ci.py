@@ -23,6 +23,17 @@ CACHES = {
         "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
         "LOCATION": "/var/tmp/django_cache",
     },
+    # test data is rolled back without signals, which would leave stale
+    # authorizations behind in a persistent cache
+    "autorisaties": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    "tiles": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "tiles",
+    },
+    "bsn": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "bsn",
+    },
 }
 
 LOGGING = None  # Quiet is nice
@@ -69,6 +69,9 @@ CACHES = {
     "axes": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
     "drc_sync": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
     "kcc_sync": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "autorisaties": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "tiles": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "bsn": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
 }
 
 REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] += (
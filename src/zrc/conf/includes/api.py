@@ -6,6 +6,10 @@ API_VERSION = "1.1.0"
 
 REST_FRAMEWORK = BASE_REST_FRAMEWORK.copy()
 REST_FRAMEWORK["PAGE_SIZE"] = 100
+REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = (
+    "zrc.api.renderers.CamelCaseJSONRenderer",
+)
+REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = ("zrc.api.parsers.CamelCaseJSONParser",)
 
 SECURITY_DEFINITION_NAME = "JWT-Claims"
 
@@ -59,6 +59,21 @@ DATABASES = {
     }
 }
 
+# Read replicas of the default database, see zrc.utils.replicas. Reads of
+# recently writing clients stay on the primary for DB_REPLICA_PIN_SECONDS.
+DATABASE_REPLICAS = []
+for index, host in enumerate(config("DB_REPLICA_HOSTS", default="", split=True)):
+    alias = f"replica_{index}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["zrc.utils.replicas.ReplicaRouter"]
+DATABASE_REPLICA_PIN_SECONDS = config("DB_REPLICA_PIN_SECONDS", default=10)
+
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
@@ -84,6 +99,39 @@ CACHES = {
             "IGNORE_EXCEPTIONS": True,
         },
     },
+    # Compiled authorizations per client application, invalidated when the
+    # autorisaties change. The timeout is a safety net only.
+    "autorisaties": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": f"redis://{config('CACHE_DEFAULT', 'localhost:6379/0')}",
+        "TIMEOUT": 60 * 60,
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "IGNORE_EXCEPTIONS": True,
+        },
+    },
+    # Vector tiles of the zaakgeometrie, invalidated when the geometries in
+    # them change, see zrc.api.tiles
+    "tiles": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": f"redis://{config('CACHE_DEFAULT', 'localhost:6379/0')}",
+        "TIMEOUT": 24 * 60 * 60,
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "IGNORE_EXCEPTIONS": True,
+        },
+    },
+    # The rollen and zaken per BSN, invalidated when the natuurlijk personen of
+    # the BSN change, see zrc.api.bsn
+    "bsn": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": f"redis://{config('CACHE_DEFAULT', 'localhost:6379/0')}",
+        "TIMEOUT": 60,
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "IGNORE_EXCEPTIONS": True,
+        },
+    },
 }
 
 # Application definition
@@ -118,7 +166,10 @@ INSTALLED_APPS = [
     # Project applications.
     "zrc.accounts",
     "zrc.api",
+    "zrc.audit",
+    "zrc.changes",
     "zrc.datamodel",
+    "zrc.outbox",
     "zrc.sync",
     "zrc.utils",
 ]
@@ -129,12 +180,13 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "vng_api_common.middleware.AuthMiddleware",
+    "zrc.middleware.AuthMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "vng_api_common.middleware.APIVersionHeaderMiddleware",
     "zrc.middleware.DeprecationMiddleware",
+    "zrc.middleware.ReplicaMiddleware",
 ]
 
 ROOT_URLCONF = "zrc.urls"
@@ -189,10 +241,39 @@ STATICFILES_FINDERS = [
     "django.contrib.staticfiles.finders.AppDirectoriesFinder",
 ]
 
+# OpenAPI schema, prebuilt by ``manage.py build_schema``
+SCHEMA_ARTIFACTS_DIR = os.path.join(STATIC_ROOT, "schema")
+
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
 MEDIA_URL = "/media/"
 
+#
+# Remote API specs, compiled at build time by ``manage.py bundle_api_specs``
+#
+REMOTE_SPECS_BUNDLE = os.path.join(BASE_DIR, "var", "oas", "bundle.json")
+
+#
+# Warm up the uWSGI master before forking the workers, see zrc.utils.warmup
+#
+WARMUP = config("WARMUP", default=True)
+
+#
+# Tables partitioned by date, see ``manage.py manage_partitions``. The
+# retention is in days, ``0`` keeps all partitions. The optional
+# ``before_drop`` is called with the upper bound of a partition before it's
+# dropped.
+#
+PARTITIONED_TABLES = {
+    "datamodel_status": {"interval": "year", "retention": 0},
+    "audit_audittrail": {
+        "interval": "month",
+        "retention": config("AUDITTRAIL_RETENTION_DAYS", default=0),
+        # the remaining history of a resource starts with a snapshot
+        "before_drop": "zrc.audit.history.rebase",
+    },
+}
+
 #
 # Sending EMAIL
 #
@@ -22,6 +22,15 @@ CACHES = {
         "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
         "LOCATION": "/var/tmp/django_cache",
     },
+    "autorisaties": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    "tiles": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "tiles",
+    },
+    "bsn": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "bsn",
+    },
 }
 
 # Hosts/domain names that are valid for this site; required if DEBUG is False
@@ -0,0 +1,114 @@
+"""
+Delete a ZAAK and everything related to it with set-based queries.
+
+Django's deletion collector loads every related object into memory to send the
+delete signals and to determine the order of deletion, which for a ZAAK means
+all statussen, rollen, zaakobjecten (including their ~25 detail tables),
+eigenschappen etc. All relations of a ZAAK are ``CASCADE`` relations, so the
+rows can be deleted with one ``DELETE`` statement per table instead, children
+before their parents.
+
+The relations with remote APIs (informatieobjecten, contactmomenten and
+verzoeken) are *not* cleaned up here - see :mod:`zrc.sync.deletion`.
+"""
+import logging
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models, router, transaction
+from django.db.models.signals import post_delete, pre_delete
+
+from .models import Zaak
+
+logger = logging.getLogger(__name__)
+
+DeletionPlan = Tuple[Tuple[Type[models.Model], str], ...]
+
+
+@lru_cache()
+def get_deletion_plan(model: Type[models.Model]) -> DeletionPlan:
+    """
+    Determine the tables to delete from and the lookup to find the rows
+    belonging to instances of ``model``, in the order to delete them in.
+    """
+    plan = []
+    _add_to_plan(plan, model, "", (model,))
+    return tuple(plan)
+
+
+def _add_to_plan(plan: list, model: Type[models.Model], prefix: str, seen: tuple):
+    for relation in model._meta.related_objects:
+        related_model = relation.related_model
+        # self-referencing relations (deelzaken) are resolved up front
+        if related_model in seen or relation.on_delete is models.DO_NOTHING:
+            continue
+
+        if relation.on_delete is not models.CASCADE:
+            raise ImproperlyConfigured(
+                f"Relation {relation} must cascade to support set-based deletes"
+            )
+
+        _add_to_plan(
+            plan,
+            related_model,
+            f"{relation.field.name}__{prefix}",
+            seen + (related_model,),
+        )
+
+    plan.append((model, f"{prefix}pk__in"))
+
+
+def get_zaken_to_delete(zaak: Zaak) -> List[Zaak]:
+    """
+    Collect the zaak and its deelzaken, which are deleted with it.
+    """
+    zaken = [zaak]
+    parents = [zaak.pk]
+    while parents:
+        deelzaken = list(Zaak.objects.filter(hoofdzaak__in=parents))
+        zaken += deelzaken
+        parents = [deelzaak.pk for deelzaak in deelzaken]
+    return zaken
+
+
+def delete_zaken(
+    zaken: List[Zaak], before_delete: Optional[Callable[[List[Zaak]], None]] = None
+) -> Dict[str, int]:
+    """
+    Delete ``zaken`` and all their related objects.
+
+    Use :func:`get_zaken_to_delete` to include the deelzaken of a zaak. Only the
+    delete signals of the zaken themselves are sent. ``before_delete`` is
+    called with the ``zaken`` in the same transaction, before anything is
+    deleted - e.g. to record the deletion of the related objects.
+
+    :return: the number of deleted rows per model
+    """
+    using = router.db_for_write(Zaak, instance=zaken[0])
+    pks = [zaak.pk for zaak in zaken]
+
+    deleted = {}
+    with transaction.atomic(using=using, savepoint=False):
+        for zaak in zaken:
+            pre_delete.send(sender=Zaak, instance=zaak, using=using)
+
+        if before_delete is not None:
+            before_delete(zaken)
+
+        for model, lookup in get_deletion_plan(Zaak):
+            queryset = model._base_manager.using(using).filter(**{lookup: pks})
+            # skips the collector - the plan already takes care of the cascades
+            count = queryset._raw_delete(using)
+            if count:
+                label = model._meta.label
+                deleted[label] = deleted.get(label, 0) + count
+
+        for zaak in zaken:
+            post_delete.send(sender=Zaak, instance=zaak, using=using)
+
+    for zaak in zaken:
+        zaak.pk = None
+
+    logger.debug("Deleted zaken %r: %r", pks, deleted)
+    return deleted
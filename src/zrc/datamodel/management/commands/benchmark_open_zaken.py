@@ -0,0 +1,80 @@
+import timeit
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from zrc.datamodel.models import Zaak
+
+# as ordered by the API, with the primary key as tiebreaker
+ORDERINGS = (
+    ("-pk",),
+    ("einddatum_gepland", "pk"),
+    ("uiterlijke_einddatum_afdoening", "pk"),
+    ("registratiedatum", "pk"),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the time to list a page of open zaken, in the orderings of the "
+        "API, with and without the partial indexes of the open zaken. The "
+        "indexes are dropped in a transaction that is rolled back, which locks "
+        "the zaken meanwhile: only run this against a benchmark database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=settings.REST_FRAMEWORK["PAGE_SIZE"],
+            help="Number of zaken on a page",
+        )
+        parser.add_argument(
+            "--number", type=int, default=10, help="Number of pages to list"
+        )
+        parser.add_argument(
+            "--explain",
+            action="store_true",
+            help="Show the query plans",
+        )
+
+    def handle(self, **options):
+        if not Zaak.objects.filter(einddatum=None).exists():
+            raise CommandError("There are no open zaken to list")
+
+        self.stdout.write(
+            f"{Zaak.objects.count()} zaken, "
+            f"{Zaak.objects.filter(einddatum=None).count()} open"
+        )
+
+        with_indexes = self.benchmark(**options)
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for index in Zaak._meta.indexes:
+                    if index.condition is not None:
+                        cursor.execute(f'DROP INDEX "{index.name}"')
+            without_indexes = self.benchmark(**options)
+            transaction.set_rollback(True)
+
+        for ordering in ORDERINGS:
+            self.stdout.write(
+                f"{', '.join(ordering)}: "
+                f"{with_indexes[ordering]:.2f} ms with the indexes, "
+                f"{without_indexes[ordering]:.2f} ms without"
+            )
+
+    def benchmark(self, page_size: int, number: int, explain: bool, **options):
+        timings = {}
+        for ordering in ORDERINGS:
+            queryset = (
+                Zaak.objects.filter(einddatum__isnull=True)
+                .order_by(*ordering)
+                .values_list("pk", flat=True)[:page_size]
+            )
+            if explain:
+                self.stdout.write(queryset.explain(analyze=True))
+
+            seconds = timeit.timeit(lambda: list(queryset.all()), number=number)
+            timings[ordering] = seconds / number * 1000
+        return timings
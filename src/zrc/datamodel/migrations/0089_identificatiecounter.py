@@ -0,0 +1,69 @@
+from django.db import migrations, models
+from django.db.models import Max
+from django.db.models.functions import Cast, Substr
+
+import vng_api_common.fields
+
+IDENTIFICATIE_REGEX = r"^ZAAK-[0-9]{4}-[0-9]{10}$"
+
+
+def seed_counters(apps, schema_editor):
+    Zaak = apps.get_model("datamodel", "Zaak")
+    IdentificatieCounter = apps.get_model("datamodel", "IdentificatieCounter")
+
+    # ZAAK-YYYY-NNNNNNNNNN
+    last_numbers = (
+        Zaak.objects.filter(identificatie__regex=IDENTIFICATIE_REGEX)
+        .annotate(
+            year=Cast(Substr("identificatie", 6, 4), models.IntegerField()),
+            number=Cast(Substr("identificatie", 11, 10), models.BigIntegerField()),
+        )
+        .values("bronorganisatie", "year")
+        .annotate(last_number=Max("number"))
+        .order_by()
+    )
+
+    IdentificatieCounter.objects.bulk_create(
+        [
+            IdentificatieCounter(
+                bronorganisatie=row["bronorganisatie"],
+                year=row["year"],
+                value=row["last_number"],
+            )
+            for row in last_numbers
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("datamodel", "0088_zaak_opdrachtgevende_organisatie")]
+
+    operations = [
+        migrations.CreateModel(
+            name="IdentificatieCounter",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "bronorganisatie",
+                    vng_api_common.fields.RSINField(max_length=9),
+                ),
+                ("year", models.PositiveSmallIntegerField()),
+                ("value", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "identificatie counter",
+                "verbose_name_plural": "identificatie counters",
+                "unique_together": {("bronorganisatie", "year")},
+            },
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
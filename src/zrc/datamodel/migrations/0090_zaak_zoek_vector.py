@@ -0,0 +1,49 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# omschrijving weighs more than toelichting in the ranking
+CREATE_TRIGGER = """
+CREATE FUNCTION datamodel_zaak_zoek_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.zoek_vector :=
+        setweight(to_tsvector('pg_catalog.dutch', coalesce(NEW.omschrijving, '')), 'A') ||
+        setweight(to_tsvector('pg_catalog.dutch', coalesce(NEW.toelichting, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER datamodel_zaak_zoek_vector_trigger
+    BEFORE INSERT OR UPDATE OF omschrijving, toelichting, zoek_vector
+    ON datamodel_zaak
+    FOR EACH ROW EXECUTE PROCEDURE datamodel_zaak_zoek_vector_update();
+
+UPDATE datamodel_zaak SET zoek_vector = NULL;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER datamodel_zaak_zoek_vector_trigger ON datamodel_zaak;
+DROP FUNCTION datamodel_zaak_zoek_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("datamodel", "0089_identificatiecounter")]
+
+    operations = [
+        migrations.AddField(
+            model_name="zaak",
+            name="zoek_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="zaak",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["zoek_vector"], name="datamodel_z_zoek_ve_d26d00_gin"
+            ),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+from zrc.utils.partitioning import partition_table
+
+
+def partition_status(apps, schema_editor):
+    partition_table(
+        schema_editor.connection, "datamodel_status", "datum_status_gezet", "year"
+    )
+
+
+class Migration(migrations.Migration):
+
+    # the indexes are built concurrently, outside of a transaction
+    atomic = False
+
+    dependencies = [("datamodel", "0090_zaak_zoek_vector")]
+
+    operations = [migrations.RunPython(partition_status, migrations.RunPython.noop)]
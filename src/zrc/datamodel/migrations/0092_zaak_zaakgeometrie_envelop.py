@@ -0,0 +1,52 @@
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+# the tolerance of the simplified geometry in degrees, about 10 meters
+CREATE_TRIGGER = """
+CREATE FUNCTION datamodel_zaak_zaakgeometrie_update() RETURNS trigger AS $$
+BEGIN
+    NEW.zaakgeometrie_envelop := ST_Envelope(NEW.zaakgeometrie);
+    NEW.zaakgeometrie_vereenvoudigd :=
+        ST_SimplifyPreserveTopology(NEW.zaakgeometrie, 0.0001);
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER datamodel_zaak_zaakgeometrie_trigger
+    BEFORE INSERT OR UPDATE OF
+        zaakgeometrie, zaakgeometrie_envelop, zaakgeometrie_vereenvoudigd
+    ON datamodel_zaak
+    FOR EACH ROW EXECUTE PROCEDURE datamodel_zaak_zaakgeometrie_update();
+
+UPDATE datamodel_zaak SET zaakgeometrie_envelop = NULL
+    WHERE zaakgeometrie IS NOT NULL;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER datamodel_zaak_zaakgeometrie_trigger ON datamodel_zaak;
+DROP FUNCTION datamodel_zaak_zaakgeometrie_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("datamodel", "0091_partition_status")]
+
+    operations = [
+        # the spatial (GiST) indexes are created with the fields
+        migrations.AddField(
+            model_name="zaak",
+            name="zaakgeometrie_envelop",
+            field=django.contrib.gis.db.models.fields.GeometryField(
+                editable=False, null=True, srid=4326
+            ),
+        ),
+        migrations.AddField(
+            model_name="zaak",
+            name="zaakgeometrie_vereenvoudigd",
+            field=django.contrib.gis.db.models.fields.GeometryField(
+                editable=False, null=True, srid=4326
+            ),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("datamodel", "0092_zaak_zaakgeometrie_envelop")]
+
+    operations = [
+        # created on every partition of the (partitioned) table
+        migrations.AddIndex(
+            model_name="status",
+            index=models.Index(
+                fields=["statustype", "zaak", "datum_status_gezet"],
+                name="status_statustype_idx",
+            ),
+        )
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+INDEXES = [
+    ("zaak_open_idx", "id"),
+    ("zaak_open_einddatum_gepl_idx", "einddatum_gepland"),
+    ("zaak_open_uiterlijke_eind_idx", "uiterlijke_einddatum_afdoening"),
+    ("zaak_open_registratiedatum_idx", "registratiedatum"),
+]
+
+
+class Migration(migrations.Migration):
+
+    # the indexes are built concurrently, outside of a transaction
+    atomic = False
+
+    dependencies = [("datamodel", "0093_status_statustype_idx")]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" '
+                    f'ON "datamodel_zaak" ("{column}") WHERE "einddatum" IS NULL',
+                    f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"',
+                )
+                for name, column in INDEXES
+            ],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="zaak",
+                    index=models.Index(
+                        condition=models.Q(einddatum=None),
+                        fields=[column],
+                        name=name,
+                    ),
+                )
+                for name, column in INDEXES
+            ],
+        )
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # the index is built concurrently, outside of a transaction
+    atomic = False
+
+    dependencies = [("datamodel", "0094_zaak_open_indexes")]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'CREATE INDEX CONCURRENTLY IF NOT EXISTS "natuurlijkpersoon_bsn_idx" '
+                    'ON "datamodel_natuurlijkpersoon" ("inp_bsn", "rol_id")',
+                    'DROP INDEX CONCURRENTLY IF EXISTS "natuurlijkpersoon_bsn_idx"',
+                )
+            ],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="natuurlijkpersoon",
+                    index=models.Index(
+                        fields=["inp_bsn", "rol"], name="natuurlijkpersoon_bsn_idx"
+                    ),
+                )
+            ],
+        )
+    ]
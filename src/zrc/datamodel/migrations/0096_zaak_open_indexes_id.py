@@ -0,0 +1,72 @@
+from django.db import migrations, models
+
+# the orderings of the work queues get the primary key as tiebreaker
+INDEXES = [
+    (
+        "zaak_open_einddatum_gepl_idx",
+        "zaak_open_eindd_gepl_id_idx",
+        "einddatum_gepland",
+    ),
+    (
+        "zaak_open_uiterlijke_eind_idx",
+        "zaak_open_uiterl_eind_id_idx",
+        "uiterlijke_einddatum_afdoening",
+    ),
+    (
+        "zaak_open_registratiedatum_idx",
+        "zaak_open_registratie_id_idx",
+        "registratiedatum",
+    ),
+]
+
+
+def create_index(name: str, columns: str) -> str:
+    return (
+        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" '
+        f'ON "datamodel_zaak" ({columns}) WHERE "einddatum" IS NULL'
+    )
+
+
+def drop_index(name: str) -> str:
+    return f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'
+
+
+class Migration(migrations.Migration):
+
+    # the indexes are built concurrently, outside of a transaction
+    atomic = False
+
+    dependencies = [("datamodel", "0095_natuurlijkpersoon_bsn_idx")]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            # the new index is in place before the old one is dropped
+            database_operations=[
+                operation
+                for old_name, name, column in INDEXES
+                for operation in (
+                    migrations.RunSQL(
+                        create_index(name, f'"{column}", "id"'), drop_index(name)
+                    ),
+                    migrations.RunSQL(
+                        drop_index(old_name), create_index(old_name, f'"{column}"')
+                    ),
+                )
+            ],
+            state_operations=[
+                operation
+                for old_name, name, column in INDEXES
+                for operation in (
+                    migrations.RemoveIndex(model_name="zaak", name=old_name),
+                    migrations.AddIndex(
+                        model_name="zaak",
+                        index=models.Index(
+                            condition=models.Q(einddatum=None),
+                            fields=[column, "id"],
+                            name=name,
+                        ),
+                    ),
+                )
+            ],
+        )
+    ]
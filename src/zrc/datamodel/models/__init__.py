@@ -1,3 +1,4 @@
 from .betrokkene import *  # noqa
 from .core import *  # noqa
+from .identificatie import *  # noqa
 from .zaakobjecten import *  # noqa
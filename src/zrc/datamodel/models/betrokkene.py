@@ -110,6 +110,10 @@ class NatuurlijkPersoon(AbstractRolZaakobjectZakelijkRechtRelation):
 
     class Meta:
         verbose_name = "natuurlijk persoon"
+        # the rollen of a citizen, see zrc.api.bsn
+        indexes = [
+            models.Index(fields=["inp_bsn", "rol"], name="natuurlijkpersoon_bsn_idx")
+        ]
 
 
 class NietNatuurlijkPersoon(AbstractRolZaakobjectZakelijkRechtRelation):
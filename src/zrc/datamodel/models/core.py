@@ -5,6 +5,8 @@ from datetime import date
 from django.conf import settings
 from django.contrib.gis.db.models import GeometryField
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import RegexValidator
 from django.db import models
 from django.utils.crypto import get_random_string
@@ -27,14 +29,12 @@ from vng_api_common.fields import (
     VertrouwelijkheidsAanduidingField,
 )
 from vng_api_common.models import APICredential, APIMixin
-from vng_api_common.utils import (
-    generate_unique_identification,
-    request_object_attribute,
-)
+from vng_api_common.utils import request_object_attribute
 from vng_api_common.validators import alphanumeric_excluding_diacritic
 
 from ..constants import AardZaakRelatie, BetalingsIndicatie, IndicatieMachtiging
 from ..query import ZaakQuerySet, ZaakRelatedQuerySet
+from .identificatie import generate_identificatie, reserve_identificatie
 
 logger = logging.getLogger(__name__)
 
@@ -298,21 +298,65 @@ class Zaak(ETagMixin, APIMixin, models.Model):
         blank=True,
     )
 
+    # full text search on omschrijving and toelichting, maintained by a
+    # database trigger (see migration 0090)
+    zoek_vector = SearchVectorField(null=True, editable=False)
+
+    # the bounding box and a simplified copy of zaakgeometrie for the spatial
+    # filters and overview maps, maintained by a database trigger (see
+    # migration 0092)
+    zaakgeometrie_envelop = GeometryField(null=True, editable=False)
+    zaakgeometrie_vereenvoudigd = GeometryField(null=True, editable=False)
+
     objects = ZaakQuerySet.as_manager()
 
     class Meta:
         verbose_name = "zaak"
         verbose_name_plural = "zaken"
         unique_together = ("bronorganisatie", "identificatie")
+        indexes = [
+            GinIndex(fields=["zoek_vector"]),
+            # most queries only concern the open zaken, in the default order
+            # or the orderings of the work queues, with the primary key as
+            # tiebreaker (see migrations 0094 and 0096)
+            models.Index(
+                fields=["id"], name="zaak_open_idx", condition=models.Q(einddatum=None)
+            ),
+            models.Index(
+                fields=["einddatum_gepland", "id"],
+                name="zaak_open_eindd_gepl_id_idx",
+                condition=models.Q(einddatum=None),
+            ),
+            models.Index(
+                fields=["uiterlijke_einddatum_afdoening", "id"],
+                name="zaak_open_uiterl_eind_id_idx",
+                condition=models.Q(einddatum=None),
+            ),
+            models.Index(
+                fields=["registratiedatum", "id"],
+                name="zaak_open_registratie_id_idx",
+                condition=models.Q(einddatum=None),
+            ),
+        ]
 
     def __str__(self):
         return self.identificatie
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # to detect changes of the geometry, see zrc.api.tiles
+        if "zaakgeometrie" in instance.__dict__:
+            instance._loaded_zaakgeometrie = instance.zaakgeometrie
+        return instance
+
     def save(self, *args, **kwargs):
         if not self.identificatie:
-            self.identificatie = generate_unique_identification(
-                self, "registratiedatum"
+            self.identificatie = generate_identificatie(
+                self.bronorganisatie, self.registratiedatum.year
             )
+        elif self._state.adding:
+            reserve_identificatie(self.bronorganisatie, self.identificatie)
 
         if (
             self.betalingsindicatie == BetalingsIndicatie.nvt
@@ -391,6 +435,13 @@ class Status(ETagMixin, models.Model):
         verbose_name = "status"
         verbose_name_plural = "statussen"
         unique_together = ("zaak", "datum_status_gezet")
+        # the later statussen of a zaak are looked up in the unique index
+        indexes = [
+            models.Index(
+                fields=["statustype", "zaak", "datum_status_gezet"],
+                name="status_statustype_idx",
+            )
+        ]
 
     def __str__(self):
         return "Status op {}".format(self.datum_status_gezet)
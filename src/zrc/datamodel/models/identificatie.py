@@ -0,0 +1,78 @@
+import re
+
+from django.db import connection, models
+from django.utils.translation import ugettext_lazy as _
+
+from vng_api_common.fields import RSINField
+
+__all__ = ["IdentificatieCounter"]
+
+IDENTIFICATIE_PREFIX = "ZAAK"
+
+IDENTIFICATIE_RE = re.compile(rf"^{IDENTIFICATIE_PREFIX}-(\d{{4}})-(\d{{10}})$")
+
+
+class IdentificatieCounter(models.Model):
+    """
+    The last issued identificatie number per bronorganisatie and year.
+
+    Identificaties are generated as ``ZAAK-<year>-<number>``, with the number
+    zero-padded to 10 digits.
+    """
+
+    bronorganisatie = RSINField()
+    year = models.PositiveSmallIntegerField()
+    value = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = _("identificatie counter")
+        verbose_name_plural = _("identificatie counters")
+        unique_together = ("bronorganisatie", "year")
+
+    def __str__(self):
+        return f"{self.bronorganisatie} - {self.year}: {self.value}"
+
+
+def _upsert_counter(
+    bronorganisatie: str, year: int, value: int, increment: bool
+) -> int:
+    # a single upsert, which creates or locks the counter row until the end of
+    # the transaction - concurrent creates can never issue the same number
+    table = connection.ops.quote_name(IdentificatieCounter._meta.db_table)
+    if increment:
+        update = f"{table}.value + 1"
+    else:
+        update = f"GREATEST({table}.value, EXCLUDED.value)"
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (bronorganisatie, year, value)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (bronorganisatie, year) DO UPDATE SET value = {update}
+            RETURNING value
+            """,
+            [bronorganisatie, year, value],
+        )
+        return cursor.fetchone()[0]
+
+
+def generate_identificatie(bronorganisatie: str, year: int) -> str:
+    """
+    Issue the next identificatie for ``bronorganisatie`` in ``year``.
+    """
+    number = _upsert_counter(bronorganisatie, year, 1, increment=True)
+    return f"{IDENTIFICATIE_PREFIX}-{year}-{number:010d}"
+
+
+def reserve_identificatie(bronorganisatie: str, identificatie: str) -> None:
+    """
+    Make sure a client-provided identificatie in the generated format is never
+    issued by :func:`generate_identificatie`.
+    """
+    match = IDENTIFICATIE_RE.match(identificatie)
+    if match is None:
+        return
+
+    year, number = int(match.group(1)), int(match.group(2))
+    _upsert_counter(bronorganisatie, year, number, increment=False)
@@ -1,5 +1,23 @@
+from typing import Optional
+
+from django.apps import apps
+from django.contrib.gis.db.models import Collect
+from django.contrib.gis.db.models.functions import Centroid, SnapToGrid, Transform
+from django.contrib.gis.geos import GEOSGeometry, Polygon
+from django.contrib.postgres.search import SearchQuery, SearchRank
 from django.db import models
-from django.db.models import Case, IntegerField, Value, When
+from django.db.models import (
+    Case,
+    Count,
+    Exists,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
 
 from vng_api_common.constants import VertrouwelijkheidsAanduiding
 from vng_api_common.scopes import Scope
@@ -9,7 +27,7 @@ class AuthorizationsFilterMixin:
     authorizations_lookup = None
 
     def filter_for_authorizations(
-        self, scope: Scope, authorizations: models.QuerySet
+        self, scope: Scope, authorizations
     ) -> models.QuerySet:
         """
         Filter objects whitelisted by the authorizations.
@@ -22,15 +40,15 @@ class AuthorizationsFilterMixin:
         This means that ``zaken`` are included if, and only if:
 
         * the ``zaaktype`` is provided in ``authorizations``
-        * the scopes for the ``zaaktype`` in each ``authorization`` contain the
-          required``scope``
+        * the scopes granted for the ``zaaktype`` contain the required ``scope``
         * the ``zaak.vertrouwelijkheidaanduiding`` is less then or equal to the
-          ``authorization.max_vertrouwelijkheidaanduiding``
+          ``max_vertrouwelijkheidaanduiding`` for which that ``scope`` is
+          granted
 
         :param scope: a (possibly complex) scope that must be granted on the
           authorizations
-        :param authorizations: queryset of
-          :class:`vng_api_common.authorizations.Autorisatie` objects
+        :param authorizations: the compiled authorizations of the client, see
+          :class:`zrc.api.authorizations.AuthorizationIndex`
 
         :return: a queryset of filtered results according to the
           authorizations provided
@@ -50,23 +68,13 @@ class AuthorizationsFilterMixin:
         # build the case/when to map the max_vertrouwelijkheidaanduiding based
         # on the ``zaaktype``
         vertrouwelijkheidaanduiding_whens = []
-        for authorization in authorizations:
-            # test if this authorization has the scope that's needed
-            if not scope.is_contained_in(authorization.scopes):
-                continue
-
+        max_orders = authorizations.get_max_orders(scope)
+        for zaaktype, max_order in max_orders.items():
             # this zaaktype is allowed
-            zaaktypen.append(authorization.zaaktype)
+            zaaktypen.append(zaaktype)
 
-            # extract the order and map it to the database value
-            choice_item = VertrouwelijkheidsAanduiding.get_choice(
-                authorization.max_vertrouwelijkheidaanduiding
-            )
             vertrouwelijkheidaanduiding_whens.append(
-                When(
-                    **{f"{prefix}zaaktype": authorization.zaaktype},
-                    then=Value(choice_item.order),
-                )
+                When(**{f"{prefix}zaaktype": zaaktype}, then=Value(max_order))
             )
 
         # apply the order annnotation so we can filter later
@@ -87,8 +95,104 @@ class AuthorizationsFilterMixin:
         return queryset
 
 
+# text search configuration used for ``Zaak.zoek_vector``
+SEARCH_CONFIG = "dutch"
+
+
 class ZaakQuerySet(AuthorizationsFilterMixin, models.QuerySet):
-    pass
+    def search(self, zoekterm: str) -> models.QuerySet:
+        """
+        Full text search on ``omschrijving`` and ``toelichting``, ordered by
+        relevance.
+        """
+        query = SearchQuery(zoekterm, config=SEARCH_CONFIG)
+        return (
+            self.filter(zoek_vector=query)
+            .annotate(zoek_rang=SearchRank(F("zoek_vector"), query))
+            .order_by("-zoek_rang", "-pk")
+        )
+
+    # The spatial filters first select the candidates on the indexed
+    # ``zaakgeometrie_envelop``, a single box per zaak, and only then compare
+    # the (possibly large) ``zaakgeometrie`` itself.
+
+    def within(self, geometry: GEOSGeometry) -> models.QuerySet:
+        return self.filter(
+            zaakgeometrie_envelop__contained=geometry, zaakgeometrie__within=geometry
+        )
+
+    def intersects(self, geometry: GEOSGeometry) -> models.QuerySet:
+        return self.filter(
+            zaakgeometrie_envelop__bboverlaps=geometry,
+            zaakgeometrie__intersects=geometry,
+        )
+
+    def in_bbox(self, bbox: Polygon) -> models.QuerySet:
+        """
+        Zaken of which the geometry intersects the rectangle ``bbox``.
+
+        A zaak of which the envelope lies within ``bbox`` intersects it without
+        comparing the geometry itself.
+        """
+        return self.filter(zaakgeometrie_envelop__bboverlaps=bbox).filter(
+            Q(zaakgeometrie_envelop__contained=bbox) | Q(zaakgeometrie__intersects=bbox)
+        )
+
+    def current_statustype(self, statustype: str) -> models.QuerySet:
+        """
+        Zaken of which the current (latest) status has ``statustype``.
+
+        Starts from the statussen with ``statustype`` and drops those that are
+        followed by a later status of the same zaak, instead of determining the
+        current status of every zaak. Both steps are index lookups.
+        """
+        Status = apps.get_model("datamodel", "Status")
+        later = Status.objects.filter(
+            zaak=OuterRef("zaak"), datum_status_gezet__gt=OuterRef("datum_status_gezet")
+        )
+        current = (
+            Status.objects.filter(statustype=statustype)
+            .annotate(opgevolgd=Exists(later))
+            .filter(opgevolgd=False)
+        )
+        return self.filter(pk__in=current.values("zaak"))
+
+    def cluster(self, cell_size: float, group: Optional[str] = None) -> models.QuerySet:
+        """
+        Count the zaken per cell of a grid, optionally per ``group``.
+
+        The zaken are assigned to a cell by the center of their envelope, in
+        web mercator (EPSG:3857) like the vector tiles. Every cell has the
+        number of zaken (``aantal``) and their center of mass (``geometrie``).
+
+        :param cell_size: the size of the cells in web mercator, a whole
+          fraction of the tile size so that the cells line up with the tiles
+        :param group: ``zaaktype`` or ``statustype`` (of the current status)
+        """
+        queryset = self.filter(zaakgeometrie_envelop__isnull=False)
+        if group == "statustype":
+            Status = apps.get_model("datamodel", "Status")
+            current_status = Status.objects.filter(zaak=OuterRef("pk")).order_by(
+                "-datum_status_gezet"
+            )
+            queryset = queryset.annotate(
+                statustype=Subquery(current_status.values("statustype")[:1])
+            )
+
+        center = Transform(Centroid("zaakgeometrie_envelop"), 3857)
+        # snapped to the center of the cell, which starts at a multiple of
+        # ``cell_size`` like the tiles
+        cell = SnapToGrid(center, cell_size, cell_size, cell_size / 2, cell_size / 2)
+        return (
+            queryset.annotate(cel=cell)
+            .order_by()
+            .values("cel", *([group] if group else []))
+            .annotate(
+                aantal=Count("pk"),
+                geometrie=Transform(Centroid(Collect(center)), 4326),
+            )
+            .order_by("-aantal")
+        )
 
 
 class ZaakRelatedQuerySet(AuthorizationsFilterMixin, models.QuerySet):
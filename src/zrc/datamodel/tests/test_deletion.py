@@ -0,0 +1,43 @@
+from rest_framework.test import APITestCase
+
+from ..deletion import delete_zaken, get_deletion_plan, get_zaken_to_delete
+from ..models import Status, WozObject, WozWaarde, Zaak, ZaakObject
+from .factories import StatusFactory, WozWaardeFactory, ZaakFactory
+
+
+class DeletionPlanTests(APITestCase):
+    def test_children_before_parents(self):
+        plan = get_deletion_plan(Zaak)
+        models = [model for model, lookup in plan]
+
+        self.assertEqual(plan[-1], (Zaak, "pk__in"))
+        self.assertIn((Status, "zaak__pk__in"), plan)
+        self.assertLess(models.index(WozObject), models.index(WozWaarde))
+        self.assertLess(models.index(WozWaarde), models.index(ZaakObject))
+
+    def test_nested_lookup(self):
+        plan = get_deletion_plan(Zaak)
+
+        self.assertIn((WozObject, "woz_warde__zaakobject__zaak__pk__in"), plan)
+
+
+class DeleteZakenTests(APITestCase):
+    def test_delete_zaak_with_nested_objects(self):
+        zaak = ZaakFactory.create()
+        deelzaak = ZaakFactory.create(hoofdzaak=zaak)
+        StatusFactory.create(zaak=deelzaak)
+        woz_waarde = WozWaardeFactory.create(zaakobject__zaak=zaak)
+        WozObject.objects.create(woz_warde=woz_waarde, woz_object_nummer="1")
+        other_zaak = ZaakFactory.create()
+        StatusFactory.create(zaak=other_zaak)
+
+        zaken = get_zaken_to_delete(zaak)
+        deleted = delete_zaken(zaken)
+
+        self.assertEqual(set(zaken), {zaak, deelzaak})
+        self.assertEqual(deleted["datamodel.Zaak"], 2)
+        self.assertEqual(list(Zaak.objects.all()), [other_zaak])
+        self.assertEqual(Status.objects.get().zaak, other_zaak)
+        self.assertFalse(ZaakObject.objects.exists())
+        self.assertFalse(WozWaarde.objects.exists())
+        self.assertFalse(WozObject.objects.exists())
@@ -1,8 +1,11 @@
 from freezegun import freeze_time
 from rest_framework.test import APITestCase
 
+from ..models import IdentificatieCounter
 from .factories import ZaakFactory
 
+BRONORGANISATIE = "517439943"
+
 
 class UniqueFriendlyIdentificationTests(APITestCase):
     @freeze_time("2019-01-01")
@@ -12,20 +15,49 @@ class UniqueFriendlyIdentificationTests(APITestCase):
 
     def test_create_zaak_unique_id_per_year(self):
         with freeze_time("2018-01-01"):
-            zaak1 = ZaakFactory.create()
+            zaak1 = ZaakFactory.create(bronorganisatie=BRONORGANISATIE)
 
         with freeze_time("2019-01-01"):
-            zaak2 = ZaakFactory.create()
+            zaak2 = ZaakFactory.create(bronorganisatie=BRONORGANISATIE)
 
         self.assertEqual(zaak1.identificatie, "ZAAK-2018-0000000001")
 
         self.assertEqual(zaak2.identificatie, "ZAAK-2019-0000000001")
 
+    @freeze_time("2019-01-01")
+    def test_create_zaak_unique_id_per_bronorganisatie(self):
+        zaak1 = ZaakFactory.create(bronorganisatie=BRONORGANISATIE)
+        zaak2 = ZaakFactory.create(bronorganisatie="000000000")
+
+        self.assertEqual(zaak1.identificatie, "ZAAK-2019-0000000001")
+        self.assertEqual(zaak2.identificatie, "ZAAK-2019-0000000001")
+
     @freeze_time("2019-01-01")
     def test_delete_then_create_zaak_unique_id(self):
-        zaak1 = ZaakFactory.create()
-        ZaakFactory.create()
+        zaak1 = ZaakFactory.create(bronorganisatie=BRONORGANISATIE)
+        ZaakFactory.create(bronorganisatie=BRONORGANISATIE)
         zaak1.delete()
-        zaak3 = ZaakFactory.create()
+        zaak3 = ZaakFactory.create(bronorganisatie=BRONORGANISATIE)
 
         self.assertEqual(zaak3.identificatie, "ZAAK-2019-0000000003")
+
+    @freeze_time("2019-01-01")
+    def test_provided_identificatie_is_not_issued_again(self):
+        ZaakFactory.create(
+            bronorganisatie=BRONORGANISATIE, identificatie="ZAAK-2019-0000000005"
+        )
+
+        zaak = ZaakFactory.create(bronorganisatie=BRONORGANISATIE)
+
+        self.assertEqual(zaak.identificatie, "ZAAK-2019-0000000006")
+
+    @freeze_time("2019-01-01")
+    def test_update_does_not_issue_identificatie(self):
+        zaak = ZaakFactory.create(bronorganisatie=BRONORGANISATIE)
+
+        zaak.save()
+
+        counter = IdentificatieCounter.objects.get(
+            bronorganisatie=BRONORGANISATIE, year=2019
+        )
+        self.assertEqual(counter.value, 1)
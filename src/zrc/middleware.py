@@ -1,3 +1,10 @@
+from django.conf import settings
+
+from rest_framework.permissions import SAFE_METHODS
+from vng_api_common.middleware import AuthMiddleware as _AuthMiddleware
+
+from .utils import replicas
+
 # See https://github.com/Geonovum/KP-APIs/blob/master/Werkgroep%20API%20strategie/extensies/ext-versionering.md
 
 WARNING_HEADER = "Warning"
@@ -51,3 +58,65 @@ class DeprecationMiddleware:
         )
 
         return None
+
+
+class AuthMiddleware(_AuthMiddleware):
+    """
+    Attach the JWT authentication backed by the cached authorizations.
+    """
+
+    def extract_jwt_payload(self, request):
+        from .api.authorizations import CachedJWTAuth
+
+        super().extract_jwt_payload(request)
+        request.jwt_auth = CachedJWTAuth(request.jwt_auth.encoded)
+
+
+class ReplicaMiddleware:
+    """
+    Read from the database replicas in the ``replica_actions`` of a viewset.
+
+    See :mod:`zrc.utils.replicas`. Clients that write are pinned to the primary
+    for a while, so their next reads include their own writes.
+    """
+
+    def __init__(self, get_response=None):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if self.get_response is None:
+            return None
+
+        try:
+            response = self.get_response(request)
+        finally:
+            replicas.reset()
+
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method not in SAFE_METHODS
+            and not getattr(request, "_replica_action", False)
+            and response.status_code < 400
+        ):
+            client_id = replicas.get_client_id(request)
+            if client_id:
+                replicas.pin_to_primary(client_id)
+
+        return response
+
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        # not a viewset
+        if not hasattr(callback, "cls"):
+            return None
+
+        action = getattr(callback, "actions", {}).get(request.method.lower())
+        if action not in getattr(callback.cls, "replica_actions", ()):
+            return None
+
+        request._replica_action = True
+        client_id = replicas.get_client_id(request)
+        if client_id and replicas.is_pinned_to_primary(client_id):
+            return None
+
+        replicas.use_replica()
+        return None
@@ -0,0 +1,4 @@
+"""
+Deliver notifications to the Notificaties API asynchronously.
+"""
+default_app_config = "zrc.outbox.apps.OutboxConfig"
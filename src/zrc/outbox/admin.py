@@ -0,0 +1,18 @@
+from django.contrib import admin
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+
+from .models import OutboxNotification
+
+
+@admin.register(OutboxNotification)
+class OutboxNotificationAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "created", "attempts", "next_attempt", "dead_letter")
+    list_filter = ("dead_letter",)
+    readonly_fields = ("message", "hoofd_object", "created", "attempts", "last_error")
+    actions = ["retry"]
+
+    def retry(self, request, queryset):
+        queryset.update(dead_letter=False, attempts=0, next_attempt=timezone.now())
+
+    retry.short_description = _("Retry delivering the selected notifications")
@@ -0,0 +1,132 @@
+"""
+Deliver the notifications in the outbox to the Notificaties API.
+
+Notifications are delivered in the order they were written. A notification is
+held back as long as an earlier notification about the same ``hoofdObject``
+is pending - waiting to be retried after a failed delivery, or being delivered
+by another worker - so that consumers never see them out of order.
+
+A failed delivery is retried with an exponential backoff, up to
+``MAX_ATTEMPTS`` times. After that, the notification is kept as a dead letter
+(to inspect in the admin) and no longer holds back the later notifications.
+When the Notificaties API fails repeatedly, the batch is aborted instead of
+trying every remaining notification.
+"""
+import logging
+import math
+from datetime import timedelta
+from typing import Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import OutboxNotification
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+
+# seconds
+MAX_BACKOFF = 60 * 60
+
+# give up on the current batch after this many failures in a row
+MAX_CONSECUTIVE_FAILURES = 5
+
+# give up on a notification after this many failed deliveries - about ten
+# hours with the backoff
+MAX_ATTEMPTS = 20
+
+
+def get_backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(2**attempts, MAX_BACKOFF))
+
+
+def get_lag() -> Optional[timedelta]:
+    """
+    Age of the oldest notification that has not been delivered yet.
+    """
+    oldest = (
+        OutboxNotification.objects.filter(dead_letter=False)
+        .order_by("created")
+        .values_list("created", flat=True)
+        .first()
+    )
+    if oldest is None:
+        return None
+    return timezone.now() - oldest
+
+
+def deliver_batch(client, batch_size: int = BATCH_SIZE) -> Tuple[int, int]:
+    """
+    Deliver the next batch of due notifications.
+
+    Rows are locked with ``SKIP LOCKED``, so multiple workers can deliver
+    concurrently.
+
+    :return: the number of delivered and failed notifications
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboxNotification.objects.select_for_update(skip_locked=True)
+            .filter(next_attempt__lte=now, dead_letter=False)
+            .order_by("pk")[:batch_size]
+        )
+        if not batch:
+            return 0, 0
+
+        # the earliest pending notification per object outside of this batch:
+        # waiting to be retried, or skipped since another worker has it locked
+        earliest = dict(
+            OutboxNotification.objects.filter(
+                dead_letter=False,
+                hoofd_object__in={notification.hoofd_object for notification in batch},
+            )
+            .exclude(pk__in=[notification.pk for notification in batch])
+            .order_by()
+            .values_list("hoofd_object")
+            .annotate(Min("pk"))
+        )
+
+        blocked = set()
+        delivered, failed = [], []
+        consecutive_failures = 0
+        for notification in batch:
+            if notification.hoofd_object in blocked:
+                continue
+            if notification.pk > earliest.get(notification.hoofd_object, math.inf):
+                continue
+
+            try:
+                client.create("notificaties", notification.message)
+            except Exception as exc:
+                logger.warning(
+                    "Could not deliver notification %s", notification, exc_info=True
+                )
+                blocked.add(notification.hoofd_object)
+                notification.attempts += 1
+                notification.next_attempt = now + get_backoff(notification.attempts)
+                notification.last_error = str(exc)
+                if notification.attempts >= MAX_ATTEMPTS:
+                    logger.error(
+                        "Giving up on notification %s after %d attempts",
+                        notification,
+                        notification.attempts,
+                    )
+                    notification.dead_letter = True
+                failed.append(notification)
+
+                consecutive_failures += 1
+                if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                    break
+            else:
+                delivered.append(notification.pk)
+                consecutive_failures = 0
+
+        OutboxNotification.objects.filter(pk__in=delivered).delete()
+        OutboxNotification.objects.bulk_update(
+            failed, ["attempts", "next_attempt", "last_error", "dead_letter"]
+        )
+
+    return len(delivered), len(failed)
@@ -0,0 +1,85 @@
+import logging
+import time
+
+from django.core.management import BaseCommand, CommandError
+
+from vng_api_common.notifications.models import NotificationsConfig
+
+from ...delivery import BATCH_SIZE, MAX_BACKOFF, deliver_batch, get_lag
+from ...models import OutboxNotification
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Deliver the notifications in the outbox to the Notificaties API"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="Maximum number of notifications to deliver per transaction",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when there are no notifications to deliver",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Deliver the notifications that are due and exit",
+        )
+        parser.add_argument(
+            "--report",
+            action="store_true",
+            help="Report the number of pending notifications and the delivery lag",
+        )
+
+    def handle(self, **options):
+        if options["report"]:
+            self.report()
+            return
+
+        client = NotificationsConfig.get_client()
+        if client is None:
+            raise CommandError("The Notificaties API configuration is incomplete")
+
+        interval = options["interval"]
+        wait = interval
+        while True:
+            delivered, failed = deliver_batch(client, options["batch_size"])
+            if delivered or failed:
+                logger.info(
+                    "Delivered %d notifications (%d failed), delivery lag %s",
+                    delivered,
+                    failed,
+                    get_lag(),
+                )
+
+            if delivered == options["batch_size"]:
+                # there's more to do
+                wait = interval
+                continue
+
+            if options["once"]:
+                break
+
+            if failed and not delivered:
+                # the Notificaties API is struggling - back off
+                wait = min(wait * 2, MAX_BACKOFF)
+            else:
+                wait = interval
+            time.sleep(wait)
+
+    def report(self):
+        notifications = OutboxNotification.objects.filter(dead_letter=False)
+        pending = notifications.count()
+        retrying = notifications.filter(attempts__gt=0).count()
+        dead_letters = OutboxNotification.objects.filter(dead_letter=True).count()
+        self.stdout.write(f"pending: {pending}")
+        self.stdout.write(f"retrying: {retrying}")
+        self.stdout.write(f"dead letters: {dead_letters}")
+        self.stdout.write(f"lag: {get_lag() or 0}")
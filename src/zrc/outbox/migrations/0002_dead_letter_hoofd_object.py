@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+
+def set_hoofd_object(apps, _):
+    OutboxNotification = apps.get_model("outbox", "OutboxNotification")
+
+    for notification in OutboxNotification.objects.iterator():
+        notification.hoofd_object = notification.message.get("hoofdObject", "")
+        notification.save(update_fields=["hoofd_object"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("outbox", "0001_initial")]
+
+    operations = [
+        migrations.AddField(
+            model_name="outboxnotification",
+            name="dead_letter",
+            field=models.BooleanField(
+                default=False,
+                help_text="Delivering the notification failed too often, it's no longer retried.",
+                verbose_name="dead letter",
+            ),
+        ),
+        migrations.AddField(
+            model_name="outboxnotification",
+            name="hoofd_object",
+            field=models.URLField(
+                blank=True,
+                db_index=True,
+                help_text="The ``hoofdObject`` of the message, to deliver in order.",
+                max_length=1000,
+                verbose_name="hoofd object",
+            ),
+        ),
+        migrations.RunPython(set_hoofd_object, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+from django.contrib.postgres.fields import JSONField
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+
+
+class OutboxNotification(models.Model):
+    """
+    A notification that still has to be delivered to the Notificaties API.
+
+    Notifications are written in the same transaction as the change they
+    describe and removed once delivered.
+    """
+
+    message = JSONField(
+        _("message"),
+        encoder=DjangoJSONEncoder,
+        help_text=_("The notification, as sent to the Notificaties API."),
+    )
+    created = models.DateTimeField(_("created"), default=timezone.now)
+    attempts = models.PositiveIntegerField(_("attempts"), default=0)
+    next_attempt = models.DateTimeField(
+        _("next attempt"), default=timezone.now, db_index=True
+    )
+    last_error = models.TextField(_("last error"), blank=True)
+    dead_letter = models.BooleanField(
+        _("dead letter"),
+        default=False,
+        help_text=_(
+            "Delivering the notification failed too often, it's no longer " "retried."
+        ),
+    )
+    hoofd_object = models.URLField(
+        _("hoofd object"),
+        max_length=1000,
+        blank=True,
+        db_index=True,
+        help_text=_("The ``hoofdObject`` of the message, to deliver in order."),
+    )
+
+    class Meta:
+        verbose_name = _("outbox notification")
+        verbose_name_plural = _("outbox notifications")
+        ordering = ("pk",)
+
+    def __str__(self):
+        return f"{self.message.get('actie')} {self.message.get('resourceUrl')}"
+
+    def save(self, *args, **kwargs):
+        if not self.hoofd_object:
+            self.hoofd_object = self.message.get("hoofdObject", "")
+        super().save(*args, **kwargs)
@@ -0,0 +1,162 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import MagicMock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from freezegun import freeze_time
+
+from ..delivery import MAX_ATTEMPTS, MAX_CONSECUTIVE_FAILURES, deliver_batch, get_lag
+from ..models import OutboxNotification
+
+ZAAK1 = "http://testserver/api/v1/zaken/1"
+ZAAK2 = "http://testserver/api/v1/zaken/2"
+
+
+def create_notification(hoofd_object: str, actie: str = "create"):
+    return OutboxNotification.objects.create(
+        message={
+            "kanaal": "zaken",
+            "hoofdObject": hoofd_object,
+            "resource": "zaak",
+            "resourceUrl": hoofd_object,
+            "actie": actie,
+            "aanmaakdatum": "2012-01-14T00:00:00Z",
+            "kenmerken": {},
+        }
+    )
+
+
+@freeze_time("2012-01-14")
+class DeliveryTests(TestCase):
+    def test_deliver_in_order(self):
+        first = create_notification(ZAAK1)
+        second = create_notification(ZAAK1, actie="update")
+        client = MagicMock()
+
+        delivered, failed = deliver_batch(client)
+
+        self.assertEqual((delivered, failed), (2, 0))
+        self.assertEqual(
+            [call[0] for call in client.create.call_args_list],
+            [("notificaties", first.message), ("notificaties", second.message)],
+        )
+        self.assertFalse(OutboxNotification.objects.exists())
+
+    def test_failed_delivery_is_retried_later(self):
+        notification = create_notification(ZAAK1)
+        client = MagicMock()
+        client.create.side_effect = Exception("NRC unavailable")
+
+        delivered, failed = deliver_batch(client)
+
+        self.assertEqual((delivered, failed), (0, 1))
+        notification.refresh_from_db()
+        self.assertEqual(notification.attempts, 1)
+        self.assertEqual(notification.last_error, "NRC unavailable")
+        self.assertGreater(notification.next_attempt, timezone.now())
+
+        # not due yet
+        client.create.reset_mock()
+        deliver_batch(client)
+        client.create.assert_not_called()
+
+    def test_failure_holds_back_same_hoofd_object(self):
+        create_notification(ZAAK1)
+        create_notification(ZAAK1, actie="update")
+        other = create_notification(ZAAK2)
+        client = MagicMock()
+        client.create.side_effect = [Exception("Bad request"), None]
+
+        delivered, failed = deliver_batch(client)
+
+        self.assertEqual((delivered, failed), (1, 1))
+        self.assertEqual(client.create.call_count, 2)
+        self.assertEqual(client.create.call_args[0][1], other.message)
+        self.assertEqual(OutboxNotification.objects.count(), 2)
+
+        # the update is held back as long as the create is waiting
+        with freeze_time("2012-01-14 00:00:01"):
+            create_notification(ZAAK1, actie="destroy")
+            client.create.reset_mock()
+            deliver_batch(client)
+            client.create.assert_not_called()
+
+    def test_dead_letter(self):
+        notification = create_notification(ZAAK1)
+        OutboxNotification.objects.update(attempts=MAX_ATTEMPTS - 1)
+        update = create_notification(ZAAK1, actie="update")
+        client = MagicMock()
+        client.create.side_effect = [Exception("Bad request"), None]
+
+        delivered, failed = deliver_batch(client)
+
+        self.assertEqual((delivered, failed), (0, 1))
+        notification.refresh_from_db()
+        self.assertTrue(notification.dead_letter)
+
+        # the dead letter is not retried, and no longer holds back the update
+        with freeze_time("2012-01-15"):
+            delivered, failed = deliver_batch(client)
+
+        self.assertEqual((delivered, failed), (1, 0))
+        self.assertEqual(client.create.call_args[0][1], update.message)
+        self.assertEqual(list(OutboxNotification.objects.all()), [notification])
+        self.assertIsNone(get_lag())
+
+    def test_abort_batch_on_repeated_failures(self):
+        for i in range(MAX_CONSECUTIVE_FAILURES + 2):
+            create_notification(f"{ZAAK1}{i}")
+        client = MagicMock()
+        client.create.side_effect = Exception("NRC unavailable")
+
+        delivered, failed = deliver_batch(client)
+
+        self.assertEqual((delivered, failed), (0, MAX_CONSECUTIVE_FAILURES))
+        self.assertEqual(OutboxNotification.objects.filter(attempts=0).count(), 2)
+
+    def test_lag(self):
+        self.assertIsNone(get_lag())
+
+        create_notification(ZAAK1)
+
+        with freeze_time("2012-01-14 00:00:30"):
+            self.assertEqual(get_lag(), timedelta(seconds=30))
+
+    def test_report(self):
+        create_notification(ZAAK1)
+        stdout = StringIO()
+
+        call_command("deliver_notifications", "--report", stdout=stdout)
+
+        self.assertIn("pending: 1", stdout.getvalue())
+        self.assertIn("dead letters: 0", stdout.getvalue())
+
+
+class ConcurrentDeliveryTests(TransactionTestCase):
+    def test_held_back_while_earlier_notification_is_locked(self):
+        first = create_notification(ZAAK1)
+        create_notification(ZAAK1, actie="update")
+        other = create_notification(ZAAK2)
+        client = MagicMock()
+
+        # another worker is delivering the first notification
+        worker = connection.copy()
+        self.addCleanup(worker.close)
+        with worker.cursor() as cursor:
+            cursor.execute("BEGIN")
+            cursor.execute(
+                "SELECT id FROM outbox_outboxnotification WHERE id = %s FOR UPDATE",
+                [first.pk],
+            )
+
+            delivered, failed = deliver_batch(client)
+
+            cursor.execute("ROLLBACK")
+
+        self.assertEqual((delivered, failed), (1, 0))
+        client.create.assert_called_once_with("notificaties", other.message)
+        self.assertEqual(OutboxNotification.objects.count(), 2)
@@ -0,0 +1,96 @@
+"""
+Clean up the remote relations of zaken that are about to be deleted.
+
+Deleting a ZAAK with set-based queries (see :mod:`zrc.datamodel.deletion`)
+doesn't send the ``pre_delete`` signals of the relation objects, so the remote
+relations are removed here instead. The remote calls are independent of each
+other and run concurrently instead of one after the other.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, List, Tuple
+from uuid import UUID
+
+from django.core.cache import caches
+from django.db import connections
+
+from zrc.datamodel.models import ZaakContactMoment, ZaakInformatieObject
+from zrc.datamodel.models.core import ZaakVerzoek
+
+from . import signals
+
+logger = logging.getLogger(__name__)
+
+# maximum number of concurrent requests to the remote APIs
+MAX_WORKERS = 8
+
+
+@contextmanager
+def marked_for_delete(cache_alias: str, key: str, uuids: List[UUID]):
+    """
+    Hide the relations from the ZRC API while the remote relations are being
+    deleted, allowing the validation in the remote API to pass.
+    """
+    if not uuids:
+        yield
+        return
+
+    cache = caches[cache_alias]
+    cache.set(key, (cache.get(key) or []) + uuids)
+    try:
+        yield
+    finally:
+        marked = cache.get(key) or []
+        cache.set(key, [uuid for uuid in marked if uuid not in uuids])
+
+
+def _run(job: Tuple[Callable, object]):
+    func, relation = job
+    try:
+        return func(relation)
+    finally:
+        # worker threads get their own database connections
+        connections.close_all()
+
+
+def sync_delete_zaak_relations(zaak_pks: List[int]) -> None:
+    """
+    Delete the remote relations of the zaken with primary keys ``zaak_pks``.
+
+    :raises: the first error raised by a remote delete
+    """
+    zios = list(
+        ZaakInformatieObject.objects.filter(zaak__in=zaak_pks).select_related("zaak")
+    )
+    zcms = list(
+        ZaakContactMoment.objects.filter(zaak__in=zaak_pks).exclude(
+            _objectcontactmoment=""
+        )
+    )
+    zvs = list(ZaakVerzoek.objects.filter(zaak__in=zaak_pks).exclude(_objectverzoek=""))
+
+    # look up the functions at call time, so they can be mocked
+    jobs = (
+        [(signals.sync_delete_zio, zio) for zio in zios]
+        + [(signals.sync_delete_zaakcontactmoment, zcm) for zcm in zcms]
+        + [(signals.sync_delete_zaakverzoek, zv) for zv in zvs]
+    )
+    if not jobs:
+        return
+
+    logger.info("Deleting %d remote relations of zaken %r", len(jobs), zaak_pks)
+
+    with marked_for_delete(
+        "drc_sync", "zios_marked_for_delete", [zio.uuid for zio in zios]
+    ), marked_for_delete(
+        "kcc_sync", "zcms_marked_for_delete", [zcm.uuid for zcm in zcms]
+    ), marked_for_delete(
+        "kcc_sync", "zvs_marked_for_delete", [zv.uuid for zv in zvs]
+    ):
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(jobs))) as executor:
+            futures = [executor.submit(_run, job) for job in jobs]
+
+        # all requests have finished - re-raise the first error, if any
+        for future in futures:
+            future.result()
@@ -14,6 +14,8 @@ from zrc.api.scopes import (
     SCOPE_ZAKEN_CREATE,
 )
 from zrc.datamodel.tests.factories import ResultaatFactory, ZaakFactory
+from zrc.outbox.delivery import deliver_batch
+from zrc.outbox.models import OutboxNotification
 
 from .utils import ZAAK_WRITE_KWARGS
 
@@ -61,6 +63,11 @@ class SendNotifTestCase(JWTAuthMixin, APITestCase):
         response = self.client.post(url, data, **ZAAK_WRITE_KWARGS)
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        # not sent during the request, but through the outbox
+        client.create.assert_not_called()
+        self.assertEqual(OutboxNotification.objects.count(), 1)
+
+        deliver_batch(client)
 
         data = response.json()
         client.create.assert_called_once_with(
@@ -97,6 +104,8 @@ class SendNotifTestCase(JWTAuthMixin, APITestCase):
             response.status_code, status.HTTP_204_NO_CONTENT, response.data
         )
 
+        deliver_batch(client)
+
         client.create.assert_called_once_with(
             "notificaties",
             {
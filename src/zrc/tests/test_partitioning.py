@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from freezegun import freeze_time
+
+from zrc.datamodel.models import Status
+from zrc.datamodel.tests.factories import StatusFactory
+from zrc.utils.partitioning import (
+    ensure_partitions,
+    get_partition_name,
+    get_partitions,
+    is_partitioned,
+    supports_partitioning,
+)
+
+
+class PartitioningTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        if not supports_partitioning(connection):
+            self.skipTest("Partitioning requires PostgreSQL 11 or newer")
+
+    def test_tables_partitioned(self):
+        with connection.cursor() as cursor:
+            self.assertTrue(is_partitioned(cursor, "datamodel_status"))
+            self.assertTrue(is_partitioned(cursor, "audit_audittrail"))
+
+    def test_ensure_partitions(self):
+        future = timezone.now() + timedelta(days=5 * 366)
+        start = datetime(future.year, 1, 1, tzinfo=timezone.utc)
+
+        with freeze_time(future), connection.cursor() as cursor:
+            created = ensure_partitions(cursor, "datamodel_status", "year", ahead=1)
+
+            partitions = {p.name for p in get_partitions(cursor, "datamodel_status")}
+
+        name = get_partition_name("datamodel_status", "year", start)
+        self.assertIn(name, created)
+        self.assertIn(name, partitions)
+
+    def test_rows_moved_from_default_partition(self):
+        future = timezone.now() + timedelta(days=10 * 366)
+        status = StatusFactory.create(datum_status_gezet=future)
+
+        with freeze_time(future), connection.cursor() as cursor:
+            ensure_partitions(cursor, "datamodel_status", "year", ahead=0)
+
+            cursor.execute(
+                f'SELECT COUNT(*) FROM "datamodel_status_p{future:%Y}" WHERE id = %s',
+                [status.id],
+            )
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+        self.assertTrue(Status.objects.filter(id=status.id).exists())
+
+    @override_settings(
+        PARTITIONED_TABLES={
+            "audit_audittrail": {
+                "interval": "month",
+                "retention": 30,
+                "before_drop": "zrc.audit.history.rebase",
+            },
+        }
+    )
+    def test_command_drops_expired_partitions(self):
+        later = timezone.now() + timedelta(days=200)
+        with connection.cursor() as cursor:
+            expired = [
+                p.name
+                for p in get_partitions(cursor, "audit_audittrail")
+                if p.end is not None and p.end <= later - timedelta(days=30)
+            ]
+        self.assertTrue(expired)
+
+        with freeze_time(later):
+            stdout = StringIO()
+            call_command("manage_partitions", stdout=stdout)
+
+        with connection.cursor() as cursor:
+            remaining = {p.name for p in get_partitions(cursor, "audit_audittrail")}
+
+        for name in expired:
+            self.assertIn(f"Dropped partition {name}", stdout.getvalue())
+            self.assertNotIn(name, remaining)
+        self.assertIn("audit_audittrail_default", remaining)
+
+    @override_settings(
+        PARTITIONED_TABLES={
+            "audit_audittrail": {"interval": "month", "retention": 30},
+        }
+    )
+    def test_command_dry_run(self):
+        with connection.cursor() as cursor:
+            before = {p.name for p in get_partitions(cursor, "audit_audittrail")}
+
+        with freeze_time(timezone.now() + timedelta(days=200)):
+            call_command("manage_partitions", dry_run=True, stdout=StringIO())
+
+        with connection.cursor() as cursor:
+            after = {p.name for p in get_partitions(cursor, "audit_audittrail")}
+        self.assertLessEqual(before, after)
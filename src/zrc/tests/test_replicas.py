@@ -0,0 +1,125 @@
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import SimpleTestCase, override_settings
+
+import jwt
+from rest_framework.test import APIRequestFactory
+from vng_api_common.authorizations.models import Applicatie
+
+from zrc.api.viewsets import ZaakInformatieObjectViewSet, ZaakViewSet
+from zrc.datamodel.models import Zaak
+from zrc.middleware import ReplicaMiddleware
+from zrc.utils import replicas
+
+REPLICAS = ["replica_0"]
+
+
+def get_auth_header(client_id: str) -> str:
+    token = jwt.encode({"client_id": client_id}, "secret", algorithm="HS256")
+    return f"Bearer {token.decode('ascii')}"
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(replicas.reset)
+        self.router = replicas.ReplicaRouter()
+
+    def test_reads_from_primary_by_default(self):
+        self.assertIsNone(self.router.db_for_read(Zaak))
+
+    def test_reads_from_replica(self):
+        replicas.use_replica()
+
+        self.assertEqual(self.router.db_for_read(Zaak), "replica_0")
+
+    def test_authorizations_read_from_primary(self):
+        replicas.use_replica()
+
+        self.assertIsNone(self.router.db_for_read(Applicatie))
+
+    def test_writes_to_primary(self):
+        replicas.use_replica()
+
+        self.assertEqual(self.router.db_for_write(Zaak), "default")
+
+    def test_no_migrations_on_replica(self):
+        self.assertTrue(self.router.allow_migrate("default", "datamodel"))
+        self.assertFalse(self.router.allow_migrate("replica_0", "datamodel"))
+
+
+@override_settings(DATABASE_REPLICAS=REPLICAS)
+class ReplicaMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.factory = APIRequestFactory()
+
+    def handle(self, request, callback, status=200):
+        used = []
+
+        def get_response(request):
+            middleware.process_view(request, callback, (), {})
+            used.append(replicas.get_replica())
+            return HttpResponse(status=status)
+
+        middleware = ReplicaMiddleware(get_response)
+        middleware(request)
+        self.assertIsNone(replicas.get_replica())
+        return used[0]
+
+    def test_read_action_uses_replica(self):
+        callback = ZaakViewSet.as_view({"get": "list"})
+        request = self.factory.get("/", HTTP_AUTHORIZATION=get_auth_header("a"))
+
+        self.assertEqual(self.handle(request, callback), "replica_0")
+
+    def test_search_uses_replica(self):
+        callback = ZaakViewSet.as_view({"post": "_zoek"})
+        request = self.factory.post("/", HTTP_AUTHORIZATION=get_auth_header("a"))
+
+        self.assertEqual(self.handle(request, callback), "replica_0")
+        self.assertFalse(replicas.is_pinned_to_primary("a"))
+
+    def test_other_viewsets_use_primary(self):
+        callback = ZaakInformatieObjectViewSet.as_view({"get": "list"})
+        request = self.factory.get("/")
+
+        self.assertIsNone(self.handle(request, callback))
+
+    def test_read_your_writes(self):
+        create = ZaakViewSet.as_view({"post": "create"})
+        retrieve = ZaakViewSet.as_view({"get": "retrieve"})
+
+        self.handle(
+            self.factory.post("/", HTTP_AUTHORIZATION=get_auth_header("a")), create
+        )
+
+        self.assertTrue(replicas.is_pinned_to_primary("a"))
+        self.assertIsNone(
+            self.handle(
+                self.factory.get("/", HTTP_AUTHORIZATION=get_auth_header("a")),
+                retrieve,
+            )
+        )
+        # other clients are not affected
+        self.assertEqual(
+            self.handle(
+                self.factory.get("/", HTTP_AUTHORIZATION=get_auth_header("b")),
+                retrieve,
+            ),
+            "replica_0",
+        )
+
+    def test_failed_write_not_pinned(self):
+        create = ZaakViewSet.as_view({"post": "create"})
+
+        self.handle(
+            self.factory.post("/", HTTP_AUTHORIZATION=get_auth_header("a")),
+            create,
+            status=400,
+        )
+
+        self.assertFalse(replicas.is_pinned_to_primary("a"))
@@ -6,7 +6,7 @@ from rest_framework.test import APITestCase
 from vng_api_common.tests import JWTAuthMixin, get_operation_url, reverse
 
 from zrc.api.scopes import SCOPE_ZAKEN_ALLES_LEZEN, SCOPE_ZAKEN_ALLES_VERWIJDEREN
-from zrc.api.tests.mixins import ZaakInformatieObjectSyncMixin
+from zrc.api.tests.mixins import SyncMixin
 from zrc.datamodel.models import (
     KlantContact,
     Resultaat,
@@ -22,11 +22,14 @@ from zrc.datamodel.tests.factories import (
     ResultaatFactory,
     RolFactory,
     StatusFactory,
+    ZaakContactMomentFactory,
     ZaakEigenschapFactory,
     ZaakFactory,
     ZaakInformatieObjectFactory,
     ZaakObjectFactory,
+    ZaakVerzoekFactory,
 )
+from zrc.sync.signals import SyncError
 from zrc.tests.utils import ZAAK_READ_KWARGS
 
 from .utils import ZAAK_WRITE_KWARGS
@@ -34,7 +37,7 @@ from .utils import ZAAK_WRITE_KWARGS
 ZAAKTYPE = "https://example.com/api/v1/zaaktype/1"
 
 
-class US349TestCase(ZaakInformatieObjectSyncMixin, JWTAuthMixin, APITestCase):
+class US349TestCase(SyncMixin, JWTAuthMixin, APITestCase):
 
     scopes = [SCOPE_ZAKEN_ALLES_VERWIJDEREN]
     zaaktype = ZAAKTYPE
@@ -72,6 +75,46 @@ class US349TestCase(ZaakInformatieObjectSyncMixin, JWTAuthMixin, APITestCase):
         self.assertEqual(ZaakInformatieObject.objects.all().count(), 0)
         self.assertEqual(KlantContact.objects.all().count(), 0)
 
+    def test_delete_zaak_deletes_remote_relations(self):
+        zaak = ZaakFactory.create(zaaktype=ZAAKTYPE)
+        deelzaak = ZaakFactory.create(hoofdzaak=zaak, zaaktype=ZAAKTYPE)
+        zio1 = ZaakInformatieObjectFactory.create(zaak=zaak)
+        zio2 = ZaakInformatieObjectFactory.create(zaak=deelzaak)
+        zcm = ZaakContactMomentFactory.create(
+            zaak=zaak,
+            _objectcontactmoment="http://example.com/api/v1/objectcontactmomenten/1",
+        )
+        zv = ZaakVerzoekFactory.create(
+            zaak=zaak, _objectverzoek="http://example.com/api/v1/objectverzoeken/1"
+        )
+
+        zaak_delete_url = get_operation_url("zaak_delete", uuid=zaak.uuid)
+
+        response = self.client.delete(zaak_delete_url, **ZAAK_WRITE_KWARGS)
+
+        self.assertEqual(
+            response.status_code, status.HTTP_204_NO_CONTENT, response.data
+        )
+        self.assertEqual(
+            {call[0][0] for call in self.mocked_sync_delete.call_args_list},
+            {zio1, zio2},
+        )
+        self.mocked_sync_delete_zcm.assert_called_once_with(zcm)
+        self.mocked_sync_delete_zv.assert_called_once_with(zv)
+        self.assertFalse(Zaak.objects.exists())
+
+    def test_delete_zaak_fail_sync(self):
+        self.mocked_sync_delete.side_effect = SyncError("Sync failed")
+        zaak = ZaakFactory.create(zaaktype=ZAAKTYPE)
+        ZaakInformatieObjectFactory.create(zaak=zaak)
+
+        zaak_delete_url = get_operation_url("zaak_delete", uuid=zaak.uuid)
+
+        response = self.client.delete(zaak_delete_url, **ZAAK_WRITE_KWARGS)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Zaak.objects.get(), zaak)
+
     def test_delete_deel_zaak(self):
         """
         Deleting a deel zaak only deletes the deel zaak, and not the hoofd zaak.
@@ -0,0 +1,54 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TransactionTestCase
+
+from zrc.api.viewsets import ZaakViewSet
+from zrc.utils.warmup import is_uwsgi_flag_set, iter_viewsets, warm_up
+
+
+class WarmUpTests(TransactionTestCase):
+    def test_viewsets_discovered(self):
+        self.assertIn(ZaakViewSet, set(iter_viewsets()))
+
+    def test_warm_up(self):
+        with patch("zrc.utils.warmup.logger") as logger:
+            timings = warm_up()
+
+        self.assertEqual(
+            [name for name, duration in timings],
+            [
+                "build URLconf",
+                "instantiate serializers",
+                "load schema artifacts",
+                "prime database",
+            ],
+        )
+        logger.warning.assert_not_called()
+
+    def test_command_reports_timings(self):
+        stdout = StringIO()
+
+        call_command("warmup", stdout=stdout)
+
+        self.assertIn("instantiate serializers: ", stdout.getvalue())
+        self.assertIn("total: ", stdout.getvalue())
+
+
+class UWSGIFlagTests(SimpleTestCase):
+    def test_flag_values(self):
+        cases = [
+            ({}, False),
+            ({"lazy-apps": True}, True),
+            ({"lazy-apps": b"true"}, True),
+            ({"lazy-apps": b"1"}, True),
+            ({"lazy-apps": b"false"}, False),
+            ({"lazy-apps": b"Off"}, False),
+            ({"lazy-apps": b"0"}, False),
+            ({"lazy-apps": [b"true", b"no"]}, False),
+        ]
+
+        for options, expected in cases:
+            with self.subTest(options=options):
+                self.assertIs(is_uwsgi_flag_set(options, "lazy-apps"), expected)
@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+
+from ...partitioning import (
+    drop_partition,
+    ensure_partitions,
+    get_expired_partitions,
+    is_partitioned,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the partitions for the upcoming periods and drop the partitions "
+        "past their retention"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the expired partitions instead of dropping them",
+        )
+
+    def handle(self, **options):
+        with connection.cursor() as cursor:
+            for table, config in settings.PARTITIONED_TABLES.items():
+                if not is_partitioned(cursor, table):
+                    self.stderr.write(f"{table} is not partitioned, skipping")
+                    continue
+
+                with transaction.atomic():
+                    for name in ensure_partitions(cursor, table, config["interval"]):
+                        self.stdout.write(f"Created partition {name}")
+
+                if not config["retention"]:
+                    continue
+
+                before_drop = config.get("before_drop")
+                if before_drop:
+                    before_drop = import_string(before_drop)
+
+                retention = timedelta(days=config["retention"])
+                for partition in get_expired_partitions(cursor, table, retention):
+                    if options["dry_run"]:
+                        self.stdout.write(f"Would drop partition {partition.name}")
+                        continue
+                    with transaction.atomic():
+                        if before_drop:
+                            before_drop(partition.end)
+                        drop_partition(cursor, table, partition.name)
+                    self.stdout.write(f"Dropped partition {partition.name}")
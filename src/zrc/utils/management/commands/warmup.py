@@ -0,0 +1,14 @@
+from django.core.management import BaseCommand
+
+from ...warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = "Run the worker warm-up and report the time spent per step"
+
+    def handle(self, **options):
+        timings = warm_up()
+        for name, duration in timings:
+            self.stdout.write(f"{name}: {duration:.3f}s")
+        total = sum(duration for name, duration in timings)
+        self.stdout.write(f"total: {total:.3f}s")
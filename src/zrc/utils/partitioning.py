@@ -0,0 +1,414 @@
+"""
+Partition append-mostly tables by range on a date column.
+
+Uses the declarative partitioning of PostgreSQL 11+. Queries that filter on
+the partition column only scan the matching partitions (partition pruning),
+and the indexes per partition stay small.
+
+An existing table is converted once, from a migration, by
+:func:`partition_table`, without blocking writes for longer than a short
+final transaction:
+
+1. a ``CHECK`` constraint bounding the partition column is added ``NOT VALID``
+   and validated afterwards, which doesn't block writes;
+2. unique indexes must include the partition column on a partitioned table,
+   so those are built concurrently on the existing table. This means a column
+   like ``uuid`` is no longer unique across partitions by itself - the
+   application generates those values (uuid4), the database no longer
+   enforces it;
+3. in one transaction, the existing table is renamed and attached as the
+   first partition of a new partitioned table with the same name, indexes and
+   foreign keys. The validated constraint and the matching indexes make
+   attaching it a catalog-only change.
+
+The partitions for upcoming periods are created, and expired partitions
+dropped, by the ``manage_partitions`` management command. A table can
+configure a ``before_drop`` hook, called with the upper bound of the partition
+in the transaction that drops it - e.g. to keep the remaining rows
+self-contained.
+"""
+import hashlib
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Iterator, List, NamedTuple, Optional
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+INTERVALS = ("month", "year")
+
+# number of upcoming partitions to create in advance
+PARTITIONS_AHEAD = 3
+
+BOUNDS_RE = re.compile(r"FROM \((?P<start>[^)]+)\) TO \((?P<end>[^)]+)\)")
+
+
+class Index(NamedTuple):
+    name: str
+    unique: bool
+    columns: List[str]
+    definition: str
+
+
+class Partition(NamedTuple):
+    name: str
+    # ``None`` for MINVALUE/MAXVALUE and for the default partition
+    start: Optional[datetime]
+    end: Optional[datetime]
+    default: bool = False
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        if self.default:
+            return False
+        return (self.start is None or self.start < end) and (
+            self.end is None or start < self.end
+        )
+
+
+def supports_partitioning(connection) -> bool:
+    return connection.vendor == "postgresql" and connection.pg_version >= 110000
+
+
+def get_partition_start(interval: str, value: datetime) -> datetime:
+    value = value.astimezone(timezone.utc)
+    if interval == "year":
+        return datetime(value.year, 1, 1, tzinfo=timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def get_next_start(interval: str, start: datetime) -> datetime:
+    if interval == "year":
+        return start.replace(year=start.year + 1)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def get_partition_name(table: str, interval: str, start: datetime) -> str:
+    suffix = f"{start:%Y}" if interval == "year" else f"{start:%Y_%m}"
+    return f"{table}_p{suffix}"
+
+
+def _literal(value: datetime) -> str:
+    # partition bounds only accept literals
+    return f"'{value.isoformat()}'"
+
+
+def _truncate_name(name: str, suffix: str) -> str:
+    # identifiers are limited to 63 characters
+    if len(name) + len(suffix) <= 63:
+        return f"{name}{suffix}"
+    digest = hashlib.md5(name.encode()).hexdigest()[:8]
+    return f"{name[:54 - len(suffix)]}_{digest}{suffix}"
+
+
+def _columns(columns: List[str]) -> str:
+    return ", ".join(f'"{column}"' for column in columns)
+
+
+def is_partitioned(cursor, table: str) -> bool:
+    cursor.execute(
+        """
+        SELECT EXISTS (
+            SELECT 1 FROM pg_partitioned_table
+            WHERE partrelid = to_regclass(%s)
+        )
+        """,
+        [table],
+    )
+    return cursor.fetchone()[0]
+
+
+def get_partitions(cursor, table: str) -> List[Partition]:
+    """
+    List the partitions of ``table``, ordered by their lower bound.
+    """
+    cursor.execute(
+        """
+        SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = %s::regclass
+        """,
+        [table],
+    )
+
+    partitions = []
+    for name, bound in cursor.fetchall():
+        match = BOUNDS_RE.search(bound)
+        if match is None:
+            partitions.append(Partition(name, None, None, default=True))
+            continue
+        start, end = (_parse_bound(match.group(key)) for key in ("start", "end"))
+        partitions.append(Partition(name, start, end))
+
+    # MINVALUE first
+    return sorted(
+        partitions, key=lambda partition: (partition.start is not None, partition.start)
+    )
+
+
+def _parse_bound(bound: str) -> Optional[datetime]:
+    if bound in ("MINVALUE", "MAXVALUE"):
+        return None
+    return parse_datetime(bound.strip("'"))
+
+
+def _get_indexes(cursor, table: str) -> List[Index]:
+    cursor.execute(
+        """
+        SELECT
+            index_class.relname,
+            pg_index.indisunique,
+            array(
+                SELECT attribute.attname
+                FROM unnest(pg_index.indkey::int2[]) WITH ORDINALITY
+                    AS key(attnum, position)
+                JOIN pg_attribute attribute
+                    ON attribute.attrelid = pg_index.indrelid
+                    AND attribute.attnum = key.attnum
+                ORDER BY key.position
+            ),
+            pg_get_indexdef(pg_index.indexrelid)
+        FROM pg_index
+        JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid
+        WHERE pg_index.indrelid = %s::regclass
+        """,
+        [table],
+    )
+    return [Index(*row) for row in cursor.fetchall()]
+
+
+def _get_serial_columns(cursor, table: str) -> Iterator[tuple]:
+    cursor.execute(
+        """
+        SELECT attname, pg_get_serial_sequence(%s, attname)
+        FROM pg_attribute
+        WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped
+        """,
+        [table, table],
+    )
+    for column, sequence in cursor.fetchall():
+        if sequence:
+            yield column, sequence
+
+
+def create_partition(cursor, table: str, interval: str, start: datetime) -> str:
+    """
+    Create the partition of ``table`` starting at ``start``.
+
+    Rows in the default partition that belong to the new partition are moved
+    into it.
+    """
+    name = get_partition_name(table, interval, start)
+    end = get_next_start(interval, start)
+    default = f"{table}_default"
+    column = _get_partition_column(cursor, table)
+
+    create = (
+        f'CREATE TABLE "{name}" PARTITION OF "{table}" '
+        f"FOR VALUES FROM ({_literal(start)}) TO ({_literal(end)})"
+    )
+
+    cursor.execute(
+        f'SELECT EXISTS (SELECT 1 FROM "{default}" '
+        f'WHERE "{column}" >= %s AND "{column}" < %s)',
+        [start, end],
+    )
+    if not cursor.fetchone()[0]:
+        cursor.execute(create)
+        return name
+
+    with transaction.atomic():
+        cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{default}"')
+        cursor.execute(create)
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM "{default}"
+                WHERE "{column}" >= %s AND "{column}" < %s
+                RETURNING *
+            )
+            INSERT INTO "{table}" SELECT * FROM moved
+            """,
+            [start, end],
+        )
+        cursor.execute(f'ALTER TABLE "{table}" ATTACH PARTITION "{default}" DEFAULT')
+    return name
+
+
+def _get_partition_column(cursor, table: str) -> str:
+    cursor.execute(
+        """
+        SELECT attribute.attname
+        FROM pg_partitioned_table
+        JOIN pg_attribute attribute
+            ON attribute.attrelid = pg_partitioned_table.partrelid
+            AND attribute.attnum = pg_partitioned_table.partattrs[0]
+        WHERE pg_partitioned_table.partrelid = %s::regclass
+        """,
+        [table],
+    )
+    return cursor.fetchone()[0]
+
+
+def partition_table(
+    connection, table: str, column: str, interval: str, ahead: int = PARTITIONS_AHEAD
+) -> None:
+    """
+    Convert ``table`` into a table partitioned by ``interval`` on ``column``.
+
+    Must run outside of a transaction, i.e. from a non-atomic migration.
+    """
+    assert interval in INTERVALS, f"Unknown partition interval {interval!r}"
+
+    if not supports_partitioning(connection):
+        logger.warning("Partitioning %s requires PostgreSQL 11 or newer", table)
+        return
+
+    with connection.cursor() as cursor:
+        if is_partitioned(cursor, table):
+            return
+
+        # everything up to the start of the next period goes into the first
+        # partition, which leaves room for writes during the conversion
+        now = get_partition_start(interval, timezone.now())
+        cutover = get_next_start(interval, get_next_start(interval, now))
+        legacy = f"{table}_legacy"
+        check = _truncate_name(table, "_bounds")
+
+        # a previous, interrupted conversion may have gotten this far already
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND conname = %s)",
+            [table, check],
+        )
+        if not cursor.fetchone()[0]:
+            cursor.execute(
+                f'ALTER TABLE "{table}" ADD CONSTRAINT "{check}" CHECK '
+                f'("{column}" IS NOT NULL AND "{column}" < {_literal(cutover)}) '
+                f"NOT VALID"
+            )
+        cursor.execute(f'ALTER TABLE "{table}" VALIDATE CONSTRAINT "{check}"')
+
+        indexes = _get_indexes(cursor, table)
+        prebuilt = {
+            _truncate_name(index.name, "_part"): index
+            for index in indexes
+            if index.unique and column not in index.columns
+        }
+        indexes = [index for index in indexes if index.name not in prebuilt]
+        for name, index in prebuilt.items():
+            cursor.execute(
+                f'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "{name}" '
+                f'ON "{table}" ({_columns(index.columns + [column])})'
+            )
+
+        with transaction.atomic(using=connection.alias):
+            _swap(cursor, table, legacy, column, indexes, cutover, check)
+
+            cursor.execute(
+                f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT'
+            )
+            start = cutover
+            for _ in range(ahead):
+                create_partition(cursor, table, interval, start)
+                start = get_next_start(interval, start)
+
+    logger.info("Partitioned %s by %s on %s", table, interval, column)
+
+
+def _swap(cursor, table, legacy, column, indexes, cutover, check):
+    cursor.execute(f'LOCK TABLE "{table}" IN ACCESS EXCLUSIVE MODE')
+    cursor.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype = 'f'
+        """,
+        [table],
+    )
+    foreign_keys = cursor.fetchall()
+
+    cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+    for index in indexes:
+        legacy_name = _truncate_name(index.name, "_legacy")
+        cursor.execute(f'ALTER INDEX "{index.name}" RENAME TO "{legacy_name}"')
+
+    cursor.execute(
+        f'CREATE TABLE "{table}" (LIKE "{legacy}" INCLUDING DEFAULTS '
+        f'INCLUDING CONSTRAINTS INCLUDING STORAGE) PARTITION BY RANGE ("{column}")'
+    )
+    cursor.execute(f'ALTER TABLE "{table}" DROP CONSTRAINT "{check}"')
+
+    # the same indexes, under the same names - unique indexes are extended
+    # with the partition column and match the ones built concurrently
+    for index in indexes:
+        if index.unique and column not in index.columns:
+            cursor.execute(
+                f'CREATE UNIQUE INDEX "{index.name}" '
+                f'ON "{table}" ({_columns(index.columns + [column])})'
+            )
+        else:
+            definition = re.sub(
+                r" ON \S+ USING ", f' ON "{table}" USING ', index.definition, count=1
+            )
+            cursor.execute(definition)
+
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+
+    cursor.execute(
+        f'ALTER TABLE "{table}" ATTACH PARTITION "{legacy}" '
+        f"FOR VALUES FROM (MINVALUE) TO ({_literal(cutover)})"
+    )
+    cursor.execute(f'ALTER TABLE "{legacy}" DROP CONSTRAINT "{check}"')
+
+    # the sequences would be dropped together with the first partition
+    for serial_column, sequence in _get_serial_columns(cursor, legacy):
+        cursor.execute(
+            f'ALTER SEQUENCE {sequence} OWNED BY "{table}"."{serial_column}"'
+        )
+
+
+def ensure_partitions(
+    cursor, table: str, interval: str, ahead: int = PARTITIONS_AHEAD
+) -> List[str]:
+    """
+    Create the missing partitions from the current period up to ``ahead``
+    periods in the future.
+    """
+    partitions = get_partitions(cursor, table)
+
+    created = []
+    start = get_partition_start(interval, timezone.now())
+    for _ in range(ahead + 1):
+        end = get_next_start(interval, start)
+        if not any(partition.overlaps(start, end) for partition in partitions):
+            created.append(create_partition(cursor, table, interval, start))
+        start = end
+    return created
+
+
+def get_expired_partitions(cursor, table: str, retention: timedelta) -> List[Partition]:
+    """
+    List the partitions only holding rows older than ``retention``, oldest
+    first.
+    """
+    cutoff = timezone.now() - retention
+    return [
+        partition
+        for partition in get_partitions(cursor, table)
+        if not partition.default
+        and partition.end is not None
+        and partition.end <= cutoff
+    ]
+
+
+def drop_partition(cursor, table: str, partition: str) -> None:
+    cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{partition}"')
+    cursor.execute(f'DROP TABLE "{partition}"')
@@ -0,0 +1,104 @@
+"""
+Route the reads of read-only API requests to the read replicas.
+
+Viewsets opt in with ``replica_actions``, the actions that only read. While the
+:class:`zrc.middleware.ReplicaMiddleware` handles such an action, the reads of
+the models in ``REPLICA_APPS`` go to one of the ``DATABASE_REPLICAS``. All
+writes, and all reads of other requests, go to the primary.
+
+Replicas lag behind the primary. After a client writes, its reads stay on the
+primary for ``DATABASE_REPLICA_PIN_SECONDS``, so a client always reads its own
+writes. The client is identified by the ``client_id`` in its JWT.
+"""
+import random
+import threading
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+import jwt
+
+# the vng-api-common configuration and authorizations are read right after they
+# are written, so only the API data is read from the replicas
+REPLICA_APPS = ("datamodel", "audit")
+
+PIN_CACHE_KEY = "replicas:pin:{client_id}"
+
+_state = threading.local()
+
+
+def get_replica() -> Optional[str]:
+    """
+    Return the replica to read from in the current thread, if any.
+    """
+    return getattr(_state, "replica", None)
+
+
+def use_replica() -> Optional[str]:
+    """
+    Read from one of the replicas in the current thread, until :func:`reset`.
+    """
+    replicas = settings.DATABASE_REPLICAS
+    _state.replica = random.choice(replicas) if replicas else None
+    return _state.replica
+
+
+def reset() -> None:
+    _state.replica = None
+
+
+def get_client_id(request) -> Optional[str]:
+    """
+    Return the (unverified) client_id of the JWT of ``request``.
+
+    The JWT is verified by the authentication later on, this only decides where
+    the data is read from.
+    """
+    auth = request.META.get("HTTP_AUTHORIZATION", "")
+    if not auth.startswith("Bearer "):
+        return None
+    try:
+        payload = jwt.decode(auth[len("Bearer ") :], verify=False)
+    except jwt.InvalidTokenError:
+        return None
+    client_id = payload.get("client_id")
+    return client_id if isinstance(client_id, str) else None
+
+
+def pin_to_primary(client_id: str) -> None:
+    cache.set(
+        PIN_CACHE_KEY.format(client_id=client_id),
+        True,
+        timeout=settings.DATABASE_REPLICA_PIN_SECONDS,
+    )
+
+
+def is_pinned_to_primary(client_id: str) -> bool:
+    return bool(cache.get(PIN_CACHE_KEY.format(client_id=client_id)))
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        replica = get_replica()
+        if replica is None or model._meta.app_label not in REPLICA_APPS:
+            return None
+
+        # related objects are read from the same database as the instance
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return replica
+
+    def db_for_write(self, model, **hints) -> str:
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints) -> Optional[bool]:
+        # the replicas hold the same data as the primary
+        databases = {"default", *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> bool:
+        return db not in settings.DATABASE_REPLICAS
@@ -0,0 +1,150 @@
+"""
+Warm up a process before it starts handling requests.
+
+uWSGI loads the application in the master process and forks the workers from
+it. Everything that is built before the fork - imported modules, the compiled
+URL resolvers, serializer fields, loaded schema artifacts - is shared with the
+workers through copy-on-write, instead of being built lazily by every worker
+on its first requests.
+
+The database is touched to load the cached configuration, but all connections
+are closed again before forking, since a connection can't be shared between
+processes.
+"""
+import gc
+import logging
+import time
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections
+from django.urls import URLPattern, URLResolver, get_resolver
+
+logger = logging.getLogger(__name__)
+
+# the values uWSGI reads as "off" for a flag, any other value turns it on
+UWSGI_FALSE_VALUES = ("0", "false", "no", "off")
+
+
+def iter_viewsets(patterns=None) -> Iterator[type]:
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_viewsets(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern):
+            view_class = getattr(pattern.callback, "cls", None)
+            if view_class is not None:
+                yield view_class
+
+
+def build_urlconf():
+    resolver = get_resolver()
+    # accessing the reverse lookups compiles all (nested) resolvers
+    resolver.reverse_dict
+    for namespace in resolver.namespace_dict:
+        resolver.namespace_dict[namespace][1].reverse_dict
+
+
+def instantiate_serializers():
+    seen = set()
+    for viewset in iter_viewsets():
+        serializer_class = getattr(viewset, "serializer_class", None)
+        if serializer_class is None or serializer_class in seen:
+            continue
+        seen.add(serializer_class)
+
+        try:
+            # building the fields introspects the model and the validators
+            serializer_class().fields
+        except Exception:
+            logger.warning(
+                "Could not warm up serializer %r", serializer_class, exc_info=True
+            )
+
+
+def load_schema_artifacts():
+    from zrc.api.schema_artifacts import FORMATS, get_artifact
+
+    for format in FORMATS:
+        get_artifact(format)
+
+
+def prime_database():
+    from vng_api_common.authorizations.models import AuthorizationsConfig
+    from vng_api_common.notifications.models import NotificationsConfig
+
+    for connection in connections.all():
+        connection.ensure_connection()
+
+    ContentType.objects.get_for_models(*apps.get_models())
+    AuthorizationsConfig.get_solo()
+    NotificationsConfig.get_solo()
+
+
+STEPS = (
+    ("build URLconf", build_urlconf),
+    ("instantiate serializers", instantiate_serializers),
+    ("load schema artifacts", load_schema_artifacts),
+    ("prime database", prime_database),
+)
+
+
+def run_step(name: str, func: Callable[[], None]) -> float:
+    start = time.monotonic()
+    func()
+    return time.monotonic() - start
+
+
+def warm_up() -> List[Tuple[str, float]]:
+    """
+    Run all warm-up steps and return the time spent per step.
+    """
+    try:
+        timings = [(name, run_step(name, func)) for name, func in STEPS]
+    finally:
+        # never hand out connections to forked processes
+        connections.close_all()
+    return timings
+
+
+def is_uwsgi_flag_set(options: Dict[str, object], name: str) -> bool:
+    """
+    Return if the flag ``name`` is on in ``uwsgi.opt``.
+
+    The options hold the values as given, in bytes (``True`` for a flag without
+    a value, a list for a repeated option): ``lazy-apps = false`` is the truthy
+    ``b"false"``.
+    """
+    value = options.get(name)
+    if isinstance(value, list):
+        value = value[-1] if value else None
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    if isinstance(value, bytes):
+        value = value.decode()
+    return value.strip().lower() not in UWSGI_FALSE_VALUES
+
+
+def warm_up_before_fork(import_time: float) -> None:
+    """
+    Warm up the uWSGI master and freeze the resulting objects.
+
+    Freezing moves everything allocated so far into a permanent generation that
+    is ignored by the garbage collector, so the collector in the workers
+    doesn't touch (and thereby copy) the shared memory pages.
+    """
+    timings = [("import application", import_time)] + warm_up()
+
+    gc.collect()
+    # gc.freeze() is only available from Python 3.7
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+
+    logger.info(
+        "Warm-up finished in %.3fs (%s)",
+        sum(duration for name, duration in timings),
+        ", ".join(f"{name}: {duration:.3f}s" for name, duration in timings),
+    )
@@ -7,7 +7,9 @@ For more information on this file, see
 https://docs.djangoproject.com/en/2.0/howto/deployment/wsgi/
 """
 import os
+import time
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 from zrc.setup import setup_env
@@ -30,5 +32,27 @@ def init_newrelic():
 # Enable New Relic on production
 # init_newrelic()
 
+
+def warm_up(import_time: float):
+    """
+    Warm up the uWSGI master process, so that the forked workers share the
+    result instead of each paying for it on their first requests.
+    """
+    try:
+        import uwsgi
+    except ImportError:  # not running under uWSGI
+        return
+
+    # with lazy-apps, every worker loads the application itself
+    from zrc.utils.warmup import is_uwsgi_flag_set, warm_up_before_fork
+
+    if is_uwsgi_flag_set(uwsgi.opt, "lazy-apps") or not settings.WARMUP:
+        return
+
+    warm_up_before_fork(import_time)
+
+
 setup_env()
+start = time.monotonic()
 application = get_wsgi_application()
+warm_up(time.monotonic() - start)